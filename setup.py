@@ -74,6 +74,7 @@ setup(
     
     scripts=[
         'src/aria/scripts/aria',
+        'src/aria/scripts/aria-bundle',
         'src/aria/scripts/aria-rest'],
       
     # Please make sure this is in sync with src/aria/requirements.txt
@@ -82,5 +83,4 @@ setup(
         'clint==0.5.1',
         'Jinja2==2.8',
         'requests==2.11.1',
-        'CacheControl[filecache]==0.11.6',
         'shortuuid==0.4.3'])
@@ -47,7 +47,8 @@ class ConsumerChain(Consumer):
     ARIA consumer chain.
     
     Calls consumers in order, handling exception by calling `_handle_exception` on them, 
-    and stops the chain if there are any validation issues.
+    and stops the chain if there are any validation issues (or as soon as the maximum number of
+    issues has been reached).
     """
 
     def __init__(self, context, consumer_classes=None, handle_exceptions=True):
@@ -64,6 +65,8 @@ class ConsumerChain(Consumer):
 
     def consume(self):
         for consumer in self.consumers:
+            if self.context.validation.reached_max_issues:
+                break
             try:
                 consumer.consume()
             except Exception as e:
@@ -14,12 +14,15 @@
 # under the License.
 #
 
-from ..validation import ValidationContext
-from ..loading import LoadingContext
+from ..validation import ValidationContext, IncrementalValidation
+from ..loading import LoadingContext, UriLocation
 from ..reading import ReadingContext
 from ..presentation import PresentationContext
 from ..deployment import DeploymentContext
 from .style import Style
+from .consumer import ConsumerChain
+from .presentation import Read
+from .validation import Validate
 import sys
 
 class ConsumptionContext(object):
@@ -46,6 +49,49 @@ class ConsumptionContext(object):
         self.presentation = PresentationContext()
         self.deployment = DeploymentContext()
 
+    def revalidate(self, changed_locations=()):
+        """
+        Reads and validates the presentation again, after the documents at the changed locations
+        have been modified.
+
+        Only the changed documents are parsed again: the others are retrieved from
+        :code:`reading.cache` (unless it is None). Only the parts of the presentation affected by the
+        changes are validated again (see :class:`aria.validation.IncrementalValidation`). The first
+        call validates everything, as do calls after reading issues.
+
+        Other consumers (e.g. :class:`Template`) can be used afterwards as usual.
+
+        :param changed_locations: Locations (or URIs) of the changed documents
+        :returns: True if there are no validation issues
+        """
+
+        changed_location_keys = [(UriLocation(l) if isinstance(l, basestring) else l).key for l in changed_locations]
+        incremental = IncrementalValidation(self.validation.incremental, changed_location_keys)
+        self.validation.incremental = None
+        self.validation.clear()
+        self.reading._clear_locations()
+        self.presentation.presenter = None
+
+        ConsumerChain(self, (Read,)).consume()
+        if (self.presentation.presenter is None) or self.validation.has_issues:
+            return False
+
+        try:
+            incremental.prepare(self)
+        except Exception:
+            # Validating everything will report the problem
+            incremental = None
+
+        partition = self.validation.partition
+        self.validation.partition = incremental
+        try:
+            ConsumerChain(self, (Validate,)).consume()
+        finally:
+            self.validation.partition = partition
+        self.validation.incremental = incremental
+
+        return not self.validation.has_issues
+
     def has_arg_switch(self, name):
         name = '--%s' % name
         return name in self.args
@@ -16,8 +16,9 @@
 
 from .consumer import Consumer
 from ..utils import FixedThreadPoolExecutor, json_dumps, yaml_dumps
-from ..loading import UriLocation
+from ..loading import UriLocation, ArchiveTextLoader
 from ..reading import AlreadyReadError
+from threading import Lock
 
 class Read(Consumer):
     """
@@ -33,33 +34,49 @@ class Read(Consumer):
     
     Note that parsing may internally trigger more than one loading/reading/presentation
     cycle, for example if the agnostic raw data has dependencies that must also be parsed.
+
+    The whole import graph is prefetched before anything is merged: import locations are
+    extracted from each document as soon as it is read, and the imports are scheduled
+    breadth-first on the executor. Documents are deduplicated by their canonical location
+    before they are read, so every document is read and presented exactly once, even if it is
+    imported by several other documents or via circular imports. The imports are then merged in
+    a deterministic topological order (every document after the documents it imports), no matter
+    in which order the threads happened to finish.
     """
     
+    def __init__(self, context):
+        super(Read, self).__init__(context)
+        self._documents = {} # canonical location key -> presentation
+        self._imports = {} # canonical location key -> list of canonical location keys
+        self._lock = Lock()
+
     def consume(self):
         if self.context.presentation.location is None:
             self.context.validation.report('Presentation consumer: missing location')
             return
 
-        presenter = None
-        imported_presentations = None
+        root_key = None
         
         executor = FixedThreadPoolExecutor(size=self.context.presentation.threads, timeout=self.context.presentation.timeout)
         executor.print_exceptions = self.context.presentation.print_exceptions
         try:
-            presenter = self._present(self.context.presentation.location, None, self.context.presentation.presenter_class, executor)
+            root_key = self._fetch(self.context.presentation.location, None, self.context.presentation.presenter_class, executor, None)
             executor.drain()
             
             # Handle exceptions
             for e in executor.exceptions:
                 self._handle_exception(e)
-                
-            imported_presentations = executor.returns
         finally:
             executor.close()
 
+        presenter = self._documents.get(root_key)
+
         # Merge imports
-        if (imported_presentations is not None) and hasattr(presenter, '_merge_import'):
-            for imported_presentation in imported_presentations:
+        if (presenter is not None) and hasattr(presenter, '_merge_import'):
+            for key in self._get_merge_order(root_key):
+                imported_presentation = self._documents.get(key)
+                if imported_presentation is None:
+                    continue
                 ok = True
                 if hasattr(presenter, '_validate_import'):
                     ok = presenter._validate_import(self.context, imported_presentation)
@@ -85,31 +102,97 @@ class Read(Consumer):
             return
         super(Read, self)._handle_exception(e)
     
-    def _present(self, location, origin_location, presenter_class, executor):
-        raw = self._read(location, origin_location)
+    def _fetch(self, location, origin_location, presenter_class, executor, importer):
+        """
+        Reads and presents a single document, and schedules its imports on the executor.
+
+        :code:`importer` is a tuple of the importing document's key and the index of this import
+        in its import list (or None for the root document).
+
+        Returns the document's canonical location key.
+        """
+
+        reader = self.context.reading.reader
+        if reader is not None:
+            loader = reader.loader
+        else:
+            loader = self.context.loading.loader_source.get_loader(self.context.loading, location, origin_location)
+            if not isinstance(loader, ArchiveTextLoader):
+                # Fail early for unsupported documents, before loading anything
+                reader = self.context.reading.reader_source.get_reader(self.context.reading, location, loader)
+
+        # Opening the loader resolves the canonical location, so that we can skip documents we have
+        # already seen before reading them; the reader will use the loader as is
+        loader.open()
+        try:
+            if reader is None:
+                # Archive loaders know which member they load only after opening
+                reader = self.context.reading.reader_source.get_reader(self.context.reading, loader.location, loader)
+
+            key = loader.location.key
+            with self._lock:
+                if importer is not None:
+                    importer_key, index = importer
+                    self._imports[importer_key][index] = key
+                if key in self._documents:
+                    return key
+                self._documents[key] = None
+                self._imports[key] = []
+
+            raw = reader.read()
+        finally:
+            loader.close()
         
         if presenter_class is None:
             presenter_class = self.context.presentation.presenter_source.get_presenter(raw)
         
         presentation = presenter_class(raw=raw)
 
-        if presentation is not None and hasattr(presentation, '_link'):
-            presentation._link()
-            
-        # Submit imports to executor
+        import_locations = None
         if hasattr(presentation, '_get_import_locations'):
             import_locations = presentation._get_import_locations()
+
+        with self._lock:
+            self._documents[key] = presentation
             if import_locations:
-                for import_location in import_locations:
-                    # The imports inherit the parent presenter class and use the current location as their origin location
-                    import_location = UriLocation(import_location)
-                    executor.submit(self._present, import_location, location, presenter_class, executor)
+                self._imports[key] = [None] * len(import_locations)
 
-        return presentation
-    
-    def _read(self, location, origin_location):
-        if self.context.reading.reader is not None:
-            return self.context.reading.reader.read()
-        loader = self.context.loading.loader_source.get_loader(self.context.loading, location, origin_location)
-        reader = self.context.reading.reader_source.get_reader(self.context.reading, location, loader)
-        return reader.read()
+        # Submit imports to executor before linking, so that they can be loaded in the meantime
+        if import_locations:
+            for index, import_location in enumerate(import_locations):
+                # The imports inherit the parent presenter class and use the current location as their origin location
+                import_location = UriLocation(import_location)
+                executor.submit(self._fetch, import_location, loader.location, presenter_class, executor, (key, index))
+
+        if hasattr(presentation, '_link'):
+            presentation._link()
+
+        return key
+
+    def _get_merge_order(self, root_key):
+        """
+        Returns the keys of all documents imported directly or indirectly by the root document,
+        such that every document comes after all the documents it imports.
+        
+        Circular imports are broken at the import that closes the cycle.
+        """
+
+        order = []
+        visited = set([root_key])
+        
+        # Iterative depth-first post-order traversal, following imports in the order in which they
+        # are declared
+        stack = [(root_key, iter(self._imports.get(root_key, ())))]
+        while stack:
+            key, imports = stack[-1]
+            for import_key in imports:
+                if (import_key is not None) and (import_key not in visited):
+                    visited.add(import_key)
+                    stack.append((import_key, iter(self._imports.get(import_key, ()))))
+                    break
+            else:
+                stack.pop()
+                if key != root_key:
+                    order.append(key)
+
+        return order
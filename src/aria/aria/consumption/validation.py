@@ -15,10 +15,15 @@
 #
 
 from .consumer import Consumer
+from ..validation import validate_in_processes
 
 class Validate(Consumer):
     """
     Validates the presentation.
+
+    If :code:`processes` in the validation context is not 1, validation is divided between
+    several processes (see :func:`aria.validation.validate_in_processes`), unless a
+    :code:`partition` is already set.
     """
 
     def consume(self):
@@ -26,4 +31,7 @@ class Validate(Consumer):
             self.context.validation.report('Validation consumer: missing presenter')
             return
 
-        self.context.presentation.presenter._validate(self.context)
+        if (self.context.validation.processes != 1) and (self.context.validation.partition is None):
+            validate_in_processes(self.context, self.context.validation.processes)
+        else:
+            self.context.presentation.presenter._validate(self.context)
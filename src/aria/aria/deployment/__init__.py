@@ -16,10 +16,11 @@
 
 from .exceptions import CannotEvaluateFunction
 from .context import IdType, DeploymentContext
-from .shared_elements import Element, TemplateElement, Function, Parameter, Metadata, Interface, Operation, Artifact, GroupPolicy, GroupPolicyTrigger
+from .shared_elements import Element, TemplateElement, Function, Parameter, FrozenParameter, Metadata, Interface, Operation, Artifact, GroupPolicy, GroupPolicyTrigger
 from .plan_elements import DeploymentPlan, Node, Capability, Relationship, Group, Policy, Mapping, Substitution
 from .template_elements import DeploymentTemplate, NodeTemplate, Requirement, CapabilityTemplate, RelationshipTemplate, GroupTemplate, PolicyTemplate, MappingTemplate, SubstitutionTemplate
 from .types import TypeHierarchy, Type, RelationshipType
+from .matching import RequirementMatcher
 
 __all__ = (
     'CannotEvaluateFunction',
@@ -29,6 +30,7 @@ __all__ = (
     'TemplateElement',
     'Function',
     'Parameter',
+    'FrozenParameter',
     'Metadata',
     'Interface',
     'Operation',
@@ -54,4 +56,5 @@ __all__ = (
     'SubstitutionTemplate',
     'TypeHierarchy',
     'Type',
-    'RelationshipType')
+    'RelationshipType',
+    'RequirementMatcher')
@@ -16,6 +16,7 @@
 
 from .utils import generate_id_string 
 from .types import TypeHierarchy
+from .matching import RequirementMatcher
 from ..utils import StrictDict, prune, puts
 import itertools
 
@@ -51,6 +52,7 @@ class DeploymentContext(object):
     * :code:`policy_types`: The generated hierarchy of policy types
     * :code:`artifact_types`: The generated hierarchy of artifact types
     * :code:`interface_types`: The generated hierarchy of interface types
+    * :code:`requirement_matcher`: :class:`RequirementMatcher` for the deployment template
     """
 
     def __init__(self):
@@ -71,6 +73,14 @@ class DeploymentContext(object):
         
         self._serial_id_counter = itertools.count(1)
         self._locally_unique_ids = set()
+        self._requirement_matcher = None
+
+    @property
+    def requirement_matcher(self):
+        matcher = self._requirement_matcher
+        if (matcher is None) or (matcher.template is not self.template):
+            matcher = self._requirement_matcher = RequirementMatcher(self)
+        return matcher
     
     def generate_id(self):
         if self.id_type == IdType.LOCAL_SERIAL:
@@ -84,6 +94,11 @@ class DeploymentContext(object):
             return the_id
         
         return generate_id_string()
+
+    def generate_ids(self, count):
+        if self.id_type == IdType.LOCAL_SERIAL:
+            return list(itertools.islice(self._serial_id_counter, count))
+        return [self.generate_id() for _ in xrange(count)]
     
     def set_input(self, name, value):
         self.inputs[name] = value
@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+class RequirementMatcher(object):
+    """
+    Finds the node templates and capabilities that can be targets of requirements.
+
+    Node templates are indexed by every ancestor of their node type (including the type itself),
+    and capabilities are indexed by every ancestor of their capability type, so that candidates
+    are found without scanning all node templates and comparing their types. The candidates are
+    always in the order of the deployment template's node templates and of their capabilities.
+
+    The matcher is valid only as long as the deployment template and types do not change.
+    """
+
+    def __init__(self, deployment):
+        self.deployment = deployment
+        self.template = deployment.template
+        self._node_templates = None
+        self._capabilities = {}
+        self._targets = {}
+
+    def find_node_templates(self, node_type_name):
+        """
+        The node templates of the node type or of its descendants.
+        """
+
+        if self._node_templates is None:
+            self._node_templates = _index_by_type(self.deployment.node_types, self.template.node_templates.itervalues())
+        return self._node_templates.get(node_type_name, ())
+
+    def find_capabilities(self, node_template, capability_type_name):
+        """
+        The capabilities of the node template that are of the capability type or of its
+        descendants.
+        """
+
+        capabilities = self._capabilities.get(node_template.name)
+        if capabilities is None:
+            capabilities = _index_by_type(self.deployment.capability_types, node_template.capabilities.itervalues())
+            self._capabilities[node_template.name] = capabilities
+        return capabilities.get(capability_type_name, ())
+
+    def find_targets(self, node_type_name, capability_type_name):
+        """
+        The node templates of the node type (or of its descendants) that have capabilities of the
+        capability type (or of its descendants), as a list of (node template, capabilities) tuples.
+        """
+
+        key = (node_type_name, capability_type_name)
+        targets = self._targets.get(key)
+        if targets is None:
+            targets = []
+            for node_template in self.find_node_templates(node_type_name):
+                capabilities = self.find_capabilities(node_template, capability_type_name)
+                if capabilities:
+                    targets.append((node_template, capabilities))
+            self._targets[key] = targets
+        return targets
+
+def _index_by_type(hierarchy, elements):
+    # Note: the root of the hierarchy is indexed as None, which is how a missing type name matches
+    # all types in TypeHierarchy.is_descendant
+    index = {}
+    for element in elements:
+        the_type = hierarchy.get_descendant(element.type_name)
+        while the_type is not None:
+            index.setdefault(the_type.name, []).append(element)
+            the_type = hierarchy.get_parent(the_type.name)
+    return index
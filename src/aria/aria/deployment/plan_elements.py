@@ -15,9 +15,9 @@
 #
 
 from .shared_elements import Element, Parameter, Interface, Operation, Artifact, GroupPolicy
-from .utils import validate_dict_values, validate_list_values, coerce_dict_values, coerce_list_values, dump_list_values, dump_dict_values, dump_properties, dump_interfaces
+from .utils import validate_dict_values, validate_list_values, instantiate_dict, freeze_dict, coerce_dict_values, coerce_list_values, dump_list_values, dump_dict_values, dump_properties, dump_interfaces
 from ..validation import Issue
-from ..utils import StrictList, StrictDict, ReadOnlyList, puts, indent 
+from ..utils import StrictList, StrictDict, StrictDictAttribute, StrictListAttribute, ReadOnlyList, puts, indent 
 from collections import OrderedDict
 
 class DeploymentPlan(Element):
@@ -38,19 +38,29 @@ class DeploymentPlan(Element):
     * :code:`inputs`: Dict of :class:`Parameter`
     * :code:`outputs`: Dict of :class:`Parameter`
     * :code:`operations`: Dict of :class:`Operation`
+    
+    Nodes and groups are indexed as they are added to the plan, as are relationships added to its
+    nodes and members added to its groups, so that the :code:`find_` methods do not have to scan
+    the plan. Nodes, groups, relationships and members can only be added, not removed or replaced.
     """
     
     def __init__(self):
         self.description = None
         self.metadata = None
-        self.nodes = StrictDict(key_class=basestring, value_class=Node) 
-        self.groups = StrictDict(key_class=basestring, value_class=Group) 
+        self.nodes = StrictDict(key_class=basestring, value_class=Node, wrapper_fn=self._add_node)
+        self.groups = StrictDict(key_class=basestring, value_class=Group, wrapper_fn=self._add_group)
         self.policies = StrictDict(key_class=basestring, value_class=Policy)
         self.substitution = None
         self.inputs = StrictDict(key_class=basestring, value_class=Parameter)
         self.outputs = StrictDict(key_class=basestring, value_class=Parameter)
         self.operations = StrictDict(key_class=basestring, value_class=Operation)
 
+        self._nodes_by_template = {}
+        self._nodes_by_type = {}
+        self._incoming_relationships = {}
+        self._groups_by_template = {}
+        self._groups_by_node = {}
+
     def satisfy_requirements(self, context):
         satisfied = True
         for node in self.nodes.itervalues():
@@ -66,42 +76,41 @@ class DeploymentPlan(Element):
         return satisfied
     
     def find_nodes(self, node_template_name):
-        nodes = []
-        for node in self.nodes.itervalues():
-            if node.template_name == node_template_name:
-                nodes.append(node)
-        return ReadOnlyList(nodes)
+        return ReadOnlyList(self._nodes_by_template.get(node_template_name, ()))
 
     def get_node_ids(self, node_template_name):
-        return ReadOnlyList((node.id for node in self.find_nodes(node_template_name)))
+        return ReadOnlyList((node.id for node in self._nodes_by_template.get(node_template_name, ())))
+
+    def find_nodes_of_type(self, type_name):
+        """
+        The nodes of exactly this type (not including its descendant types).
+        """
+
+        return ReadOnlyList(self._nodes_by_type.get(type_name, ()))
+
+    def find_incoming_relationships(self, node_id):
+        """
+        The relationships of all nodes that target this node.
+        """
+
+        return ReadOnlyList(self._incoming_relationships.get(node_id, ()))
     
     def find_groups(self, group_template_name):
-        groups = []
-        for group in self.groups.itervalues():
-            if group.template_name == group_template_name:
-                groups.append(group)
-        return ReadOnlyList(groups)
+        return ReadOnlyList(self._groups_by_template.get(group_template_name, ()))
 
     def get_group_ids(self, group_template_name):
-        return ReadOnlyList((group.id for group in self.find_groups(group_template_name)))
+        return ReadOnlyList((group.id for group in self._groups_by_template.get(group_template_name, ())))
+
+    def find_node_groups(self, node_id):
+        """
+        The groups that have this node as a member.
+        """
+
+        return ReadOnlyList(self._groups_by_node.get(node_id, ()))
     
     def is_node_a_target(self, context, target_node):
-        for node in self.nodes.itervalues():
-            if self._is_node_a_target(context, node, target_node):
-                return True
-        return False
-
-    def _is_node_a_target(self, context, source_node, target_node):
-        if source_node.relationships:
-            for relationship in source_node.relationships:
-                if relationship.target_node_id == target_node.id:
-                    return True
-                else:
-                    node = context.deployment.plan.nodes.get(relationship.target_node_id)
-                    if node is not None:
-                        if self._is_node_a_target(context, node, target_node):
-                            return True
-        return False
+        # A node that can be reached through relationships is the target of at least one of them
+        return target_node.id in self._incoming_relationships
 
     @property
     def as_raw(self):
@@ -157,6 +166,32 @@ class DeploymentPlan(Element):
         dump_properties(context, self.outputs, 'Outputs')
         dump_dict_values(context, self.operations, 'Operations')
 
+    def _add_node(self, node):
+        self._nodes_by_template.setdefault(node.template_name, []).append(node)
+        self._nodes_by_type.setdefault(node.type_name, []).append(node)
+        for relationship in node.relationships:
+            self._add_relationship(relationship)
+        node.relationships.wrapper_fn = self._add_relationship
+        return node
+
+    def _add_relationship(self, relationship):
+        if relationship.target_node_id is not None:
+            self._incoming_relationships.setdefault(relationship.target_node_id, []).append(relationship)
+        return relationship
+
+    def _add_group(self, group):
+        self._groups_by_template.setdefault(group.template_name, []).append(group)
+        for node_id in group.member_node_ids:
+            self._add_group_member(group, node_id)
+        group.member_node_ids.wrapper_fn = lambda node_id: self._add_group_member(group, node_id)
+        return group
+
+    def _add_group_member(self, group, node_id):
+        groups = self._groups_by_node.setdefault(node_id, [])
+        if group not in groups:
+            groups.append(group)
+        return node_id
+
     def dump_graph(self, context):
         for node in self.nodes.itervalues():
             if not self.is_node_a_target(context, node):
@@ -177,131 +212,6 @@ class DeploymentPlan(Element):
                     with indent(3):
                         self._dump_graph_node(context, target_node)
 
-class Node(Element):
-    """
-    An instance of a :class:`NodeTemplate`.
-    
-    Nodes may have zero or more :class:`Relationship` instances to other nodes.
-    
-    Properties:
-    
-    * :code:`id`: Unique ID (prefixed with the template name)
-    * :code:`type_name`: Must be represented in the :class:`DeploymentContext`
-    * :code:`template_name`: Must be represented in the :class:`DeploymentTemplate`
-    * :code:`properties`: Dict of :class:`Parameter`
-    * :code:`interfaces`: Dict of :class:`Interface`
-    * :code:`artifacts`: Dict of :class:`Artifact`
-    * :code:`capabilities`: Dict of :class:`CapabilityTemplate`
-    * :code:`relationship`: List of :class:`Relationship`
-    """
-    
-    def __init__(self, context, type_name, template_name):
-        if not isinstance(type_name, basestring):
-            raise ValueError('must set type_name (string)')
-        if not isinstance(template_name, basestring):
-            raise ValueError('must set template_name (string)')
-
-        self.id = '%s_%s' % (template_name, context.deployment.generate_id())
-        self.type_name = type_name
-        self.template_name = template_name
-        self.properties = StrictDict(key_class=basestring, value_class=Parameter)
-        self.interfaces = StrictDict(key_class=basestring, value_class=Interface)
-        self.artifacts = StrictDict(key_class=basestring, value_class=Artifact)
-        self.capabilities = StrictDict(key_class=basestring, value_class=Capability)
-        self.relationships = StrictList(value_class=Relationship)
-    
-    def satisfy_requirements(self, context):
-        node_template = context.deployment.template.node_templates.get(self.template_name)
-        satisfied = True
-        for requirement in node_template.requirements:
-            # Find target template
-            target_node_template, target_node_capability = requirement.find_target(context, node_template)
-            if target_node_template is not None:
-                # Find target nodes
-                target_nodes = context.deployment.plan.find_nodes(target_node_template.name)
-                if target_nodes:
-                    target_node = None
-                    target_capability = None
-                    
-                    if target_node_capability is not None:
-                        # Relate to the first target node that has capacity
-                        for node in target_nodes:
-                            target_capability = node.capabilities.get(target_node_capability.name)
-                            if target_capability.relate():
-                                target_node = node
-                                break
-                    else:
-                        # Use first target node
-                        target_node = target_nodes[0]
-                        
-                    if target_node is not None:
-                        if requirement.relationship_template is not None:
-                            relationship = requirement.relationship_template.instantiate(context, self)
-                            relationship.target_node_id = target_node.id
-                            if target_capability is not None:
-                                relationship.target_capability_name = target_capability.name
-                            self.relationships.append(relationship)
-                    else:
-                        context.validation.report('requirement "%s" of node "%s" targets node template "%s" but its instantiated nodes do not have enough capacity' % (requirement.name, self.id, target_node_template.name), level=Issue.BETWEEN_INSTANCES)
-                        satisfied = False
-                else:
-                    context.validation.report('requirement "%s" of node "%s" targets node template "%s" but it has no instantiated nodes' % (requirement.name, self.id, target_node_template.name), level=Issue.BETWEEN_INSTANCES)
-                    satisfied = False
-            else:
-                context.validation.report('requirement "%s" of node "%s" has no target node template' % (requirement.name, self.id), level=Issue.BETWEEN_INSTANCES)
-                satisfied = False
-        return satisfied
-
-    def validate_capabilities(self, context):
-        satisfied = False
-        for capability in self.capabilities.itervalues():
-            if not capability.has_enough_relationships:
-                context.validation.report('capability "%s" of node "%s" requires at least %d relationships but has %d' % (capability.name, self.id, capability.min_occurrences, capability.occurrences), level=Issue.BETWEEN_INSTANCES)
-                satisfied = False
-        return satisfied
-
-    @property
-    def as_raw(self):
-        return OrderedDict((
-            ('id', self.id),
-            ('type_name', self.type_name),
-            ('template_name', self.template_name),
-            ('properties', {k: v.as_raw for k, v in self.properties.iteritems()}),
-            ('interfaces', [v.as_raw for v in self.interfaces.itervalues()]),
-            ('artifacts', [v.as_raw for v in self.artifacts.itervalues()]),
-            ('capabilities', [v.as_raw for v in self.capabilities.itervalues()]),
-            ('relationships', [v.as_raw for v in self.relationships])))
-            
-    def validate(self, context):
-        if len(self.id) > context.deployment.id_max_length:
-            context.validation.report('"%s" has an ID longer than the limit of %d characters: %d' % (self.id, context.deployment.id_max_length, len(self.id)), level=Issue.BETWEEN_INSTANCES)
-        
-        # TODO: validate that node template is of type?
-        
-        validate_dict_values(context, self.properties)
-        validate_dict_values(context, self.interfaces)
-        validate_dict_values(context, self.artifacts)
-        validate_dict_values(context, self.capabilities)
-        validate_list_values(context, self.relationships)
-
-    def coerce_values(self, context, container, report_issues):
-        coerce_dict_values(context, self, self.properties, report_issues)
-        coerce_dict_values(context, self, self.interfaces, report_issues)
-        coerce_dict_values(context, self, self.artifacts, report_issues)
-        coerce_dict_values(context, self, self.capabilities, report_issues)
-        coerce_list_values(context, self, self.relationships, report_issues)
-
-    def dump(self, context):
-        puts('Node: %s' % context.style.node(self.id))
-        with context.style.indent:
-            puts('Template: %s' % context.style.node(self.template_name))
-            puts('Type: %s' % context.style.type(self.type_name))
-            dump_properties(context, self.properties)
-            dump_interfaces(context, self.interfaces)
-            dump_dict_values(context, self.artifacts, 'Artifacts')
-            dump_dict_values(context, self.capabilities, 'Capabilities')
-            dump_list_values(context, self.relationships, 'Relationships')
-
 class Capability(Element):
     """
     A capability of a :class:`Node`.
@@ -317,6 +227,10 @@ class Capability(Element):
     * :code:`properties`: Dict of :class:`Parameter`
     """
     
+    __slots__ = ('name', 'type_name', 'min_occurrences', 'max_occurrences', '_properties', 'occurrences')
+
+    properties = StrictDictAttribute('_properties', key_class=basestring, value_class=Parameter)
+
     def __init__(self, name, type_name):
         if not isinstance(name, basestring):
             raise ValueError('name must be string')
@@ -327,9 +241,23 @@ class Capability(Element):
         self.type_name = type_name
         self.min_occurrences = None # optional
         self.max_occurrences = None # optional
-        self.properties = StrictDict(key_class=basestring, value_class=Parameter)
         
         self.occurrences = 0
+
+    def clone(self, context, container):
+        """
+        Returns a capability without occurrences for another node (see :meth:`Node.clone`).
+        """
+
+        r = Capability(self.name, self.type_name)
+        r.min_occurrences = self.min_occurrences
+        r.max_occurrences = self.max_occurrences
+        instantiate_dict(context, container, r.properties, self.properties)
+        return r
+
+    def freeze(self, context, container):
+        freeze_dict(context, container, self.properties)
+        return self
     
     @property
     def has_enough_relationships(self):
@@ -384,6 +312,12 @@ class Relationship(Element):
     * :code:`target_interfaces`: Dict of :class:`Interface`
     """
     
+    __slots__ = ('target_node_id', 'target_capability_name', 'type_name', 'template_name', '_properties', '_source_interfaces', '_target_interfaces')
+
+    properties = StrictDictAttribute('_properties', key_class=basestring, value_class=Parameter)
+    source_interfaces = StrictDictAttribute('_source_interfaces', key_class=basestring, value_class=Interface)
+    target_interfaces = StrictDictAttribute('_target_interfaces', key_class=basestring, value_class=Interface)
+
     def __init__(self, type_name=None, template_name=None):
         if type_name and not isinstance(type_name, basestring):
             raise ValueError('type_name must be string')
@@ -396,9 +330,6 @@ class Relationship(Element):
         self.target_capability_name = None
         self.type_name = type_name
         self.template_name = template_name
-        self.properties = StrictDict(key_class=basestring, value_class=Parameter)
-        self.source_interfaces = StrictDict(key_class=basestring, value_class=Interface)
-        self.target_interfaces = StrictDict(key_class=basestring, value_class=Interface)
 
     @property
     def as_raw(self):
@@ -438,6 +369,167 @@ class Relationship(Element):
             dump_interfaces(context, self.source_interfaces, 'Source interfaces')
             dump_interfaces(context, self.target_interfaces, 'Target interfaces')
 
+class Node(Element):
+    """
+    An instance of a :class:`NodeTemplate`.
+    
+    Nodes may have zero or more :class:`Relationship` instances to other nodes.
+    
+    Properties:
+    
+    * :code:`id`: Unique ID (prefixed with the template name)
+    * :code:`type_name`: Must be represented in the :class:`DeploymentContext`
+    * :code:`template_name`: Must be represented in the :class:`DeploymentTemplate`
+    * :code:`properties`: Dict of :class:`Parameter`
+    * :code:`interfaces`: Dict of :class:`Interface`
+    * :code:`artifacts`: Dict of :class:`Artifact`
+    * :code:`capabilities`: Dict of :class:`CapabilityTemplate`
+    * :code:`relationship`: List of :class:`Relationship`
+
+    Nodes instantiated together may share their parameters without functions as read-only
+    :class:`FrozenParameter` instances (see :meth:`clone`).
+    """
+    
+    __slots__ = ('id', 'type_name', 'template_name', '_properties', '_interfaces', '_artifacts', '_capabilities', '_relationships')
+
+    properties = StrictDictAttribute('_properties', key_class=basestring, value_class=Parameter)
+    interfaces = StrictDictAttribute('_interfaces', key_class=basestring, value_class=Interface)
+    artifacts = StrictDictAttribute('_artifacts', key_class=basestring, value_class=Artifact)
+    capabilities = StrictDictAttribute('_capabilities', key_class=basestring, value_class=Capability)
+    relationships = StrictListAttribute('_relationships', value_class=Relationship)
+
+    def __init__(self, context, type_name, template_name, generated_id=None):
+        if not isinstance(type_name, basestring):
+            raise ValueError('must set type_name (string)')
+        if not isinstance(template_name, basestring):
+            raise ValueError('must set template_name (string)')
+
+        if generated_id is None:
+            generated_id = context.deployment.generate_id()
+        self.id = '%s_%s' % (template_name, generated_id)
+        self.type_name = type_name
+        self.template_name = template_name
+
+    def clone(self, context, generated_id=None):
+        """
+        Returns a node of the same template, as if it had been instantiated again.
+        
+        The elements are instantiated for the new node, except for parameters that have been
+        frozen (see :meth:`freeze`), which are shared with this node. Because frozen parameters are
+        read-only, the nodes stay independent. Relationships are not cloned.
+        """
+        
+        r = Node(context, self.type_name, self.template_name, generated_id)
+        instantiate_dict(context, r, r.properties, self.properties)
+        instantiate_dict(context, r, r.interfaces, self.interfaces)
+        instantiate_dict(context, r, r.artifacts, self.artifacts)
+        for name, capability in self.capabilities.iteritems():
+            r.capabilities[name] = capability.clone(context, r)
+        return r
+
+    def freeze(self, context):
+        """
+        Replaces the node's parameters that do not have functions with :class:`FrozenParameter`
+        instances, so that they can be shared by its clones (see :meth:`clone`).
+        """
+
+        freeze_dict(context, self, self.properties)
+        freeze_dict(context, self, self.interfaces)
+        freeze_dict(context, self, self.artifacts)
+        freeze_dict(context, self, self.capabilities)
+    
+    def satisfy_requirements(self, context):
+        node_template = context.deployment.template.node_templates.get(self.template_name)
+        satisfied = True
+        for requirement in node_template.requirements:
+            # Find target template
+            target_node_template, target_node_capability = requirement.find_target(context, node_template)
+            if target_node_template is not None:
+                # Find target nodes
+                target_nodes = context.deployment.plan.find_nodes(target_node_template.name)
+                if target_nodes:
+                    target_node = None
+                    target_capability = None
+                    
+                    if target_node_capability is not None:
+                        # Relate to the first target node that has capacity
+                        for node in target_nodes:
+                            target_capability = node.capabilities.get(target_node_capability.name)
+                            if target_capability.relate():
+                                target_node = node
+                                break
+                    else:
+                        # Use first target node
+                        target_node = target_nodes[0]
+                        
+                    if target_node is not None:
+                        if requirement.relationship_template is not None:
+                            relationship = requirement.relationship_template.instantiate(context, self)
+                            relationship.target_node_id = target_node.id
+                            if target_capability is not None:
+                                relationship.target_capability_name = target_capability.name
+                            self.relationships.append(relationship)
+                    else:
+                        context.validation.report('requirement "%s" of node "%s" targets node template "%s" but its instantiated nodes do not have enough capacity' % (requirement.name, self.id, target_node_template.name), level=Issue.BETWEEN_INSTANCES)
+                        satisfied = False
+                else:
+                    context.validation.report('requirement "%s" of node "%s" targets node template "%s" but it has no instantiated nodes' % (requirement.name, self.id, target_node_template.name), level=Issue.BETWEEN_INSTANCES)
+                    satisfied = False
+            else:
+                context.validation.report('requirement "%s" of node "%s" has no target node template' % (requirement.name, self.id), level=Issue.BETWEEN_INSTANCES)
+                satisfied = False
+        return satisfied
+
+    def validate_capabilities(self, context):
+        satisfied = False
+        for capability in self.capabilities.itervalues():
+            if not capability.has_enough_relationships:
+                context.validation.report('capability "%s" of node "%s" requires at least %d relationships but has %d' % (capability.name, self.id, capability.min_occurrences, capability.occurrences), level=Issue.BETWEEN_INSTANCES)
+                satisfied = False
+        return satisfied
+
+    @property
+    def as_raw(self):
+        return OrderedDict((
+            ('id', self.id),
+            ('type_name', self.type_name),
+            ('template_name', self.template_name),
+            ('properties', {k: v.as_raw for k, v in self.properties.iteritems()}),
+            ('interfaces', [v.as_raw for v in self.interfaces.itervalues()]),
+            ('artifacts', [v.as_raw for v in self.artifacts.itervalues()]),
+            ('capabilities', [v.as_raw for v in self.capabilities.itervalues()]),
+            ('relationships', [v.as_raw for v in self.relationships])))
+            
+    def validate(self, context):
+        if len(self.id) > context.deployment.id_max_length:
+            context.validation.report('"%s" has an ID longer than the limit of %d characters: %d' % (self.id, context.deployment.id_max_length, len(self.id)), level=Issue.BETWEEN_INSTANCES)
+        
+        # TODO: validate that node template is of type?
+        
+        validate_dict_values(context, self.properties)
+        validate_dict_values(context, self.interfaces)
+        validate_dict_values(context, self.artifacts)
+        validate_dict_values(context, self.capabilities)
+        validate_list_values(context, self.relationships)
+
+    def coerce_values(self, context, container, report_issues):
+        coerce_dict_values(context, self, self.properties, report_issues)
+        coerce_dict_values(context, self, self.interfaces, report_issues)
+        coerce_dict_values(context, self, self.artifacts, report_issues)
+        coerce_dict_values(context, self, self.capabilities, report_issues)
+        coerce_list_values(context, self, self.relationships, report_issues)
+
+    def dump(self, context):
+        puts('Node: %s' % context.style.node(self.id))
+        with context.style.indent:
+            puts('Template: %s' % context.style.node(self.template_name))
+            puts('Type: %s' % context.style.type(self.type_name))
+            dump_properties(context, self.properties)
+            dump_interfaces(context, self.interfaces)
+            dump_dict_values(context, self.artifacts, 'Artifacts')
+            dump_dict_values(context, self.capabilities, 'Capabilities')
+            dump_list_values(context, self.relationships, 'Relationships')
+
 class Group(Element):
     """
     An instance of a :class:`GroupTemplate`.
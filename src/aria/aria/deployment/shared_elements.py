@@ -14,10 +14,10 @@
 # under the License.
 #
 
-from .utils import validate_dict_values, instantiate_dict, coerce_value, coerce_dict_values, dump_dict_values, dump_properties
+from .utils import validate_dict_values, instantiate_dict, freeze_dict, freeze_value, has_functions, coerce_value, coerce_dict_values, dump_dict_values, dump_properties
 from .. import UnimplementedFunctionalityError
 from ..validation import Issue
-from ..utils import StrictList, StrictDict, make_agnostic, classname, deepcopy_with_locators, puts
+from ..utils import StrictDict, StrictDictAttribute, StrictListAttribute, make_agnostic, classname, deepcopy_with_locators, puts
 from collections import OrderedDict
 
 class Function(object):
@@ -47,6 +47,8 @@ class Element(object):
     raw data (which can be translated into JSON or YAML) via :code:`as_raw`.
     """
     
+    __slots__ = ()
+
     @property
     def as_raw(self):
         raise UnimplementedFunctionalityError(classname(self) + '.as_raw')
@@ -57,6 +59,16 @@ class Element(object):
     def coerce_values(self, context, container, report_issues):
         pass
     
+    def freeze(self, context, container):
+        """
+        Returns an equivalent element that can be shared by the instances of the container's
+        template (see :meth:`Node.clone`).
+
+        The default is to return this element, after freezing the elements it contains.
+        """
+
+        return self
+
     def dump(self, context):
         pass
 
@@ -67,6 +79,8 @@ class TemplateElement(Element):
     All template elements can be instantiated into :class:`DeploymentPlan` elements. 
     """
 
+    __slots__ = ()
+
     def instantiate(self, context, container):
         pass
 
@@ -75,8 +89,13 @@ class Parameter(TemplateElement):
     Represents a typed value.
 
     Used by both :class:`DeploymentTemplate` and :class:`DeploymentPlan` elements.
+
+    Plan parameters without functions may be replaced by a :class:`FrozenParameter` shared by
+    several nodes (see :meth:`Node.clone`).
     """
     
+    __slots__ = ('type_name', 'value', 'description')
+
     def __init__(self, type_name, value, description):
         self.type_name = type_name
         self.value = value
@@ -96,6 +115,48 @@ class Parameter(TemplateElement):
         if self.value is not None:
             self.value = coerce_value(context, container, self.value, report_issues)
 
+    def freeze(self, context, container):
+        if has_functions(self.value):
+            return self
+        value = coerce_value(context, container, self.value) if self.value is not None else None
+        return FrozenParameter(self.type_name, freeze_value(value), self.description)
+
+class FrozenParameter(Parameter):
+    """
+    A read-only :class:`Parameter` without functions, which is shared by several nodes instead of
+    being instantiated for each (see :meth:`Node.clone`).
+
+    Its value has already been coerced, and its lists and dicts are read-only. Modifying the
+    parameter raises :class:`TypeError`; to change the value for one node, replace the parameter
+    in that node's dict.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, type_name, value, description):
+        set_attr = super(FrozenParameter, self).__setattr__
+        set_attr('type_name', type_name)
+        set_attr('value', value)
+        set_attr('description', description)
+
+    def __setattr__(self, name, value):
+        raise TypeError('read-only parameter')
+
+    def __delattr__(self, name):
+        raise TypeError('read-only parameter')
+
+    def __reduce__(self):
+        return FrozenParameter, (self.type_name, self.value, self.description)
+
+    def instantiate(self, context, container):
+        return self
+
+    def coerce_values(self, context, container, report_issues):
+        pass
+
+    def freeze(self, context, container):
+        return self
+
 class Metadata(TemplateElement):
     """
     Custom values associated with the deployment template and its plans.
@@ -123,7 +184,7 @@ class Metadata(TemplateElement):
             for name, value in self.values.iteritems():
                 puts('%s: %s' % (name, context.style.meta(value)))
 
-class Interface(TemplateElement):
+class Operation(TemplateElement):
     """
     A typed set of operations.
     
@@ -132,54 +193,76 @@ class Interface(TemplateElement):
     Properties:
     
     * :code:`name`: Name
-    * :code:`type_name`: Must be represented in the :class:`DeploymentContext`
+    * :code:`implementation`: Implementation string (interpreted by the orchestrator)
+    * :code:`dependencies`: List of strings (interpreted by the orchestrator)
+    * :code:`executor`: Executor string (interpreted by the orchestrator)
+    * :code:`max_retries`: Maximum number of retries allowed in case of failure
+    * :code:`retry_interval`: Interval between retries
     * :code:`inputs`: Dict of :class:`Parameter`
-    * :code:`operations`: Dict of :class:`Operation`
     """
     
-    def __init__(self, name, type_name):
+    __slots__ = ('name', 'implementation', '_dependencies', 'executor', 'max_retries', 'retry_interval', '_inputs')
+
+    dependencies = StrictListAttribute('_dependencies', value_class=basestring)
+    inputs = StrictDictAttribute('_inputs', key_class=basestring, value_class=Parameter)
+
+    def __init__(self, name):
         if not isinstance(name, basestring):
             raise ValueError('must set name (string)')
         
         self.name = name
-        self.type_name = type_name
-        self.inputs = StrictDict(key_class=basestring, value_class=Parameter)
-        self.operations = StrictDict(key_class=basestring, value_class=Operation)
+        self.implementation = None
+        self.executor = None # Cloudify
+        self.max_retries = None # Cloudify
+        self.retry_interval = None # Cloudify
 
     @property
     def as_raw(self):
         return OrderedDict((
             ('name', self.name),
-            ('type_name', self.type_name),
-            ('inputs', {k: v.as_raw for k, v in self.inputs.iteritems()}),
-            ('operations', [v.as_raw for v in self.operations.itervalues()])))
+            ('implementation', self.implementation),
+            ('dependencies', self.dependencies),
+            ('executor', self.executor),
+            ('max_retries', self.max_retries),
+            ('retry_interval', self.retry_interval),
+            ('inputs', {k: v.as_raw for k, v in self.inputs.iteritems()})))
 
     def instantiate(self, context, container):
-        r = Interface(self.name, self.type_name)
+        r = Operation(self.name)
+        r.implementation = self.implementation
+        r.dependencies = self.dependencies
+        r.executor = self.executor
+        r.max_retries = self.max_retries
+        r.retry_interval = self.retry_interval
         instantiate_dict(context, container, r.inputs, self.inputs)
-        instantiate_dict(context, container, r.operations, self.operations)
         return r
 
     def validate(self, context):
-        if self.type_name:
-            if context.deployment.interface_types.get_descendant(self.type_name) is None:
-                context.validation.report('interface "%s" has an unknown type: %s' % (self.name, repr(self.type_name)), level=Issue.BETWEEN_TYPES)        
-
         validate_dict_values(context, self.inputs)
-        validate_dict_values(context, self.operations)
 
     def coerce_values(self, context, container, report_issues):
         coerce_dict_values(context, container, self.inputs, report_issues)
-        coerce_dict_values(context, container, self.operations, report_issues)
-    
+
+    def freeze(self, context, container):
+        freeze_dict(context, container, self.inputs)
+        return self
+
     def dump(self, context):
         puts(context.style.node(self.name))
         with context.style.indent:
-            puts('Interface type: %s' % context.style.type(self.type_name))
+            if self.implementation is not None:
+                puts('Implementation: %s' % context.style.literal(self.implementation))
+            if self.dependencies:
+                puts('Dependencies: %s' % ', '.join((str(context.style.literal(v)) for v in self.dependencies)))
+            if self.executor is not None:
+                puts('Executor: %s' % context.style.literal(self.executor))
+            if self.max_retries is not None:
+                puts('Max retries: %s' % context.style.literal(self.max_retries))
+            if self.retry_interval is not None:
+                puts('Retry interval: %s' % context.style.literal(self.retry_interval))
             dump_properties(context, self.inputs, 'Inputs')
-            dump_dict_values(context, self.operations, 'Operations')
 
-class Operation(TemplateElement):
+class Interface(TemplateElement):
     """
     A typed set of operations.
     
@@ -188,67 +271,60 @@ class Operation(TemplateElement):
     Properties:
     
     * :code:`name`: Name
-    * :code:`implementation`: Implementation string (interpreted by the orchestrator)
-    * :code:`dependencies`: List of strings (interpreted by the orchestrator)
-    * :code:`executor`: Executor string (interpreted by the orchestrator)
-    * :code:`max_retries`: Maximum number of retries allowed in case of failure
-    * :code:`retry_interval`: Interval between retries
+    * :code:`type_name`: Must be represented in the :class:`DeploymentContext`
     * :code:`inputs`: Dict of :class:`Parameter`
+    * :code:`operations`: Dict of :class:`Operation`
     """
     
-    def __init__(self, name):
+    __slots__ = ('name', 'type_name', '_inputs', '_operations')
+
+    inputs = StrictDictAttribute('_inputs', key_class=basestring, value_class=Parameter)
+    operations = StrictDictAttribute('_operations', key_class=basestring, value_class=Operation)
+
+    def __init__(self, name, type_name):
         if not isinstance(name, basestring):
             raise ValueError('must set name (string)')
         
         self.name = name
-        self.implementation = None
-        self.dependencies = StrictList(value_class=basestring)
-        self.executor = None # Cloudify
-        self.max_retries = None # Cloudify
-        self.retry_interval = None # Cloudify
-        self.inputs = StrictDict(key_class=basestring, value_class=Parameter)
+        self.type_name = type_name
 
     @property
     def as_raw(self):
         return OrderedDict((
             ('name', self.name),
-            ('implementation', self.implementation),
-            ('dependencies', self.dependencies),
-            ('executor', self.executor),
-            ('max_retries', self.max_retries),
-            ('retry_interval', self.retry_interval),
-            ('inputs', {k: v.as_raw for k, v in self.inputs.iteritems()})))
+            ('type_name', self.type_name),
+            ('inputs', {k: v.as_raw for k, v in self.inputs.iteritems()}),
+            ('operations', [v.as_raw for v in self.operations.itervalues()])))
 
     def instantiate(self, context, container):
-        r = Operation(self.name)
-        r.implementation = self.implementation
-        r.dependencies = self.dependencies
-        r.executor = self.executor
-        r.max_retries = self.max_retries
-        r.retry_interval = self.retry_interval
+        r = Interface(self.name, self.type_name)
         instantiate_dict(context, container, r.inputs, self.inputs)
+        instantiate_dict(context, container, r.operations, self.operations)
         return r
 
     def validate(self, context):
+        if self.type_name:
+            if context.deployment.interface_types.get_descendant(self.type_name) is None:
+                context.validation.report('interface "%s" has an unknown type: %s' % (self.name, repr(self.type_name)), level=Issue.BETWEEN_TYPES)        
+
         validate_dict_values(context, self.inputs)
+        validate_dict_values(context, self.operations)
 
     def coerce_values(self, context, container, report_issues):
         coerce_dict_values(context, container, self.inputs, report_issues)
+        coerce_dict_values(context, container, self.operations, report_issues)
 
+    def freeze(self, context, container):
+        freeze_dict(context, container, self.inputs)
+        freeze_dict(context, container, self.operations)
+        return self
+    
     def dump(self, context):
         puts(context.style.node(self.name))
         with context.style.indent:
-            if self.implementation is not None:
-                puts('Implementation: %s' % context.style.literal(self.implementation))
-            if self.dependencies:
-                puts('Dependencies: %s' % ', '.join((str(context.style.literal(v)) for v in self.dependencies)))
-            if self.executor is not None:
-                puts('Executor: %s' % context.style.literal(self.executor))
-            if self.max_retries is not None:
-                puts('Max retries: %s' % context.style.literal(self.max_retries))
-            if self.retry_interval is not None:
-                puts('Retry interval: %s' % context.style.literal(self.retry_interval))
+            puts('Interface type: %s' % context.style.type(self.type_name))
             dump_properties(context, self.inputs, 'Inputs')
+            dump_dict_values(context, self.operations, 'Operations')
 
 class Artifact(TemplateElement):
     """
@@ -267,6 +343,11 @@ class Artifact(TemplateElement):
     * :code:`properties`: Dict of :class:`Parameter`
     """
     
+    __slots__ = ('name', 'type_name', 'source_path', 'target_path', 'repository_url', '_repository_credential', '_properties')
+
+    repository_credential = StrictDictAttribute('_repository_credential', key_class=basestring, value_class=basestring)
+    properties = StrictDictAttribute('_properties', key_class=basestring, value_class=Parameter)
+
     def __init__(self, name, type_name, source_path):
         if not isinstance(name, basestring):
             raise ValueError('must set name (string)')
@@ -280,8 +361,6 @@ class Artifact(TemplateElement):
         self.source_path = source_path
         self.target_path = None
         self.repository_url = None
-        self.repository_credential = StrictDict(key_class=basestring, value_class=basestring)
-        self.properties = StrictDict(key_class=basestring, value_class=Parameter)
 
     @property
     def as_raw(self):
@@ -311,6 +390,10 @@ class Artifact(TemplateElement):
     def coerce_values(self, context, container, report_issues):
         coerce_dict_values(context, container, self.properties, report_issues)
 
+    def freeze(self, context, container):
+        freeze_dict(context, container, self.properties)
+        return self
+
     def dump(self, context):
         puts(context.style.node(self.name))
         with context.style.indent:
@@ -65,8 +65,7 @@ class DeploymentTemplate(TemplateElement):
             r.metadata = self.metadata.instantiate(context, container)
         
         for node_template in self.node_templates.itervalues():
-            for _ in range(node_template.default_instances):
-                node = node_template.instantiate(context, container)
+            for node in node_template.instantiate_nodes(context, container, node_template.default_instances):
                 r.nodes[node.id] = node
 
         instantiate_dict(context, self, r.groups, self.group_templates)
@@ -167,6 +166,22 @@ class NodeTemplate(TemplateElement):
         instantiate_dict(context, r, r.artifacts, self.artifacts)
         instantiate_dict(context, r, r.capabilities, self.capabilities)
         return r
+
+    def instantiate_nodes(self, context, container, count):
+        """
+        Instantiates several nodes at once: the first is instantiated, and the others are cloned
+        from it after it is frozen (see :meth:`Node.clone`), with IDs that are generated together.
+        """
+
+        if count < 1:
+            return []
+        prototype = self.instantiate(context, container)
+        if count > 1:
+            prototype.freeze(context)
+        nodes = [prototype]
+        for generated_id in context.deployment.generate_ids(count - 1):
+            nodes.append(prototype.clone(context, generated_id))
+        return nodes
     
     def validate(self, context):
         if context.deployment.node_types.get_descendant(self.type_name) is None:
@@ -249,16 +264,14 @@ class Requirement(Element):
             
             return target_node_template, target_node_capability
 
-        # Find first node that matches the type
+        # Find first node that matches the type (and has a capability that matches the type)
         elif self.target_node_type_name is not None:
-            for target_node_template in context.deployment.template.node_templates.itervalues():
-                if not context.deployment.node_types.is_descendant(self.target_node_type_name, target_node_template.type_name):
-                    continue
-                
+            targets = context.deployment.requirement_matcher.find_targets(self.target_node_type_name, self.target_capability_type_name)
+            for target_node_template, capabilities in targets:
                 if not source_node_template.is_target_node_valid(target_node_template):
                     continue
     
-                target_node_capability = self.find_target_capability(context, source_node_template, target_node_template)
+                target_node_capability = self._find_target_capability(context, source_node_template, target_node_template, capabilities)
                 if target_node_capability is None:
                     continue
                 
@@ -267,7 +280,11 @@ class Requirement(Element):
         return None, None
 
     def find_target_capability(self, context, source_node_template, target_node_template):
-        for capability in target_node_template.capabilities.itervalues():
+        capabilities = context.deployment.requirement_matcher.find_capabilities(target_node_template, self.target_capability_type_name)
+        return self._find_target_capability(context, source_node_template, target_node_template, capabilities)
+
+    def _find_target_capability(self, context, source_node_template, target_node_template, capabilities):
+        for capability in capabilities:
             if capability.satisfies_requirement(context, source_node_template, self, target_node_template):
                 return capability
         return None
@@ -17,30 +17,47 @@
 from ..utils import StrictList, StrictDict, puts
 
 class Type(object):
+    """
+    A type in a hierarchy of types.
+
+    The root of the hierarchy keeps an index of all its types by name, which is updated as types
+    are added to :code:`children`, so that looking up a type does not depend on the number of types. Checking whether
+    a type is a descendant of another uses nested-set numbering (the position of every type in a
+    depth-first walk of the hierarchy, and the position of its last descendant), which is
+    recomputed only after types have been added.
+
+    Types can only be added to a hierarchy, not removed or moved.
+    """
+
     def __init__(self, name):
         if not isinstance(name, basestring):
             raise ValueError('must set name (string)')
         
         self.name = name
-        self.children = StrictList(value_class=Type)
-        
+        self._init_children()
+
+    def _init_children(self):
+        self.children = StrictList(value_class=Type, wrapper_fn=self._adopt)
+        self._parent = None
+        self._index = {self.name: self} # only at the root
+        self._numbered = False # only at the root
+        self._first = None
+        self._last = None
+
     def get_parent(self, name):
-        for child in self.children:
-            if child.name == name:
-                return self
-            parent = child.get_parent(name)
-            if parent is not None:
-                return parent
-        return None
+        the_type = self.get_descendant(name)
+        if (the_type is None) or (the_type is self):
+            return None
+        return the_type._parent
     
     def get_descendant(self, name):
         if self.name == name:
             return self
-        for child in self.children:
-            found = child.get_descendant(name)
-            if found is not None:
-                return found
-        return None
+        root = self._get_root()
+        the_type = root._index.get(name)
+        if (the_type is None) or (self is root):
+            return the_type
+        return the_type if self._contains(the_type) else None
     
     def is_descendant(self, base_name, name):
         base = self.get_descendant(base_name)
@@ -62,6 +79,43 @@ class Type(object):
             for child in self.children:
                 child.dump(context)
 
+    def _adopt(self, child):
+        if child._parent is not None:
+            raise ValueError('type already has a parent: %s' % child.name)
+        root = self._get_root()
+        if child is root:
+            raise ValueError('type cannot be its own descendant: %s' % child.name)
+
+        # The child's types join our root's index (the first type added with a name wins)
+        index = root._index
+        for name, the_type in child._index.iteritems():
+            if name not in index:
+                index[name] = the_type
+        child._index = None
+        child._parent = self
+        root._numbered = False
+        return child
+
+    def _get_root(self):
+        the_type = self
+        while the_type._parent is not None:
+            the_type = the_type._parent
+        return the_type
+
+    def _contains(self, the_type):
+        root = self._get_root()
+        if not root._numbered:
+            root._number(0)
+            root._numbered = True
+        return self._first <= the_type._first <= self._last
+
+    def _number(self, position):
+        self._first = position
+        for child in self.children:
+            position = child._number(position + 1)
+        self._last = position
+        return position
+
 class RelationshipType(Type):
     def __init__(self, name):
         super(RelationshipType, self).__init__(name)
@@ -73,4 +127,4 @@ class RelationshipType(Type):
 class TypeHierarchy(Type):
     def __init__(self):
         self.name = None
-        self.children = StrictList(value_class=Type)
+        self._init_children()
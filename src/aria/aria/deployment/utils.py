@@ -17,7 +17,7 @@
 from .exceptions import CannotEvaluateFunction
 from .. import InvalidValueError
 from ..presentation import Value
-from ..utils import puts
+from ..utils import ReadOnlyList, ReadOnlyDict, puts
 from collections import OrderedDict
 from shortuuid import ShortUUID
 from random import randrange
@@ -63,6 +63,38 @@ def coerce_value(context, container, value, report_issues=False):
                 context.validation.report(e.issue)
     return value
 
+def freeze_value(value):
+    """
+    Converts lists and dicts to :class:`ReadOnlyList` and :class:`ReadOnlyDict`, recursively.
+    """
+
+    if isinstance(value, list):
+        return ReadOnlyList([freeze_value(v) for v in value])
+    elif isinstance(value, dict):
+        return ReadOnlyDict([(k, freeze_value(v)) for k, v in value.iteritems()])
+    return value
+
+def has_functions(value):
+    """
+    True if the value, or a value nested in it, is a function, which would be evaluated (in the
+    context of a container) when the value is coerced.
+    """
+
+    if isinstance(value, Value):
+        value = value.value
+
+    if isinstance(value, list):
+        for v in value:
+            if has_functions(v):
+                return True
+        return False
+    elif isinstance(value, dict):
+        for v in value.itervalues():
+            if has_functions(v):
+                return True
+        return False
+    return hasattr(value, '_evaluate')
+
 def validate_dict_values(context, the_dict):
     validate_list_values(context, the_dict.itervalues())
 
@@ -85,6 +117,14 @@ def instantiate_dict(context, container, the_dict, from_dict):
         if value is not None:
             the_dict[name] = value
 
+def freeze_dict(context, container, the_dict):
+    """
+    Replaces the elements of the dict with frozen ones (see :meth:`Element.freeze`).
+    """
+
+    for name, value in the_dict.items():
+        the_dict[name] = value.freeze(context, container)
+
 def dump_list_values(context, the_list, name):
     if not the_list:
         return
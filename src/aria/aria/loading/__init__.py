@@ -18,10 +18,11 @@ from .exceptions import LoaderError, LoaderNotFoundError, DocumentNotFoundError
 from .context import LoadingContext
 from .loader import Loader
 from .source import LoaderSource, DefaultLoaderSource
-from .location import Location, UriLocation, LiteralLocation
+from .location import Location, UriLocation, LiteralLocation, ArchiveLocation
 from .literal import LiteralLoader
-from .uri import SESSION, SESSION_CACHE_PATH, UriLoader, UriTextLoader
-from .file import FILE_LOADER_SEARCH_PATHS, FileTextLoader
+from .uri import SESSION, UriSession, UriLoader, UriTextLoader
+from .file import FILE_LOADER_SEARCH_PATHS, DIRECTORY_INDEX, DirectoryIndex, FileTextLoader
+from .archive import ARCHIVE_CACHE, ArchiveCache, CsarArchive, ArchiveTextLoader
 
 __all__ = (
     'LoaderError',
@@ -34,10 +35,17 @@ __all__ = (
     'Location',
     'UriLocation',
     'LiteralLocation',
+    'ArchiveLocation',
     'LiteralLoader',
     'SESSION',
-    'SESSION_CACHE_PATH',
+    'UriSession',
     'UriLoader',
     'UriTextLoader',
     'FILE_LOADER_SEARCH_PATHS',
-    'FileTextLoader')
+    'DIRECTORY_INDEX',
+    'DirectoryIndex',
+    'FileTextLoader',
+    'ARCHIVE_CACHE',
+    'ArchiveCache',
+    'CsarArchive',
+    'ArchiveTextLoader')
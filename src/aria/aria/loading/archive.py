@@ -0,0 +1,258 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .loader import Loader
+from .location import ArchiveLocation
+from .exceptions import LoaderError, DocumentNotFoundError
+from .file import DIRECTORY_INDEX, FILE_LOADER_SEARCH_PATHS
+from threading import Lock
+import zipfile, zlib, mmap, struct, posixpath, os
+
+ARCHIVE_EXTENSIONS = ('.csar', '.zip')
+
+TOSCA_META_PATH = 'TOSCA-Metadata/TOSCA.meta'
+
+_LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+
+class CsarArchive(object):
+    """
+    A CSAR (or any zip archive) opened for random access to its members.
+
+    The central directory is indexed once when the archive is opened. The archive file is
+    memory-mapped, so that members that are stored uncompressed are read as buffers over the map,
+    without copying, and deflated members are inflated directly from it, without extracting
+    anything to disk.
+
+    The entry point is :code:`Entry-Definitions` in :code:`TOSCA-Metadata/TOSCA.meta`, or, for
+    archives without metadata, the single YAML file at the root of the archive.
+    
+    The implementation is thread-safe.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'rb') as f:
+                zip_file = zipfile.ZipFile(f)
+                self.members = dict((info.filename, info) for info in zip_file.infolist())
+                zip_file.close()
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, zipfile.BadZipfile) as e:
+            raise LoaderError('archive error: "%s"' % path, cause=e)
+
+        self.metadata = {}
+        if TOSCA_META_PATH in self.members:
+            for line in str(self.read(TOSCA_META_PATH)).splitlines():
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    self.metadata.setdefault(key.strip(), value.strip())
+
+    @property
+    def entry_definitions(self):
+        """
+        The member path of the entry point, or None if it cannot be determined.
+        """
+
+        entry_definitions = self.metadata.get('Entry-Definitions')
+        if entry_definitions is not None:
+            return entry_definitions
+        candidates = [n for n in self.members if ('/' not in n) and n.endswith(('.yaml', '.yml'))]
+        return candidates[0] if len(candidates) == 1 else None
+
+    def has_member(self, member):
+        return member in self.members
+
+    def read(self, member):
+        """
+        Returns the bytes of the member: a read-only :code:`buffer` over the archive's map for
+        members that are stored uncompressed (valid only until the archive is closed), or a
+        :code:`str` otherwise.
+        """
+
+        info = self.members.get(member)
+        if info is None:
+            raise DocumentNotFoundError('archive member not found: "%s" in "%s"' % (member, self.path))
+
+        if info.flag_bits & 0x1:
+            # Encrypted, so let zipfile handle it
+            return self._read_via_zipfile(member)
+
+        the_map = self._map
+        if the_map is None:
+            raise LoaderError('archive is closed: "%s"' % self.path)
+
+        try:
+            signature, _, _, _, _, _, _, _, _, name_length, extra_length = _LOCAL_HEADER.unpack_from(the_map, info.header_offset)
+            if signature != zipfile.stringFileHeader:
+                raise LoaderError('archive member header is corrupt: "%s" in "%s"' % (member, self.path))
+            start = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+
+            if info.compress_type == zipfile.ZIP_STORED:
+                data = buffer(the_map, start, info.file_size)
+            elif info.compress_type == zipfile.ZIP_DEFLATED:
+                try:
+                    data = zlib.decompress(buffer(the_map, start, info.compress_size), -zlib.MAX_WBITS)
+                except zlib.error as e:
+                    raise LoaderError('archive member is corrupt: "%s" in "%s"' % (member, self.path), cause=e)
+            else:
+                return self._read_via_zipfile(member)
+
+            if (zlib.crc32(data) & 0xffffffff) != info.CRC:
+                raise LoaderError('archive member failed CRC check: "%s" in "%s"' % (member, self.path))
+        except ValueError as e:
+            # The map was closed by another thread
+            raise LoaderError('archive is closed: "%s"' % self.path, cause=e)
+        return data
+
+    def close(self):
+        the_map = self._map
+        if the_map is not None:
+            self._map = None
+            the_map.close()
+
+    def _read_via_zipfile(self, member):
+        try:
+            zip_file = zipfile.ZipFile(self.path)
+            try:
+                return zip_file.read(member)
+            finally:
+                zip_file.close()
+        except (IOError, OSError, RuntimeError, zipfile.BadZipfile) as e:
+            raise LoaderError('archive error: "%s" in "%s"' % (member, self.path), cause=e)
+
+class ArchiveCache(object):
+    """
+    Per-process cache of open :class:`CsarArchive` instances, so that every archive is opened and
+    indexed only once. An archive is opened again if its file has been modified, in which case the
+    archive it replaces is closed.
+
+    The implementation is thread-safe.
+    """
+
+    def __init__(self):
+        self._archives = {} # absolute path -> (modification time, size, archive)
+        self._lock = Lock()
+
+    def get(self, path):
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise DocumentNotFoundError('archive not found: "%s"' % path, cause=e)
+
+        with self._lock:
+            entry = self._archives.get(path)
+            if (entry is None) or (entry[0] != stat.st_mtime) or (entry[1] != stat.st_size):
+                if entry is not None:
+                    entry[2].close()
+                    del self._archives[path]
+                entry = (stat.st_mtime, stat.st_size, CsarArchive(path))
+                self._archives[path] = entry
+            return entry[2]
+
+    def clear(self):
+        with self._lock:
+            for _, _, archive in self._archives.itervalues():
+                archive.close()
+            self._archives.clear()
+
+ARCHIVE_CACHE = ArchiveCache()
+
+def is_archive_path(path):
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+def get_archive_member_location(context, location, origin_location):
+    """
+    If the origin location is an archive member, returns the :class:`ArchiveLocation` of the
+    location relative to it, or None if the archive has no such member.
+    """
+
+    if not isinstance(origin_location, ArchiveLocation):
+        return None
+    path = location.as_file
+    if (path is None) or os.path.isabs(path):
+        return None
+    member = posixpath.normpath(posixpath.join(posixpath.dirname(origin_location.member), path))
+    archive_cache = getattr(context, 'archive_cache', None) or ARCHIVE_CACHE
+    if archive_cache.get(origin_location.archive_path).has_member(member):
+        return ArchiveLocation(origin_location.archive_path, member)
+    return None
+
+class ArchiveTextLoader(Loader):
+    """
+    ARIA archive text loader.
+
+    Extracts a text document from a member of an archive. The default encoding is UTF-8, but
+    other supported encoding can be specified instead.
+
+    If the location is an :class:`ArchiveLocation`, the member is loaded directly. Otherwise, the
+    location is expected to be the archive file itself (resolved like :class:`FileTextLoader` does),
+    in which case its entry definitions member is loaded. Either way, after opening, the loader's
+    location will be the :class:`ArchiveLocation` of the member.
+    
+    Archives are opened via the :class:`ArchiveCache` in the context, or the global
+    :code:`ARCHIVE_CACHE` if the context does not have one.
+    """
+
+    def __init__(self, context, location, origin_location=None, encoding='utf-8'):
+        self.context = context
+        self.location = location
+        self.origin_location = origin_location
+        self.encoding = encoding
+        self.archive = None
+
+    def open(self):
+        if self.archive is not None:
+            # Already open
+            return
+
+        archive_cache = getattr(self.context, 'archive_cache', None) or ARCHIVE_CACHE
+        if isinstance(self.location, ArchiveLocation):
+            archive = archive_cache.get(self.location.archive_path)
+        else:
+            search_paths = []
+            if (self.origin_location is not None) and (self.origin_location.search_path is not None):
+                search_paths.append(self.origin_location.search_path)
+            if self.context is not None:
+                search_paths += self.context.search_paths
+            search_paths += FILE_LOADER_SEARCH_PATHS
+            directory_index = getattr(self.context, 'directory_index', None) or DIRECTORY_INDEX
+            path = directory_index.resolve(self.location.as_file, search_paths)
+            if path is None:
+                raise DocumentNotFoundError('archive not found: "%s"' % self.location)
+            archive = archive_cache.get(path)
+            entry_definitions = archive.entry_definitions
+            if entry_definitions is None:
+                raise DocumentNotFoundError('archive has no entry definitions: "%s"' % path)
+            self.location = ArchiveLocation(path, entry_definitions)
+
+        if not archive.has_member(self.location.member):
+            raise DocumentNotFoundError('archive member not found: "%s"' % self.location)
+        self.archive = archive
+
+    def close(self):
+        # The archive stays open in the cache
+        self.archive = None
+
+    def load(self):
+        if self.archive is not None:
+            data = self.archive.read(self.location.member)
+            try:
+                # Also decodes buffers, without copying them first
+                return unicode(data, self.encoding)
+            except UnicodeError as e:
+                raise LoaderError('archive member encoding error: "%s"' % self.location, cause=e)
+        return None
@@ -15,6 +15,9 @@
 #
 
 from .source import DefaultLoaderSource 
+from .uri import SESSION
+from .file import DIRECTORY_INDEX
+from .archive import ARCHIVE_CACHE
 from ..utils import StrictList
 
 class LoadingContext(object):
@@ -23,8 +26,14 @@ class LoadingContext(object):
     
     * :code:`loader_source`: For finding loader instances
     * :code:`search_paths`: List of additional search paths :class:`FileTextLoader`
+    * :code:`uri_session`: :class:`UriSession` used by :class:`UriLoader`
+    * :code:`directory_index`: :class:`DirectoryIndex` used by :class:`FileTextLoader`
+    * :code:`archive_cache`: :class:`ArchiveCache` used by :class:`ArchiveTextLoader`
     """
     
     def __init__(self):
         self.loader_source = DefaultLoaderSource()
         self.search_paths = StrictList(value_class=basestring)
+        self.uri_session = SESSION
+        self.directory_index = DIRECTORY_INDEX
+        self.archive_cache = ARCHIVE_CACHE
@@ -17,10 +17,72 @@
 from .loader import Loader
 from .exceptions import LoaderError, DocumentNotFoundError
 from ..utils import StrictList
-import codecs, os.path
+from threading import Lock
+import os.path
 
 FILE_LOADER_SEARCH_PATHS = StrictList(value_class=basestring)
 
+class DirectoryIndex(object):
+    """
+    Per-process index of directory listings, which allows for resolving paths without trying to
+    open them.
+    
+    A listing is invalidated when the modification time of its directory changes, which happens
+    whenever entries are added to or removed from it. Directories that do not exist are not
+    cached.
+    
+    The implementation is thread-safe.
+    """
+
+    def __init__(self):
+        self._listings = {} # directory -> (modification time, frozenset of names)
+        self._lock = Lock()
+
+    def exists(self, path):
+        """
+        True if there is an entry at the path.
+        """
+
+        directory, name = os.path.split(os.path.abspath(path))
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return False
+
+        with self._lock:
+            listing = self._listings.get(directory)
+
+        if (listing is None) or (listing[0] != mtime):
+            try:
+                listing = (mtime, frozenset(os.listdir(directory)))
+            except OSError:
+                return False
+            with self._lock:
+                self._listings[directory] = listing
+
+        return name in listing[1]
+
+    def resolve(self, path, search_paths):
+        """
+        Returns the absolute path of the first existing entry, trying the path itself first and
+        then the path within each of the search paths, or None if not found.
+        """
+
+        full_path = os.path.abspath(path)
+        if self.exists(full_path):
+            return full_path
+        for search_path in search_paths:
+            full_path = os.path.abspath(os.path.join(search_path, path))
+            if self.exists(full_path):
+                return full_path
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+
+DIRECTORY_INDEX = DirectoryIndex()
+
 class FileTextLoader(Loader):
     """
     ARIA file text loader.
@@ -33,6 +95,10 @@ class FileTextLoader(Loader):
     
     If :code:`origin_location` is provided, a base path will be extracted from it and prepended
     to the search paths.
+
+    Paths are resolved via the :class:`DirectoryIndex` in the context, or the global
+    :code:`DIRECTORY_INDEX` if the context does not have one. The file is read in its entirety
+    and then decoded.
     """
 
     def __init__(self, context, location, origin_location, encoding='utf-8'):
@@ -60,22 +126,19 @@ class FileTextLoader(Loader):
         add_search_paths(FILE_LOADER_SEARCH_PATHS)
     
     def open(self):
+        if self.file is not None:
+            # Already open
+            return
+
+        directory_index = getattr(self.context, 'directory_index', None) or DIRECTORY_INDEX
+        path = directory_index.resolve(self.path, self.search_paths)
+        if path is None:
+            raise DocumentNotFoundError('file not found: "%s"' % self.location)
+
         try:
-            self._open(os.path.abspath(self.path))
+            self._open(path)
         except IOError as e:
-            if e.errno == 2:
-                # Not found, so try in paths
-                for p in self.search_paths:
-                    path = os.path.join(p, self.path)
-                    try:
-                        self._open(path)
-                        return
-                    except IOError as e:
-                        if e.errno != 2:
-                            raise LoaderError('file I/O error: "%s"' % path, cause=e)
-                raise DocumentNotFoundError('file not found: "%s"' % self.location, cause=e)
-            else:
-                raise LoaderError('file I/O error: "%s"' % self.location, cause=e)
+            raise LoaderError('file I/O error: "%s"' % path, cause=e)
         except Exception as e:
             raise LoaderError('file error: "%s"' % self.location, cause=e)
 
@@ -83,6 +146,7 @@ class FileTextLoader(Loader):
         if self.file is not None:
             try:
                 self.file.close()
+                self.file = None
             except IOError as e:
                 raise LoaderError('file I/O error: "%s"' % self.location, cause=e)
             except Exception as e:
@@ -91,7 +155,7 @@ class FileTextLoader(Loader):
     def load(self):
         if self.file is not None:
             try:
-                return self.file.read()
+                return self.file.read().decode(self.encoding)
             except IOError as e:
                 raise LoaderError('file I/O error: "%s"' % self.location, cause=e)
             except Exception as e:
@@ -99,5 +163,5 @@ class FileTextLoader(Loader):
         return None
 
     def _open(self, path):
-        self.file = codecs.open(path, mode='r', encoding=self.encoding, buffering=1)
+        self.file = open(path, 'rb')
         self.location.uri = path
@@ -25,6 +25,9 @@ class Loader(object):
     
     Though the extracted document is often textual (a string or string-like
     data), loaders may provide any format.
+
+    Calling :code:`open` on a loader that is already open should do nothing, so that a loader
+    can be opened in advance (for example, to resolve its location) and then handed to a reader.
     """
     
     def load(self):
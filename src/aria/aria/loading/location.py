@@ -14,11 +14,28 @@
 # under the License.
 #
 
-import urlparse, os
+from hashlib import sha1
+import urlparse, posixpath, os
+
+DEFAULT_PORTS = {
+    'http': 80,
+    'https': 443,
+    'ftp': 21}
 
 class Location(object):
+    """
+    Base class for ARIA locations.
+
+    Locations are compared via their :code:`key`, which is hashable and canonical: equivalent
+    locations have equal keys.
+    """
+
     def is_equivalent(self, location):
-        return False
+        return (location is not None) and (self.key == location.key)
+
+    @property
+    def key(self):
+        return (self.__class__, id(self))
     
     @property
     def search_path(self):
@@ -28,8 +45,37 @@ class UriLocation(Location):
     def __init__(self, uri):
         self.uri = uri
 
-    def is_equivalent(self, location):
-        return isinstance(location, UriLocation) and (location.uri == self.uri)
+    @property
+    def key(self):
+        """
+        File locations are keyed by their normalized absolute path, other URIs by a normalized
+        form (lowercase scheme and host, no default port, no dot segments, no fragment).
+
+        Note that the key is not cached, because loaders may change the URI when resolving it.
+        """
+
+        file = self.as_file
+        if file is not None:
+            return ('file', os.path.normcase(os.path.abspath(file)))
+
+        url = urlparse.urlparse(self.uri)
+        scheme = url.scheme.lower()
+        netloc = url.netloc.lower()
+        try:
+            if url.port and (url.port == DEFAULT_PORTS.get(scheme)):
+                netloc = netloc.rsplit(':', 1)[0]
+        except ValueError:
+            # Invalid port: keep the netloc as is
+            pass
+        path = url.path
+        if path:
+            normalized_path = posixpath.normpath(path)
+            if path.endswith('/') and (normalized_path != '/'):
+                normalized_path += '/'
+            path = normalized_path
+        else:
+            path = '/'
+        return ('uri', urlparse.urlunparse((scheme, netloc, path, url.params, url.query, '')))
 
     @property
     def search_path(self):
@@ -50,8 +96,42 @@ class LiteralLocation(Location):
     def __init__(self, content):
         self.content = content
 
-    def is_equivalent(self, location):
-        return isinstance(location, LiteralLocation) and (location.content == self.content)
+    @property
+    def key(self):
+        """
+        Literal locations are keyed by a digest of their content.
+        """
+
+        content = self.content
+        if isinstance(content, unicode):
+            content = content.encode('utf8')
+        elif not isinstance(content, str):
+            content = repr(content)
+        return ('literal', sha1(content).hexdigest())
     
     def __str__(self):
         return '<literal>'
+
+class ArchiveLocation(UriLocation):
+    """
+    Location of a member in an archive file, such as a CSAR.
+
+    The URI is in the form "zip:/path/to/archive.csar!/path/to/member".
+    """
+
+    def __init__(self, archive_path, member):
+        super(ArchiveLocation, self).__init__('zip:%s!/%s' % (archive_path, member))
+        self.archive_path = archive_path
+        self.member = member
+
+    @property
+    def key(self):
+        return ('archive', os.path.normcase(os.path.abspath(self.archive_path)), posixpath.normpath(self.member))
+
+    @property
+    def search_path(self):
+        return None
+
+    @property
+    def as_file(self):
+        return None
@@ -15,9 +15,10 @@
 #
 
 from .exceptions import LoaderNotFoundError
-from .location import LiteralLocation, UriLocation
+from .location import LiteralLocation, UriLocation, ArchiveLocation
 from .literal import LiteralLoader
 from .file import FileTextLoader
+from .archive import ArchiveTextLoader, is_archive_path, get_archive_member_location
 from .uri import UriTextLoader
 
 class LoaderSource(object):
@@ -41,13 +42,25 @@ class DefaultLoaderSource(LoaderSource):
     The default ARIA loader source will generate a :class:`UriTextLoader` for
     locations that are non-file URIs, and a :class:`FileTextLoader` for file
     URIs.
+
+    An :class:`ArchiveTextLoader` is generated for archive files (".csar" or ".zip"),
+    for :class:`ArchiveLocation` instances, and for relative locations that are
+    members of the same archive as the origin location.
     """
     
     def get_loader(self, context, location, origin_location):
+        if isinstance(location, ArchiveLocation):
+            return ArchiveTextLoader(context, location, origin_location)
+
         if isinstance(location, UriLocation):
+            member_location = get_archive_member_location(context, location, origin_location)
+            if member_location is not None:
+                return ArchiveTextLoader(context, member_location, origin_location)
             if location.as_file is not None:
+                if is_archive_path(location.as_file):
+                    return ArchiveTextLoader(context, location, origin_location)
                 return FileTextLoader(context, location, origin_location)
             else:
-                return UriTextLoader(location)
+                return UriTextLoader(location, context=context)
             
         return super(DefaultLoaderSource, self).get_loader(context, location, origin_location)
@@ -17,12 +17,154 @@
 from .loader import Loader
 from .exceptions import LoaderError, DocumentNotFoundError
 from requests import Session
-from requests.exceptions import ConnectionError
-from cachecontrol import CacheControl
-from cachecontrol.caches import FileCache
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+from requests.packages.urllib3.util.retry import Retry # @UnresolvedImport
+from threading import Lock, local
+import time, re
 
-SESSION = None
-SESSION_CACHE_PATH = '/tmp'
+MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)')
+
+class UriSession(object):
+    """
+    Thread-safe HTTP session for ARIA URI loaders.
+    
+    Every thread gets its own :class:`requests.Session`, but they all share a single adapter, and
+    thus also share per-host connection pools. This allows many documents to be loaded in parallel
+    from the same hosts without serializing on one session.
+    
+    Responses are cached in memory. A cached response is reused as is while it is fresh according
+    to the "max-age" directive of its "Cache-Control" header, and is otherwise revalidated via
+    "If-None-Match" and "If-Modified-Since" headers if it has an "ETag" or "Last-Modified" header.
+    Responses with "no-store" are never cached.
+
+    Responses are cached per URI, request headers and credentials (the :code:`auth` argument, or
+    else the thread's session's :code:`auth`, as well as its headers), so that a response is never
+    reused for a request with other credentials. Requests with credentials that cannot be hashed
+    are not cached.
+    """
+    
+    def __init__(self, pool_connections=10, pool_maxsize=10, timeout=10, retries=3, backoff_factor=0.1):
+        """
+        :param pool_connections: Number of hosts for which to keep connection pools
+        :param pool_maxsize: Maximum number of connections to keep per host
+        :param timeout: Timeout in seconds for connecting and for reading (per request)
+        :param retries: Total number of retries allowed per request (connection errors, reads, redirects and 5xx statuses)
+        :param backoff_factor: Used to calculate sleep times between retries
+        """
+        
+        self.timeout = timeout
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=(500, 502, 503, 504), raise_on_status=False))
+        
+        self._local = local()
+        self._cache = {}
+        self._lock = Lock()
+    
+    @property
+    def session(self):
+        """
+        The :class:`requests.Session` for the current thread.
+        """
+        
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = Session()
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._local.session = session
+        return session
+
+    def get(self, uri, headers=None, auth=None):
+        """
+        Sends a GET request, or returns a cached response if it is still valid.
+        
+        :param auth: Passed to :code:`requests` (defaults to the session's)
+        :rtype: :class:`requests.Response`
+        """
+        
+        headers = dict(headers) if headers else {}
+        session = self.session
+        key = _get_cache_key(uri, headers, auth, session)
+        
+        entry = None
+        if key is not None:
+            with self._lock:
+                entry = self._cache.get(key)
+
+        if entry is not None:
+            response, expires = entry
+            if (expires is not None) and (time.time() < expires):
+                return response
+            etag = response.headers.get('ETag')
+            if etag is not None:
+                headers['If-None-Match'] = etag
+            last_modified = response.headers.get('Last-Modified')
+            if last_modified is not None:
+                headers['If-Modified-Since'] = last_modified
+        
+        r = session.get(uri, headers=headers, auth=auth, timeout=self.timeout)
+        
+        if (r.status_code == 304) and (entry is not None):
+            # Not modified, so keep our response, but refresh its freshness according to the new headers
+            response = entry[0]
+            self._cache_response(key, response, r.headers)
+            return response
+        
+        if (r.status_code == 200) and (key is not None):
+            self._cache_response(key, r)
+        
+        return r
+
+    def clear(self):
+        """
+        Clears the response cache.
+        """
+        
+        with self._lock:
+            self._cache.clear()
+
+    def _cache_response(self, key, response, headers=None):
+        if headers is None:
+            headers = response.headers
+        cache_control = headers.get('Cache-Control', '').lower()
+        if 'no-store' in cache_control:
+            with self._lock:
+                self._cache.pop(key, None)
+            return
+
+        expires = None
+        if 'no-cache' not in cache_control:
+            max_age = MAX_AGE_RE.search(cache_control)
+            if max_age is not None:
+                expires = time.time() + int(max_age.group(1))
+
+        if (expires is None) and ('ETag' not in response.headers) and ('Last-Modified' not in response.headers):
+            # Can't be revalidated
+            return
+
+        # Make sure the content is read now, while we are the only thread with access to the response
+        response.content
+        with self._lock:
+            self._cache[key] = (response, expires)
+
+SESSION = UriSession()
+
+def _get_cache_key(uri, headers, auth, session):
+    if auth is None:
+        auth = session.auth
+    key = (uri, _freeze_headers(headers), _freeze_headers(session.headers), auth)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+def _freeze_headers(headers):
+    # Header names are case-insensitive
+    return frozenset((k.lower(), v) for k, v in headers.iteritems()) if headers else None
 
 class UriLoader(Loader):
     """
@@ -30,22 +172,28 @@ class UriLoader(Loader):
     
     Extracts a document from a URI.
     
+    Uses the :class:`UriSession` in the context, or the global :code:`SESSION` if no context is
+    provided.
+    
     Note that the "file:" schema is not supported: :class:`FileTextLoader` should
     be used instead.
     """
 
-    def __init__(self, location, headers={}):
+    def __init__(self, location, headers={}, context=None):
         self.location = location
         self.headers = headers
+        self.context = context
         self.response = None
     
     def open(self):
-        global SESSION
-        if SESSION is None:
-            SESSION = CacheControl(Session(), cache=FileCache(SESSION_CACHE_PATH))
+        if self.response is not None:
+            # Already open
+            return
+
+        session = self.context.uri_session if self.context is not None else SESSION
             
         try:
-            self.response = SESSION.get(self.location.uri, headers=self.headers)
+            self.response = session.get(self.location.uri, headers=self.headers)
             status = self.response.status_code
             if status == 404:
                 self.response = None
@@ -53,6 +201,10 @@ class UriLoader(Loader):
             elif status != 200:
                 self.response = None
                 raise LoaderError('URI request error %d: "%s"' % (status, self.location))
+        except (DocumentNotFoundError, LoaderError):
+            raise
+        except Timeout as e:
+            raise LoaderError('URI timeout: "%s"' % self.location, cause=e)
         except ConnectionError as e:
             raise LoaderError('URI connection error: "%s"' % self.location, cause=e)
         except Exception as e:
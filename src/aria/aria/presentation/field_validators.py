@@ -64,7 +64,7 @@ def list_length_validator(length):
     
     Assumes that the field is a list.
     
-    Can be used with the :func:`field_validator` decorator.
+    Can be used with the :func:`field_validator` decorator, with :code:`level=Issue.FIELD`.
     """
 
     def validator_fn(field, presentation, context):
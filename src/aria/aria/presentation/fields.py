@@ -16,7 +16,7 @@
 
 from ..exceptions import InvalidValueError, AriaError
 from ..validation import Issue
-from ..utils import ReadOnlyList, ReadOnlyDict, print_exception, deepcopy_with_locators, merge, cachedmethod, puts
+from ..utils import ReadOnlyList, ReadOnlyDict, LazyReadOnlyDict, print_exception, deepcopy_with_locators, merge, cachedmethod, puts
 from functools import wraps
 from types import MethodType
 from collections import OrderedDict
@@ -35,132 +35,180 @@ class Field(object):
         self.default = default
         self.allowed = allowed
         self.required = required
+
+        self._getters = {} # class -> compiled getter
     
     def get(self, presentation):
         return self._get(presentation)
     
     def _get(self, presentation):
-        default_raw = presentation._get_default_raw() if hasattr(presentation, '_get_default_raw') else None
-
-        if default_raw is None:
-            raw = presentation._raw
-        else:
-            raw = deepcopy_with_locators(default_raw)
-            merge(raw, presentation._raw)
+        cls = presentation.__class__
+        getter = self._getters.get(cls)
+        if getter is None:
+            getter = self._getters[cls] = self._compile_getter(cls)
+        return getter(presentation)
+
+    def _compile_getter(self, cls):
+        """
+        Creates the default getter function for presentations of the class.
+
+        Everything that does not depend on the presentation (the field variant, the class's
+        :code:`_get_default_raw` hook and short form field, and whether there is a default, a list
+        of allowed values or a class to coerce to) is resolved here, once, so that the getter does
+        only what it must.
+        """
+
+        field = self
+        name = self.name
+        field_cls = self.cls
+        default = self.default
+        allowed = self.allowed
+        required = self.required
+        field_variant = self.field_variant
+
+        get_raw = get_raw_with_default if hasattr(cls, '_get_default_raw') else None
+
+        if field_variant == 'primitive_dict_unknown_fields':
+            if field_cls is None:
+                def convert_raw(raw, presentation):
+                    if isinstance(raw, dict):
+                        return ReadOnlyDict(raw)
+                    return None
+            else:
+                def convert_raw(raw, presentation):
+                    if isinstance(raw, dict):
+                        fields = presentation.FIELDS
+                        r = OrderedDict()
+                        for k, v in raw.iteritems():
+                            if k not in fields:
+                                if not isinstance(v, field_cls):
+                                    try:
+                                        r[k] = field_cls(v)
+                                    except ValueError:
+                                        raise InvalidValueError('%s is not a dict of "%s" values: entry "%s" is %s' % (field.fullname, field.fullclass, k, repr(v)), locator=field.get_locator(raw))
+                        return ReadOnlyDict(r)
+                    return None
+            return _with_raw(get_raw, convert_raw)
+
+        elif field_variant == 'object_dict_unknown_fields':
+            def convert_raw(raw, presentation):
+                if isinstance(raw, dict):
+                    fields = presentation.FIELDS
+                    return LazyReadOnlyDict(((k, v) for k, v in raw.iteritems() if k not in fields), lambda k, v: field_cls(name=k, raw=v, container=presentation))
+                return None
+            return _with_raw(get_raw, convert_raw)
 
-        if self.field_variant == 'primitive_dict_unknown_fields':
-            if isinstance(raw, dict):
-                r = raw
-                if self.cls is not None:
+        if field_variant == 'primitive':
+            if field_cls is None:
+                convert = None
+            else:
+                def convert(value, raw, presentation):
+                    if not isinstance(value, field_cls):
+                        try:
+                            return field_cls(value)
+                        except ValueError:
+                            raise InvalidValueError('%s is not a valid "%s": %s' % (field.fullname, field.fullclass, repr(value)), locator=field.get_locator(raw))
+                    return value
+
+        elif field_variant == 'primitive_list':
+            def convert(value, raw, presentation):
+                if not isinstance(value, list):
+                    raise InvalidValueError('%s is not a list: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw))
+                r = value
+                if field_cls is not None:
+                    r = []
+                    for i in range(len(value)):
+                        v = value[i]
+                        if isinstance(v, field_cls):
+                            r.append(v)
+                        else:
+                            try:
+                                r.append(field_cls(v))
+                            except ValueError:
+                                raise InvalidValueError('%s is not a list of "%s": element %d is %s' % (field.fullname, field.fullclass, i, repr(v)), locator=field.get_locator(raw))
+                return ReadOnlyList(r)
+
+        elif field_variant == 'primitive_dict':
+            def convert(value, raw, presentation):
+                if not isinstance(value, dict):
+                    raise InvalidValueError('%s is not a dict: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw))
+                r = value
+                if field_cls is not None:
                     r = OrderedDict()
-                    for k, v in raw.iteritems():
-                        if k not in presentation.FIELDS:
-                            if not isinstance(v, self.cls):
-                                try:
-                                    r[k] = self.cls(v)
-                                except ValueError:
-                                    raise InvalidValueError('%s is not a dict of "%s" values: entry "%d" is %s' % (self.fullname, self.fullclass, k, repr(v)), locator=self.get_locator(raw))
+                    for k, v in value.iteritems():
+                        if isinstance(v, field_cls):
+                            r[k] = v
+                        else:
+                            try:
+                                r[k] = field_cls(v)
+                            except ValueError:
+                                raise InvalidValueError('%s is not a dict of "%s" values: entry "%s" is %s' % (field.fullname, field.fullclass, k, repr(v)), locator=field.get_locator(raw))
                 return ReadOnlyDict(r)
-            return None
-        
-        elif self.field_variant == 'object_dict_unknown_fields':
-            if isinstance(raw, dict):
-                return ReadOnlyDict(((k, self.cls(name=k, raw=v, container=presentation)) for k, v in raw.iteritems() if k not in presentation.FIELDS))
-            return None
-
-        is_short_form_field = (self.container_cls.SHORT_FORM_FIELD == self.name) if hasattr(self.container_cls, 'SHORT_FORM_FIELD') else False
-        is_dict = isinstance(raw, dict)
 
-        value = None
-        if is_short_form_field and not is_dict:
-            value = raw
-        elif is_dict:
-            value = raw.get(self.name, self.default)
-
-        if value is None:
-            if self.required:
-                raise InvalidValueError('required %s does not have a value' % self.fullname, locator=self.get_locator(raw))
-            else:
-                return None
-        
-        if self.allowed is not None:
-            if value not in self.allowed:
-                raise InvalidValueError('%s is not %s' % (self.fullname, ' or '.join([repr(v) for v in self.allowed])), locator=self.get_locator(raw))
-
-        if self.field_variant == 'primitive':
-            if (self.cls is not None) and not isinstance(value, self.cls):
+        elif field_variant == 'object':
+            def convert(value, raw, presentation):
                 try:
-                    return self.cls(value)
-                except ValueError:
-                    raise InvalidValueError('%s is not a valid "%s": %s' % (self.fullname, self.fullclass, repr(value)), locator=self.get_locator(raw))
-            return value
+                    return field_cls(raw=value, container=presentation)
+                except TypeError as e:
+                    raise InvalidValueError('%s cannot not be initialized to an instance of "%s": %s' % (field.fullname, field.fullclass, repr(value)), cause=e, locator=field.get_locator(raw))
+
+        elif field_variant == 'object_list':
+            def convert(value, raw, presentation):
+                if not isinstance(value, list):
+                    raise InvalidValueError('%s is not a list: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw))
+                return ReadOnlyList((field_cls(raw=v, container=presentation) for v in value))
+
+        elif field_variant == 'object_dict':
+            def convert(value, raw, presentation):
+                if not isinstance(value, dict):
+                    raise InvalidValueError('%s is not a dict: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw))
+                return LazyReadOnlyDict(value.iteritems(), lambda k, v: field_cls(name=k, raw=v, container=presentation))
+
+        elif field_variant == 'sequenced_object_list':
+            def convert(value, raw, presentation):
+                if not isinstance(value, list):
+                    raise InvalidValueError('%s is not a sequenced list (a list of dicts, each with exactly one key): %s' % (field.fullname, repr(value)), locator=field.get_locator(raw))
+                sequence = []
+                for v in value:
+                    if not isinstance(v, dict):
+                        raise InvalidValueError('%s list elements are not all dicts with exactly one key: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw))
+                    if len(v) != 1:
+                        raise InvalidValueError('%s list elements do not all have exactly one key: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw))
+                    k, vv = v.items()[0]
+                    sequence.append((k, field_cls(name=k, raw=vv, container=presentation)))
+                return ReadOnlyList(sequence)
 
-        elif self.field_variant == 'primitive_list':
-            if not isinstance(value, list):
-                raise InvalidValueError('%s is not a list: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
-            r = value
-            if self.cls is not None:
-                r = []
-                for i in range(len(value)):
-                    v = value[i]
-                    if isinstance(v, self.cls):
-                        r.append(v)
-                    else:
-                        try:
-                            r.append(self.cls(v))
-                        except ValueError:
-                            raise InvalidValueError('%s is not a list of "%s": element %d is %s' % (self.fullname, self.fullclass, i, repr(v)), locator=self.get_locator(raw))
-            return ReadOnlyList(r)
-
-        elif self.field_variant == 'primitive_dict':
-            if not isinstance(value, dict):
-                raise InvalidValueError('%s is not a dict: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
-            r = value
-            if self.cls is not None:
-                r = OrderedDict()
-                for k, v in value.iteritems():
-                    if isinstance(v, self.cls):
-                        r[k] = v
-                    else:
-                        try:
-                            r[k] = self.cls(v)
-                        except ValueError:
-                            raise InvalidValueError('%s is not a dict of "%s" values: entry "%d" is %s' % (self.fullname, self.fullclass, k, repr(v)), locator=self.get_locator(raw))
-            return ReadOnlyDict(r)
+        else:
+            def unsupported(presentation):
+                raw = presentation._raw
+                locator = field.get_locator(raw)
+                location = (', at %s' % locator) if locator is not None else ''
+                raise AttributeError('%s has unsupported field variant: "%s"%s' % (field.fullname, field_variant, location))
+            return unsupported
 
-        elif self.field_variant == 'object':
-            try:
-                return self.cls(raw=value, container=presentation)
-            except TypeError as e:
-                raise InvalidValueError('%s cannot not be initialized to an instance of "%s": %s' % (self.fullname, self.fullclass, repr(value)), cause=e, locator=self.get_locator(raw))
+        is_short_form_field = getattr(cls, 'SHORT_FORM_FIELD', None) == name
 
-        elif self.field_variant == 'object_list':
-            if not isinstance(value, list):
-                raise InvalidValueError('%s is not a list: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
-            return ReadOnlyList((self.cls(raw=v, container=presentation) for v in value))
+        def convert_raw(raw, presentation):
+            if isinstance(raw, dict):
+                value = raw.get(name, default)
+            elif is_short_form_field:
+                value = raw
+            else:
+                value = None
 
-        elif self.field_variant == 'object_dict':
-            if not isinstance(value, dict):
-                raise InvalidValueError('%s is not a dict: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
-            return ReadOnlyDict(((k, self.cls(name=k, raw=v, container=presentation)) for k, v in value.iteritems()))
+            if value is None:
+                if required:
+                    raise InvalidValueError('required %s does not have a value' % field.fullname, locator=field.get_locator(raw))
+                return None
 
-        elif self.field_variant == 'sequenced_object_list':
-            if not isinstance(value, list):
-                raise InvalidValueError('%s is not a sequenced list (a list of dicts, each with exactly one key): %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
-            sequence = []
-            for v in value:
-                if not isinstance(v, dict):
-                    raise InvalidValueError('%s list elements are not all dicts with exactly one key: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
-                if len(v) != 1:
-                    raise InvalidValueError('%s list elements do not all have exactly one key: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
-                k, vv = v.items()[0]
-                sequence.append((k, self.cls(name=k, raw=vv, container=presentation)))
-            return ReadOnlyList(sequence)
+            if (allowed is not None) and (value not in allowed):
+                raise InvalidValueError('%s is not %s' % (field.fullname, ' or '.join([repr(v) for v in allowed])), locator=field.get_locator(raw))
 
-        else:
-            locator = self.get_locator(raw)
-            location = (', at %s' % locator) if locator is not None else ''
-            raise AttributeError('%s has unsupported field variant: "%s"%s' % (self.fullname, self.field_variant, location))
+            if convert is None:
+                return value
+            return convert(value, raw, presentation)
+
+        return _with_raw(get_raw, convert_raw)
 
     def set(self, presentation, value):
         return self._set(presentation, value)
@@ -169,11 +217,13 @@ class Field(object):
         raw = presentation._raw
         old = self.get(presentation)
         raw[self.name] = value
+        _reset_method_cache(presentation)
         try:
             # Validates our value
             self.get(presentation)
         except Exception as e:
             raw[self.name] = old
+            _reset_method_cache(presentation)
             raise e
         return old
 
@@ -197,16 +247,16 @@ class Field(object):
             if self.field_variant == 'object_list':
                 for v in value:
                     if hasattr(v, '_validate'):
-                        v._validate(context)
+                        _validate_element(v, context)
             elif self.field_variant == 'sequenced_object_list':
                 for _, v in value:
                     if hasattr(v, '_validate'):
-                        v._validate(context)
-        elif isinstance(value, dict):
-            if self.field_variant in ('object_dict', 'object_dict_unknown_fields'):
+                        _validate_element(v, context)
+        elif self.field_variant in ('object_dict', 'object_dict_unknown_fields'):
+            if value is not None:
                 for v in value.itervalues():
                     if hasattr(v, '_validate'):
-                        v._validate(context)
+                        _validate_element(v, context)
         
         if hasattr(value, '_validate'):
             value._validate(context)
@@ -221,9 +271,7 @@ class Field(object):
 
     def get_locator(self, raw):
         if hasattr(raw, '_locator'):
-            if isinstance(raw._locator.children, dict):
-                return raw._locator.children.get(self.name, raw._locator)
-            return raw._locator
+            return raw._locator.get_child(self.name)
         return None
     
     def dump(self, presentation, context):
@@ -320,7 +368,9 @@ def has_fields(cls):
        they have them.
     
     2. Generates automatic :code:`@property` implementations for the fields
-       with the help of a set of special function decorators.
+       with the help of a set of special function decorators. The getters are
+       compiled per class and field, so that the work that does not depend on
+       the presentation is done only once.
 
     The class also works with the Python dict protocol, so that
     fields can be accessed via dict semantics. The functionality is
@@ -352,25 +402,12 @@ def has_fields(cls):
             
             field.name = name
             field.container_cls = cls
-            
-            # This function is here just to create an enclosed scope for "field"
-            def closure(field):
-                
-                # By convention, we have the getter wrap the original function.
-                # (It is, for example, where the Python help() function will look for
-                # docstrings when encountering a property.)
-                @cachedmethod
-                @wraps(field.fn)
-                def getter(self):
-                    return field.get(self)
-                    
-                def setter(self, value):
-                    field.set(self, value)
-
-                # Convert to Python property
-                return property(fget=getter, fset=setter)
-
-            setattr(cls, name, closure(field))
+
+    # Properties are generated for inherited fields, too, so that every class gets getters that
+    # were compiled for it
+    for name, field in cls.FIELDS.iteritems():
+        if isinstance(cls.__dict__.get(name), Field) or (name not in cls.__dict__):
+            _install_field_property(cls, field)
 
     # Bind methods
     setattr(cls, '_iter_field_names', MethodType(has_fields_iter_field_names, None, cls))
@@ -386,6 +423,64 @@ def has_fields(cls):
     
     return cls
 
+@cachedmethod
+def get_raw_with_default(presentation):
+    """
+    Returns the presentation's raw data merged over its default raw data (as returned by its
+    :code:`_get_default_raw` hook), or just its raw data if it has no default.
+
+    The merged raw data is a copy, which is materialized once and then cached together with the
+    presentation's cached methods.
+    """
+
+    default_raw = presentation._get_default_raw()
+    if default_raw is None:
+        return presentation._raw
+    raw = deepcopy_with_locators(default_raw)
+    merge(raw, presentation._raw)
+    return raw
+
+def _reset_method_cache(presentation):
+    if hasattr(presentation, '_reset_method_cache'):
+        presentation._reset_method_cache()
+
+def _validate_element(presentation, context):
+    # Elements of object lists and dicts may be validated in other processes
+    if context.validation.reached_max_issues:
+        return
+    partition = context.validation.partition
+    if partition is not None:
+        partition.validate(presentation, context)
+    else:
+        presentation._validate(context)
+
+def _with_raw(get_raw, convert_raw):
+    if get_raw is None:
+        def getter(presentation):
+            return convert_raw(presentation._raw, presentation)
+    else:
+        def getter(presentation):
+            return convert_raw(get_raw(presentation), presentation)
+    return getter
+
+def _install_field_property(cls, field):
+    # By convention, we have the getter wrap the original function.
+    # (It is, for example, where the Python help() function will look for
+    # docstrings when encountering a property.)
+    if 'get' in field.__dict__:
+        # Overridden by @field_getter
+        def getter(self):
+            return field.get(self)
+    else:
+        getter = field._getters[cls] = field._compile_getter(cls)
+    getter = cachedmethod(wraps(field.fn)(getter))
+
+    def setter(self, value):
+        field.set(self, value)
+
+    # Convert to Python property
+    setattr(cls, field.name, property(fget=getter, fset=setter))
+
 def short_form_field(name):
     """
     Class decorator for specifying the short form field.
@@ -395,6 +490,8 @@ def short_form_field(name):
     def decorator(cls):
         if hasattr(cls, name) and hasattr(cls, 'FIELDS') and (name in cls.FIELDS):
             setattr(cls, 'SHORT_FORM_FIELD', name)
+            # The getter must be compiled again to support the short form
+            _install_field_property(cls, cls.FIELDS[name])
             return cls
         else:
             raise AttributeError('@short_form_field must be used with a Field name in @has_fields class')
@@ -537,18 +634,28 @@ def field_setter(setter_fn):
             raise AttributeError('@field_setter must be used with a Field')
     return decorator
 
-def field_validator(validator_fn):
+def field_validator(validator_fn, level=Issue.BETWEEN_TYPES):
     """
     Function decorator for overriding the validator function of a field.
     
     The signature of the validator function must be: :code:f(field, presentation, context)`.
     The default validator can be accessed as :code:`field._validate(presentation, context)`.
     
+    The level is the lowest validation level of the issues that the validator function reports
+    in addition to those of the default validator. Most validators check references between
+    types, hence the default. If the level is above the validation context's :code:`max_level`
+    then only the default validator is called.
+    
     The function must already be decorated with a field decorator.
     """
+    def validate(field, presentation, context):
+        if context.validation.should_validate(level):
+            return validator_fn(field, presentation, context)
+        return field._validate(presentation, context)
+
     def decorator(field):
         if isinstance(field, Field):
-            field.validate = MethodType(validator_fn, field, Field)
+            field.validate = MethodType(validate, field, Field)
             return field
         else:
             raise AttributeError('@field_validator must be used with a Field')
@@ -27,7 +27,7 @@ class Presenter(Presentation):
     def _merge_import(self, presentation):
         merge(self._raw, presentation._raw)
         if hasattr(self._raw, '_locator') and hasattr(presentation._raw, '_locator'):
-            self._raw._locator.merge(presentation._raw._locator)
+            self._raw._locator.merge(presentation._raw._locator, self._raw)
 
     def _link(self):
         locator = self._raw._locator
@@ -21,6 +21,8 @@ def validate_no_short_form(presentation, context):
     Makes sure that we can use short form definitions only if we allowed it.
     """
     
+    if not context.validation.should_validate(Issue.BETWEEN_FIELDS):
+        return
     if (not hasattr(presentation, 'SHORT_FORM_FIELD')) and (not isinstance(presentation._raw, dict)):
         context.validation.report('short form not allowed for field "%s"' % presentation._fullname, locator=presentation._locator, level=Issue.BETWEEN_FIELDS)
 
@@ -29,6 +31,8 @@ def validate_no_unknown_fields(presentation, context):
     Make sure that we can use unknown fields only if we allowed it.
     """
     
+    if not context.validation.should_validate(Issue.BETWEEN_FIELDS):
+        return
     if (not getattr(presentation, 'ALLOW_UNKNOWN_FIELDS', False)) and (not context.validation.allow_unknown_fields) and isinstance(presentation._raw, dict) and hasattr(presentation, 'FIELDS'):
         for k in presentation._raw:
             if k not in presentation.FIELDS:
@@ -37,12 +41,30 @@ def validate_no_unknown_fields(presentation, context):
 def validate_known_fields(presentation, context):
     """
     Validates all known fields.
+    
+    Stops as soon as the maximum number of issues has been reached.
     """
     
     if hasattr(presentation, '_iter_fields'):
         for _, field in presentation._iter_fields():
+            if context.validation.reached_max_issues:
+                break
             field.validate(presentation, context)
 
+def validate_passes(context, level, *passes):
+    """
+    Calls validation passes in order, as :code:`pass_fn(context)`, for the issues they report.
+    
+    The level is the lowest validation level of the issues that the passes report. Passes are
+    skipped if the validation context says that such issues are not worth validating, either
+    because of its :code:`max_level` or because the maximum number of issues has been reached.
+    """
+    
+    for pass_fn in passes:
+        if not context.validation.should_validate(level):
+            break
+        pass_fn(context)
+
 def report_issue_for_unknown_type(context, presentation, type_name, field_name, value=None):
     if value is None:
         value = getattr(presentation, field_name)
@@ -16,13 +16,15 @@
 
 from .exceptions import ReaderError, ReaderNotFoundError, ReaderSyntaxError, AlreadyReadError
 from .reader import Reader
-from .source import ReaderSource, DefaultReaderSource
+from .source import ReaderSource, DefaultReaderSource, FastReaderSource
 from .context import ReadingContext
+from .cache import READ_CACHE, ReadCache
+from .bundle import BUNDLE_EXTENSION, PROFILE_BUNDLES, ProfileBundle, ProfileBundles, ProfileBundleRecorder
 from .raw import RawReader
 from .locator import Locator
-from .yaml import YamlReader
+from .yaml import YamlReader, FastYamlReader
 from .json import JsonReader
-from .jinja import JinjaReader
+from .jinja import JINJA_TEMPLATE_CACHE, JinjaTemplateCache, JinjaReader
 
 __all__ = (
     'ReaderError',
@@ -32,9 +34,20 @@ __all__ = (
     'Reader',
     'ReaderSource',
     'DefaultReaderSource',
+    'FastReaderSource',
     'ReadingContext',
+    'READ_CACHE',
+    'ReadCache',
+    'BUNDLE_EXTENSION',
+    'PROFILE_BUNDLES',
+    'ProfileBundle',
+    'ProfileBundles',
+    'ProfileBundleRecorder',
     'RawReader',
     'Locator',
     'YamlReader',
+    'FastYamlReader',
     'JsonReader',
+    'JINJA_TEMPLATE_CACHE',
+    'JinjaTemplateCache',
     'JinjaReader')
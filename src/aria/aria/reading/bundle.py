@@ -0,0 +1,249 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .. import VERSION
+from threading import Lock
+from hashlib import sha1
+from cStringIO import StringIO
+import cPickle, itertools, os
+
+BUNDLE_EXTENSION = '.bundle'
+
+BUNDLE_FORMAT = 1
+
+def get_digest(data):
+    if isinstance(data, unicode):
+        data = data.encode('utf8')
+    return sha1(data).hexdigest()
+
+class ProfileBundle(object):
+    """
+    Precompiled agnostic raw data (and locators) for a profile document and all of its imports.
+
+    Documents are stored by their path relative to the bundle's directory, together with a digest
+    of their source. A document is only ever taken from the bundle if its source is unchanged.
+
+    The documents' locations are pickled as references and replaced by the actual location on
+    retrieval, so that a bundle remains valid if it is moved together with its profile (for
+    example, when it is installed).
+    """
+
+    def __init__(self, path, documents=None):
+        """
+        :param path: Path of the bundle file
+        :param documents: Dict of relative path to (digest, pickled raw data)
+        """
+
+        self.path = path
+        self.documents = documents or {}
+
+    @property
+    def root(self):
+        return os.path.dirname(os.path.realpath(self.path))
+
+    def get_relative_path(self, path):
+        return os.path.relpath(os.path.realpath(path), self.root).replace(os.sep, '/')
+
+    def add(self, location, data, raw):
+        """
+        Adds the agnostic raw data read from the data at the location.
+        """
+
+        relative_path = self.get_relative_path(location.as_file)
+        f = StringIO()
+        pickler = cPickle.Pickler(f, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = lambda obj: 'location' if obj is location else None
+        pickler.dump((raw, getattr(raw, '_locator', None)))
+        self.documents[relative_path] = (get_digest(data), f.getvalue())
+
+    def get(self, location, data):
+        """
+        Returns a fresh copy of the agnostic raw data for the location, or None if the bundle
+        does not have it or if the data has changed since the bundle was compiled.
+        """
+
+        document = self.documents.get(self.get_relative_path(location.as_file))
+        if (document is None) or (document[0] != get_digest(data)):
+            return None
+
+        unpickler = cPickle.Unpickler(StringIO(document[1]))
+        unpickler.persistent_load = lambda pid: location
+        raw, locator = unpickler.load()
+        if locator is not None:
+            setattr(raw, '_locator', locator)
+        return raw
+
+    def save(self):
+        with open(self.path, 'wb') as f:
+            cPickle.dump({
+                'format': BUNDLE_FORMAT,
+                'version': VERSION,
+                'documents': self.documents}, f, cPickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def open(path):
+        """
+        Returns the bundle at the path, or None if it cannot be read or was compiled by a
+        different version of ARIA.
+        """
+
+        try:
+            with open(path, 'rb') as f:
+                bundle = cPickle.load(f)
+            if (bundle.get('format') != BUNDLE_FORMAT) or (bundle.get('version') != VERSION):
+                return None
+            return ProfileBundle(path, bundle['documents'])
+        except Exception:
+            return None
+
+class ProfileBundles(object):
+    """
+    Finds :class:`ProfileBundle` instances for file locations.
+
+    A bundle is found if it is in the same directory as the file (bundles are looked for only once
+    per directory) and has a document for it. Bundles are deserialized once and then kept.
+
+    Because deserializing a bundle can execute arbitrary code, bundles are only looked for in
+    trusted directories (and their subdirectories): those given here or with
+    :meth:`add_directory`, such as the profile directories installed by extensions. Files
+    anywhere else are always read from source.
+
+    The implementation is thread-safe.
+    """
+
+    def __init__(self, directories=None):
+        """
+        :param directories: Iterable of trusted directories
+        """
+
+        self.hits = 0
+        self.misses = 0
+
+        self._trusted_directories = []
+        self._directories = {} # directory -> list of bundles
+        self._lock = Lock()
+
+        if directories:
+            for directory in directories:
+                self.add_directory(directory)
+
+    @property
+    def trusted_directories(self):
+        with self._lock:
+            return list(self._trusted_directories)
+
+    def add_directory(self, directory):
+        """
+        Trusts the bundles in the directory and its subdirectories.
+        """
+
+        directory = os.path.realpath(directory)
+        with self._lock:
+            if directory not in self._trusted_directories:
+                self._trusted_directories.append(directory)
+
+    def get(self, location, data):
+        """
+        Returns a fresh copy of the agnostic raw data for the location from a bundle, or None.
+        """
+
+        path = getattr(location, 'as_file', None)
+        if path is None:
+            return None
+
+        raw = None
+        directory = os.path.dirname(os.path.realpath(path))
+        if self._is_trusted(directory):
+            for bundle in self._get_bundles(directory):
+                raw = bundle.get(location, data)
+                if raw is not None:
+                    break
+
+        with self._lock:
+            if raw is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return raw
+
+    def clear(self):
+        with self._lock:
+            self._directories.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self):
+        """
+        Compatible with Python 3's :code:`functools.lru_cache`.
+        """
+
+        with self._lock:
+            return (self.hits, self.misses, None, len(self._directories))
+
+    def _is_trusted(self, directory):
+        with self._lock:
+            for trusted_directory in self._trusted_directories:
+                if (directory == trusted_directory) or directory.startswith(os.path.join(trusted_directory, '')):
+                    return True
+        return False
+
+    def _get_bundles(self, directory):
+        with self._lock:
+            bundles = self._directories.get(directory)
+            if bundles is None:
+                bundles = []
+                try:
+                    names = sorted(os.listdir(directory))
+                except OSError:
+                    names = []
+                for name in names:
+                    if name.endswith(BUNDLE_EXTENSION):
+                        bundle = ProfileBundle.open(os.path.join(directory, name))
+                        if bundle is not None:
+                            bundles.append(bundle)
+                self._directories[directory] = bundles
+            return bundles
+
+class ProfileBundleRecorder(object):
+    """
+    Records every document read into a :class:`ProfileBundle`.
+
+    Used as the reading context's cache while compiling a bundle, so that it is handed the agnostic
+    raw data right after it is read, before presenters get to modify it. It never returns data, so
+    that every document is actually read.
+    """
+
+    def __init__(self, bundle):
+        self.bundle = bundle
+
+        self._keys = {}
+        self._counter = itertools.count()
+
+    def get_key(self, location, data, reader_class, variant=None):
+        key = next(self._counter)
+        self._keys[key] = (location, data)
+        return key
+
+    def get(self, key):
+        return None
+
+    def put(self, key, raw):
+        location, data = self._keys.pop(key)
+        if getattr(location, 'as_file', None) is not None:
+            self.bundle.add(location, data, raw)
+
+PROFILE_BUNDLES = ProfileBundles()
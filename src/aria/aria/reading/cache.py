@@ -0,0 +1,203 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .. import VERSION
+from collections import OrderedDict
+from threading import Lock
+from hashlib import sha1
+import cPickle, os, stat, tempfile
+
+class ReadCache(object):
+    """
+    Two-tier cache for agnostic raw data produced by readers.
+
+    Entries are keyed by the location, the content digest, the reader class and the ARIA version,
+    so that a change in any of them will cause a cache miss.
+
+    The first tier is an in-process LRU of pickled entries. The optional second tier is a directory
+    of pickle files that persists between runs. Entries are always unpickled on retrieval, so every
+    reader gets its own copy of the agnostic raw data and its locators, which it is free to modify.
+
+    Because unpickling can execute arbitrary code, the on-disk tier is only used if the directory
+    is private (see :func:`is_private`), and an entry is only read if its file is private, too.
+    The directory is created private if it does not exist.
+
+    The implementation is thread-safe.
+    """
+
+    def __init__(self, size=128, path=None):
+        """
+        :param size: Maximum number of entries in the in-process tier
+        :param path: Directory for the on-disk tier (defaults to none, meaning no on-disk tier)
+        """
+
+        self.size = size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get_key(self, location, data, reader_class, variant=None):
+        """
+        Generates a key for data read from the location by the reader class.
+
+        The optional variant distinguishes between different results of the same reader class.
+        """
+
+        if isinstance(data, unicode):
+            data = data.encode('utf8')
+        digest = sha1()
+        digest.update(VERSION)
+        digest.update('\0')
+        digest.update('%s.%s' % (reader_class.__module__, reader_class.__name__))
+        digest.update('\0')
+        digest.update(unicode(location).encode('utf8'))
+        digest.update('\0')
+        if variant is not None:
+            digest.update(str(variant))
+            digest.update('\0')
+        digest.update(str(data))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Returns a fresh copy of the cached agnostic raw data, or None if not cached.
+        """
+
+        with self._lock:
+            pickled = self._entries.pop(key, None)
+            if pickled is not None:
+                # Move to the end of the LRU
+                self._entries[key] = pickled
+
+        if (pickled is None) and (self.path is not None):
+            pickled = self._read_file(key)
+            if pickled is not None:
+                self._put_entry(key, pickled)
+
+        raw = None
+        if pickled is not None:
+            try:
+                raw, locator = cPickle.loads(pickled)
+                if locator is not None:
+                    setattr(raw, '_locator', locator)
+            except Exception:
+                raw = None
+
+        with self._lock:
+            if raw is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return raw
+
+    def put(self, key, raw):
+        """
+        Caches the agnostic raw data (and its locator, if it has one).
+
+        Silently does nothing if the data cannot be pickled.
+        """
+
+        try:
+            pickled = cPickle.dumps((raw, getattr(raw, '_locator', None)), cPickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        self._put_entry(key, pickled)
+        if self.path is not None:
+            self._write_file(key, pickled)
+
+    def clear(self):
+        """
+        Clears the in-process tier. The on-disk tier is left as is.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self):
+        """
+        Compatible with Python 3's :code:`functools.lru_cache`.
+        """
+
+        with self._lock:
+            return (self.hits, self.misses, self.size, len(self._entries))
+
+    def _put_entry(self, key, pickled):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = pickled
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def _get_file_path(self, key):
+        return os.path.join(self.path, 'aria-read-%s.pickle' % key)
+
+    def _read_file(self, key):
+        if not is_private(self.path):
+            return None
+        try:
+            with open(self._get_file_path(key), 'rb') as f:
+                if not is_private(f.fileno()):
+                    return None
+                return f.read()
+        except (IOError, OSError):
+            return None
+
+    def _write_file(self, key, pickled):
+        # Write to a temporary file and rename it, so that concurrent readers (even in other
+        # processes) never see a partially written entry
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path, 0700)
+            if not is_private(self.path):
+                return
+            fd, temp_path = tempfile.mkstemp(dir=self.path, prefix='.aria-read-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(pickled)
+                os.rename(temp_path, self._get_file_path(key))
+            except:
+                os.remove(temp_path)
+                raise
+        except (IOError, OSError):
+            # The on-disk tier is an optimization: failing to write to it is not an error
+            pass
+
+READ_CACHE = ReadCache()
+
+def is_private(path):
+    """
+    True if the file or directory (or open file descriptor) is owned by the current user and
+    cannot be written by anyone else, so that its contents can be trusted as much as the user's
+    own.
+    """
+
+    try:
+        if isinstance(path, (int, long)):
+            stat_result = os.fstat(path)
+        else:
+            stat_result = os.stat(path)
+    except OSError:
+        return False
+    if hasattr(os, 'getuid') and (stat_result.st_uid != os.getuid()):
+        return False
+    return not (stat_result.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
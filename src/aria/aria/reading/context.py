@@ -15,7 +15,9 @@
 #
 
 from .source import DefaultReaderSource
-from ..utils import LockedList
+from .cache import READ_CACHE
+from .jinja import JINJA_TEMPLATE_CACHE
+from .bundle import PROFILE_BUNDLES
 
 class ReadingContext(object):
     """
@@ -23,10 +25,35 @@ class ReadingContext(object):
     
     * :code:`reader_source`: For finding reader instances
     * :code:`reader`: Overrides :code:`reader_source` with a specific class
+    * :code:`cache`: :class:`ReadCache` for agnostic raw data (set to None to disable caching)
+    * :code:`profile_bundles`: :class:`ProfileBundles` with precompiled agnostic raw data for
+      profiles (set to None to always read profiles from source)
+    * :code:`jinja_template_cache`: :class:`JinjaTemplateCache` used by :class:`JinjaReader`
     """
     
     def __init__(self):
         self.reader_source = DefaultReaderSource()
         self.reader = None
+        self.cache = READ_CACHE
+        self.profile_bundles = PROFILE_BUNDLES
+        self.jinja_template_cache = JINJA_TEMPLATE_CACHE
         
-        self._locations = LockedList() # for keeping track of locations already read
+        self._locations = {} # location keys of locations already read
+
+    def _add_location(self, location):
+        """
+        Registers the location as read, returning False if an equivalent location was already
+        registered.
+
+        Does not require locking, because :code:`dict.setdefault` is atomic.
+        """
+
+        marker = object()
+        return self._locations.setdefault(location.key, marker) is marker
+
+    def _clear_locations(self):
+        """
+        Forgets all locations registered as read, so that they can be read again.
+        """
+
+        self._locations.clear()
@@ -15,10 +15,15 @@
 #
 
 from .. import VERSION
-from ..loading import LiteralLocation, LiteralLoader
+from ..loading import LiteralLocation, LiteralLoader, UriLocation
 from .reader import Reader
 from .exceptions import ReaderSyntaxError
-from jinja2 import Template
+from .cache import is_private
+from jinja2 import Environment
+from jinja2.bccache import FileSystemBytecodeCache
+from collections import OrderedDict
+from threading import Lock
+from hashlib import sha1
 import os
 
 # TODO: we could put a lot of other useful stuff here.
@@ -26,28 +31,155 @@ CONTEXT = {
     'ARIA_VERSION': VERSION,
     'ENV': os.environ}
 
+class _PrivateBytecodeCache(FileSystemBytecodeCache):
+    """
+    Jinja bytecode cache that only loads bytecode from private files (see :func:`is_private`).
+    """
+
+    def load_bytecode(self, bucket):
+        try:
+            f = open(self._get_cache_filename(bucket), 'rb')
+        except IOError:
+            return
+        try:
+            if is_private(f.fileno()):
+                bucket.load_bytecode(f)
+        finally:
+            f.close()
+
+class JinjaTemplateCache(object):
+    """
+    Compiles Jinja templates in a shared environment, caching them by a digest of their source.
+
+    The first tier is an in-process LRU of compiled templates. The optional second tier is a
+    directory of Jinja bytecode files that persists between runs, so that even the first render
+    in a new process can skip compilation.
+
+    Because loading bytecode executes it, the bytecode tier is only used if the directory is
+    private, and bytecode is only loaded from private files (see :func:`is_private`). The
+    directory is created private if it does not exist.
+
+    The implementation is thread-safe.
+    """
+
+    def __init__(self, size=64, path=None):
+        """
+        :param size: Maximum number of compiled templates in the in-process tier
+        :param path: Directory for the bytecode tier (defaults to none, meaning no bytecode tier)
+        """
+
+        self.size = size
+        self.path = path
+        self.environment = Environment(cache_size=0)
+        self.hits = 0
+        self.misses = 0
+
+        self._templates = OrderedDict()
+        self._lock = Lock()
+
+    def get_template(self, source):
+        """
+        Returns the compiled template for the source.
+        """
+
+        if isinstance(source, unicode):
+            key = sha1(source.encode('utf8')).hexdigest()
+        else:
+            key = sha1(source).hexdigest()
+
+        with self._lock:
+            template = self._templates.pop(key, None)
+            if template is not None:
+                # Move to the end of the LRU
+                self._templates[key] = template
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        template = self._compile(key, source)
+
+        with self._lock:
+            self._templates[key] = template
+            while len(self._templates) > self.size:
+                self._templates.popitem(last=False)
+
+        return template
+
+    def clear(self):
+        """
+        Clears the in-process tier. The bytecode tier is left as is.
+        """
+
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self):
+        """
+        Compatible with Python 3's :code:`functools.lru_cache`.
+        """
+
+        with self._lock:
+            return (self.hits, self.misses, self.size, len(self._templates))
+
+    def _compile(self, key, source):
+        # See jinja2.loaders.BaseLoader.load
+        code = None
+        bytecode_cache = None
+        bucket = None
+        if self.path is not None:
+            try:
+                if not os.path.isdir(self.path):
+                    os.makedirs(self.path, 0700)
+                if is_private(self.path):
+                    bytecode_cache = _PrivateBytecodeCache(self.path, 'aria-jinja-%s.cache')
+                    bucket = bytecode_cache.get_bucket(self.environment, key, None, source)
+                    code = bucket.code
+            except (IOError, OSError):
+                bytecode_cache = None
+
+        if code is None:
+            code = self.environment.compile(source, key)
+            if bytecode_cache is not None:
+                bucket.code = code
+                try:
+                    bytecode_cache.set_bucket(bucket)
+                except (IOError, OSError):
+                    # The bytecode tier is an optimization: failing to write to it is not an error
+                    pass
+
+        return self.environment.template_class.from_code(self.environment, code, self.environment.make_globals(None), None)
+
+JINJA_TEMPLATE_CACHE = JinjaTemplateCache()
+
 class JinjaReader(Reader):
     """
     ARIA Jinja reader.
     
     Forwards the rendered result to a new reader in the reader source.
+
+    Templates are compiled via the :class:`JinjaTemplateCache` in the context, or the global
+    :code:`JINJA_TEMPLATE_CACHE` if the context does not have one.
     """
 
     def read(self):
         data = self.load()
         try:
-            data = str(data)
-            template = Template(data)
+            data = unicode(data)
+            template_cache = getattr(self.context, 'jinja_template_cache', None) or JINJA_TEMPLATE_CACHE
+            template = template_cache.get_template(data)
             literal = template.render(CONTEXT)
-            # TODO: might be useful to write the literal result to a file for debugging
-            location = self.location
-            if isinstance(location, basestring) and location.endswith('.jinja'):
-                # Use reader based on the location with the ".jinja" prefix stripped off
-                location = '<literal> ' + location[:-6]
-                next_reader = self.context.reading.reader_source.get_reader(self.context, location, LiteralLoader(literal, location=location))
-            else:
-                # Use reader for literal loader
-                next_reader = self.context.reading.reader_source.get_reader(self.context, LiteralLocation(literal), LiteralLoader(literal))
-            return next_reader.read()
         except Exception as e:
             raise ReaderSyntaxError('Jinja: %s' % e, cause=e)
+
+        # TODO: might be useful to write the literal result to a file for debugging
+        location = self.location
+        if isinstance(location, UriLocation) and location.uri.endswith('.jinja'):
+            # Use reader based on the location with the ".jinja" suffix stripped off
+            location = UriLocation(location.uri[:-6])
+        else:
+            # Use reader for literal loader
+            location = LiteralLocation(literal)
+        next_reader = self.context.reader_source.get_reader(self.context, location, LiteralLoader(LiteralLocation(literal)))
+        return next_reader.read()
@@ -28,6 +28,9 @@ class JsonReader(Reader):
     
     def read(self):
         data = self.load()
+        return self._read_cached(data, self._read)
+
+    def _read(self, data):
         try:
             data = unicode(data)
             return json.loads(data, object_pairs_hook=OrderedDict)
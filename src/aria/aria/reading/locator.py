@@ -14,20 +14,32 @@
 # under the License.
 #
 
-from ..utils import puts, colored, indent
+from ..utils import puts, colored, indent, PLAIN_CONTAINER_CLASSES
 from ruamel import yaml # @UnresolvedImport
+from copy import copy
 
 # We are inheriting the primitive types in order to add the ability to set an attribute (_locator) on them.
 
+# Locatable scalars are immutable, like the primitives they inherit, and their locators are never
+# changed once linked, so deep copies of agnostic raw data can share them with the original.
+
 class LocatableString(unicode):
-    pass
+    def __deepcopy__(self, memo):
+        return self
 
 class LocatableInt(int):
-    pass
+    def __deepcopy__(self, memo):
+        return self
 
 class LocatableFloat(float):
+    def __deepcopy__(self, memo):
+        return self
+
+class LocatableList(list):
     pass
 
+PLAIN_CONTAINER_CLASSES.add(LocatableList)
+
 def wrap(value):
     if isinstance(value, basestring):
         return True, LocatableString(value)
@@ -41,6 +53,7 @@ def wrap(value):
 yaml.representer.RoundTripRepresenter.add_representer(LocatableString, yaml.representer.RoundTripRepresenter.represent_unicode)
 yaml.representer.RoundTripRepresenter.add_representer(LocatableInt, yaml.representer.RoundTripRepresenter.represent_int)
 yaml.representer.RoundTripRepresenter.add_representer(LocatableFloat, yaml.representer.RoundTripRepresenter.represent_float)
+yaml.representer.RoundTripRepresenter.add_representer(LocatableList, yaml.representer.RoundTripRepresenter.represent_list)
 
 class Locator(object):
     """
@@ -90,13 +103,37 @@ class Locator(object):
                 except KeyError:
                     raise ValueError('location map does not match agnostic raw data: %s' % k)
     
-    def merge(self, locator):
-        if isinstance(self.children, dict) and isinstance(locator.children, dict):
-            for k, m in locator.children.iteritems():
-                if k in self.children:
-                    self.children[k].merge(m)
-                else:
-                    self.children[k] = m
+    def __deepcopy__(self, memo):
+        # Locators are shared by all copies of the agnostic raw data (see :func:`copy_locators`)
+        return self
+
+    def merge(self, locator, raw=None):
+        """
+        Returns a locator with the children of both locators, recursively, for merging agnostic
+        raw data.
+
+        Locators are shared by all copies of the agnostic raw data, so this locator is not
+        changed: if there is anything to merge, the result is a new locator, which is linked to
+        :code:`raw` (the merged agnostic raw data) instead, as are its merged children.
+        """
+
+        if not (isinstance(self.children, dict) and isinstance(locator.children, dict)):
+            return self
+
+        r = copy(self)
+        r.children = dict(self.children)
+        for k, m in locator.children.iteritems():
+            child = r.children.get(k)
+            if child is not None:
+                m = child.merge(m, raw.get(k) if isinstance(raw, dict) else None)
+            r.children[k] = m
+
+        if raw is not None:
+            try:
+                setattr(raw, '_locator', r)
+            except AttributeError:
+                pass
+        return r
 
     def dump(self, key=None):
         if key:
@@ -32,12 +32,8 @@ class Reader(object):
 
     def load(self):
         with OpenClose(self.loader) as loader:
-            if self.context is not None:
-                with self.context._locations:
-                    for location in self.context._locations:
-                        if location.is_equivalent(loader.location):
-                            raise AlreadyReadError('already read: %s' % loader.location)
-                    self.context._locations.append(loader.location)
+            if (self.context is not None) and (not self.context._add_location(loader.location)):
+                raise AlreadyReadError('already read: %s' % loader.location)
             
             data = loader.load()
             if data is None:
@@ -46,3 +42,26 @@ class Reader(object):
     
     def read(self):
         raise UnimplementedFunctionalityError(classname(self) + '.read')
+
+    def _read_cached(self, data, read_fn):
+        """
+        Calls :code:`read_fn(data)`, unless the result is already in one of the context's profile
+        bundles or in its cache.
+        """
+
+        profile_bundles = getattr(self.context, 'profile_bundles', None)
+        if profile_bundles is not None:
+            raw = profile_bundles.get(self.loader.location, data)
+            if raw is not None:
+                return raw
+
+        cache = getattr(self.context, 'cache', None)
+        if cache is None:
+            return read_fn(data)
+
+        key = cache.get_key(self.loader.location, data, self.__class__)
+        raw = cache.get(key)
+        if raw is None:
+            raw = read_fn(data)
+            cache.put(key, raw)
+        return raw
@@ -16,7 +16,7 @@
 
 from ..loading import LiteralLocation, UriLocation
 from .exceptions import ReaderNotFoundError
-from .yaml import YamlReader
+from .yaml import YamlReader, FastYamlReader
 from .json import JsonReader
 from .jinja import JinjaReader
 
@@ -43,17 +43,30 @@ class DefaultReaderSource(ReaderSource):
     ".jinja". 
     """
     
-    def __init__(self, literal_reader_class=YamlReader):
+    def __init__(self, literal_reader_class=YamlReader, extensions=EXTENSIONS):
         super(DefaultReaderSource, self).__init__()
         self.literal_reader_class = literal_reader_class
+        self.extensions = extensions
 
     def get_reader(self, context, location, loader):
         if isinstance(location, LiteralLocation):
             return self.literal_reader_class(context, location, loader)
         
         elif isinstance(location, UriLocation):
-            for extension, reader_class in EXTENSIONS.iteritems():
+            for extension, reader_class in self.extensions.iteritems():
                 if location.uri.endswith(extension):
                     return reader_class(context, location, loader)
                 
         return super(DefaultReaderSource, self).get_reader(context, location, loader)
+
+FAST_EXTENSIONS = EXTENSIONS.copy()
+FAST_EXTENSIONS['.yaml'] = FastYamlReader
+
+class FastReaderSource(DefaultReaderSource):
+    """
+    Like :class:`DefaultReaderSource`, but generates a :class:`FastYamlReader` for YAML
+    locations and literals.
+    """
+
+    def __init__(self):
+        super(FastReaderSource, self).__init__(literal_reader_class=FastYamlReader, extensions=FAST_EXTENSIONS)
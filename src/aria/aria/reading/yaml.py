@@ -16,9 +16,79 @@
 
 from .reader import Reader
 from .exceptions import ReaderSyntaxError
-from .locator import Locator
+from .locator import Locator, LocatableList
 from collections import OrderedDict
 from ruamel import yaml # @UnresolvedImport
+from ruamel.yaml.constructor import SafeConstructor, RoundTripConstructor # @UnresolvedImport
+from ruamel.yaml.resolver import VersionedResolver # @UnresolvedImport
+
+class YamlLoader(yaml.RoundTripLoader):
+    """
+    :code:`RoundTripLoader` that merges merge keys into the map, like :class:`FastYamlLoader`.
+    
+    The round-trip constructor would instead keep the merged maps aside (only for dumping them
+    again), so that their keys would not be in the constructed map, nor in its locator.
+    """
+
+    flatten_mapping = SafeConstructor.__dict__['flatten_mapping']
+
+try:
+    # LibYAML-based parser (C extension)
+    from ruamel.yaml.cyaml import CParser # @UnresolvedImport
+    
+    class FastYamlLoader(CParser, RoundTripConstructor, VersionedResolver):
+        """
+        Composes nodes with LibYAML, but resolves and constructs scalars like
+        :code:`RoundTripLoader` (that is, with YAML 1.2 rules by default).
+        """
+        
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            RoundTripConstructor.__init__(self)
+            VersionedResolver.__init__(self)
+            # LibYAML does not tell us about the %YAML directive
+            self.yaml_version = _get_yaml_version(stream)
+
+        # We construct maps ourselves, so merge keys must actually be merged
+        flatten_mapping = SafeConstructor.__dict__['flatten_mapping']
+except ImportError:
+    from ruamel.yaml.reader import Reader as YamlStreamReader # @UnresolvedImport
+    from ruamel.yaml.scanner import Scanner # @UnresolvedImport
+    from ruamel.yaml.parser import Parser # @UnresolvedImport
+    from ruamel.yaml.composer import Composer # @UnresolvedImport
+
+    class FastYamlLoader(YamlStreamReader, Scanner, Parser, Composer, RoundTripConstructor, VersionedResolver):
+        def __init__(self, stream):
+            YamlStreamReader.__init__(self, stream)
+            Scanner.__init__(self)
+            Parser.__init__(self)
+            Composer.__init__(self)
+            RoundTripConstructor.__init__(self)
+            VersionedResolver.__init__(self)
+
+        flatten_mapping = SafeConstructor.__dict__['flatten_mapping']
+
+def _get_yaml_version(data):
+    """
+    The version in the %YAML directive, which can only appear among the comments and directives
+    at the beginning of the document, or None.
+    """
+
+    start = 0
+    while True:
+        end = data.find('\n', start)
+        line = (data[start:end] if end != -1 else data[start:]).strip()
+        if line.startswith('%YAML'):
+            try:
+                major, minor = line.split()[1].split('.')
+                return int(major), int(minor)
+            except (IndexError, ValueError):
+                return None
+        if line and (not line.startswith('#')) and (not line.startswith('%')):
+            return None
+        if end == -1:
+            return None
+        start = end + 1
 
 class YamlLocator(Locator):
     """
@@ -47,9 +117,12 @@ class YamlReader(Reader):
     
     def read(self):
         data = self.load()
+        return self._read_cached(data, self._read)
+
+    def _read(self, data):
         try:
             data = unicode(data)
-            yaml_loader = yaml.RoundTripLoader(data)
+            yaml_loader = YamlLoader(data)
             node = yaml_loader.get_single_node()
             locator = YamlLocator(self.loader.location, 0, 0)
             if node is None:
@@ -63,12 +136,88 @@ class YamlReader(Reader):
             
             #return yaml.load(data, yaml.RoundTripLoader)
         except Exception as e:
-            if isinstance(e, yaml.parser.MarkedYAMLError):
-                context = e.context or 'while parsing'
-                problem = e.problem
-                line = e.problem_mark.line
-                column = e.problem_mark.column
-                snippet = e.problem_mark.get_snippet()
-                raise ReaderSyntaxError('YAML %s: %s %s' % (e.__class__.__name__, problem, context), location=self.loader.location, line=line, column=column, snippet=snippet, cause=e)
+            raise self._get_syntax_error(e)
+
+    def _get_syntax_error(self, e):
+        if isinstance(e, yaml.parser.MarkedYAMLError):
+            context = e.context or 'while parsing'
+            problem = e.problem
+            line = e.problem_mark.line
+            column = e.problem_mark.column
+            snippet = e.problem_mark.get_snippet()
+            return ReaderSyntaxError('YAML %s: %s %s' % (e.__class__.__name__, problem, context), location=self.loader.location, line=line, column=column, snippet=snippet, cause=e)
+        else:
+            return ReaderSyntaxError('YAML: %s' % e, cause=e)
+
+class FastYamlReader(YamlReader):
+    """
+    ARIA fast YAML reader.
+
+    Composes the YAML nodes with the LibYAML-based parser (falling back to the pure-Python parser
+    if the C extension is not installed), and then constructs the agnostic raw data and its locator
+    in a single pass over the nodes. Maps are constructed as :code:`OrderedDict` and sequences as
+    :code:`LocatableList`, rather than as ruamel.yaml's round-trip types, so comments are not
+    preserved. Scalars are resolved and constructed exactly as by :class:`YamlReader`, so YAML 1.2
+    rules apply unless the document has a :code:`%YAML 1.1` directive.
+    
+    The locators are equivalent to those of :class:`YamlReader`.
+    """
+
+    def _read(self, data):
+        try:
+            data = unicode(data)
+            yaml_loader = FastYamlLoader(data)
+            node = yaml_loader.get_single_node()
+            locator = YamlLocator(self.loader.location, 0, 0)
+            if node is None:
+                raw = OrderedDict()
             else:
-                raise ReaderSyntaxError('YAML: %s' % e, cause=e)
+                raw = self._construct(yaml_loader, node, locator, {})
+            try:
+                setattr(raw, '_locator', locator)
+            except AttributeError:
+                pass
+            return raw
+        except Exception as e:
+            raise self._get_syntax_error(e)
+
+    def _construct(self, yaml_loader, node, locator, constructed):
+        if node in constructed:
+            # Alias: share the value, as well as the locations of its children
+            value, children = constructed[node]
+            if locator is not None:
+                locator.children = children
+            return value
+        
+        if isinstance(node, yaml.MappingNode):
+            yaml_loader.flatten_mapping(node)
+            value = OrderedDict()
+            children = {} if locator is not None else None
+            constructed[node] = (value, children)
+            for key_node, value_node in node.value:
+                key = self._construct_scalar(yaml_loader, key_node)
+                child_locator = None
+                if locator is not None:
+                    child_locator = YamlLocator(locator.location, key_node.start_mark.line + 1, key_node.start_mark.column + 1)
+                    children[key] = child_locator
+                value[key] = self._construct(yaml_loader, value_node, child_locator, constructed)
+            if locator is not None:
+                locator.children = children
+            return value
+        elif isinstance(node, yaml.SequenceNode):
+            value = LocatableList()
+            children = [] if locator is not None else None
+            constructed[node] = (value, children)
+            for value_node in node.value:
+                child_locator = None
+                if locator is not None:
+                    child_locator = YamlLocator(locator.location, value_node.start_mark.line + 1, value_node.start_mark.column + 1)
+                    children.append(child_locator)
+                value.append(self._construct(yaml_loader, value_node, child_locator, constructed))
+            if locator is not None:
+                locator.children = children
+            return value
+        return self._construct_scalar(yaml_loader, node)
+
+    def _construct_scalar(self, yaml_loader, node):
+        return yaml_loader.construct_object(node, deep=True)
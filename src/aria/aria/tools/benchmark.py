@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .. import install_aria_extensions
+from ..consumption import ConsumerChain, Read, Validate, Template, Plan
+from ..utils import print_exception, puts, colored
+from .utils import CommonArgumentParser, create_context_from_namespace
+from types import ModuleType, FunctionType, MethodType, BuiltinFunctionType
+import sys
+
+# Objects of these classes are not counted, and neither is anything that they refer to
+_IGNORED_CLASSES = (type, ModuleType, FunctionType, MethodType, BuiltinFunctionType)
+
+class ArgumentParser(CommonArgumentParser):
+    def __init__(self):
+        super(ArgumentParser, self).__init__(description='Deployment Plan Memory Benchmark', prog='aria-benchmark')
+        self.add_argument('uri', help='URI or file path to blueprint')
+        self.add_argument('--instances', type=int, help='number of instances of every node template (overrides their default_instances)')
+
+def get_deep_size(roots, seen=None):
+    """
+    The total :code:`sys.getsizeof` of the objects and of everything that they refer to, through
+    containers, :code:`__dict__` and :code:`__slots__`.
+
+    Objects whose IDs are in :code:`seen` are not counted. The IDs of counted objects are added to
+    it, so that it can be used to exclude objects that were counted before.
+    """
+
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = list(roots)
+    while stack:
+        o = stack.pop()
+        if (o is None) or isinstance(o, _IGNORED_CLASSES) or (id(o) in seen):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            for k, v in dict.iteritems(o):
+                stack.append(k)
+                stack.append(v)
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        d = getattr(o, '__dict__', None)
+        if d is not None:
+            stack.append(d)
+        for cls in type(o).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                v = getattr(o, name, None)
+                if v is not None:
+                    stack.append(v)
+    return total
+
+def measure_plan(context, instances=None):
+    """
+    Creates the deployment plan, and returns the number of nodes and their total deep size in
+    bytes. Objects that are also part of the deployment template are not counted.
+
+    Returns None if the blueprint has validation issues.
+    """
+
+    ConsumerChain(context, (Read, Validate, Template)).consume()
+    if context.validation.issues:
+        return None
+
+    template = context.deployment.template
+    if instances is not None:
+        for node_template in template.node_templates.itervalues():
+            node_template.default_instances = instances
+
+    Plan(context).consume()
+    if context.validation.issues:
+        return None
+
+    seen = set()
+    get_deep_size((template,), seen)
+    nodes = context.deployment.plan.nodes.values()
+    return len(nodes), get_deep_size(nodes, seen)
+
+def main():
+    try:
+        args, _ = ArgumentParser().parse_known_args()
+
+        install_aria_extensions()
+
+        context = create_context_from_namespace(args)
+        result = measure_plan(context, args.instances)
+        if result is None:
+            context.validation.dump_issues()
+            return
+
+        count, size = result
+        puts('Nodes: %s' % colored.blue(count))
+        puts('Total size: %s bytes' % colored.blue(size))
+        if count:
+            puts('Size per node: %s bytes' % colored.blue(size / count))
+
+    except Exception as e:
+        print_exception(e)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .. import install_aria_extensions
+from ..consumption import ConsumerChain, Read, Validate
+from ..reading import BUNDLE_EXTENSION, ProfileBundle, ProfileBundleRecorder
+from ..validation import Issue
+from ..utils import print_exception, puts, colored
+from .utils import CommonArgumentParser, create_context_from_namespace
+import os
+
+class ArgumentParser(CommonArgumentParser):
+    def __init__(self):
+        super(ArgumentParser, self).__init__(description='Profile Bundle Compiler', prog='aria-bundle')
+        self.add_argument('uri', help='file path to profile')
+        self.add_argument('--output', help='path of the bundle file (defaults to the profile path with a "%s" extension)' % BUNDLE_EXTENSION)
+
+def compile_bundle(context, path):
+    """
+    Reads and validates the profile at the context's location, including all of its imports, and
+    returns a :class:`ProfileBundle` at the path, or None if the profile has validation issues.
+
+    Issues between types are not considered, because profiles may refer to types that are
+    defined in other profiles.
+    """
+
+    bundle = ProfileBundle(path)
+    context.reading.cache = ProfileBundleRecorder(bundle)
+    context.reading.profile_bundles = None
+    context.validation.max_level = Issue.BETWEEN_FIELDS
+
+    ConsumerChain(context, (Read, Validate)).consume()
+
+    if context.validation.issues:
+        return None
+    return bundle
+
+def main():
+    try:
+        args, _ = ArgumentParser().parse_known_args()
+
+        install_aria_extensions()
+
+        context = create_context_from_namespace(args)
+
+        path = args.output or (os.path.splitext(args.uri)[0] + BUNDLE_EXTENSION)
+        bundle = compile_bundle(context, path)
+        if bundle is None:
+            context.validation.dump_issues()
+            return
+
+        bundle.save()
+        puts('Compiled %d documents into: %s' % (len(bundle.documents), colored.blue(path)))
+
+    except Exception as e:
+        print_exception(e)
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,7 @@
 from .. import VERSION
 from ..consumption import ConsumptionContext
 from ..loading import UriLocation, FILE_LOADER_SEARCH_PATHS
+from ..reading import READ_CACHE, JINJA_TEMPLATE_CACHE, PROFILE_BUNDLES
 from ..utils import import_fullname, ArgumentParser
 
 class BaseArgumentParser(ArgumentParser):
@@ -31,6 +32,10 @@ class CommonArgumentParser(BaseArgumentParser):
         self.add_argument('--presenter-source', default='aria.presentation.DefaultPresenterSource', help='presenter source class for the parser')
         self.add_argument('--presenter', help='force use of this presenter class in parser')
         self.add_argument('--path', nargs='*', help='search paths for imports')
+        self.add_argument('--profile-bundles', nargs='*', help='trusted directories for precompiled profile bundles')
+        self.add_argument('--read-cache', help='directory for persistent caching of read documents and compiled templates (used only if no other user can write to it)')
+        self.add_argument('--validation-processes', type=int, default=1, help='number of processes for validation (0 for a process per CPU)')
+        self.add_argument('--max-issues', type=int, help='stop validating after this many issues')
         self.add_argument('--debug', action='store_true', help='print debug info')
 
     def parse_known_args(self, args=None, namespace=None):
@@ -40,6 +45,14 @@ class CommonArgumentParser(BaseArgumentParser):
             for path in namespace.path:
                 FILE_LOADER_SEARCH_PATHS.append(path)
         
+        if namespace.profile_bundles:
+            for directory in namespace.profile_bundles:
+                PROFILE_BUNDLES.add_directory(directory)
+
+        if namespace.read_cache:
+            READ_CACHE.path = namespace.read_cache
+            JINJA_TEMPLATE_CACHE.path = namespace.read_cache
+        
         return namespace, args
 
 def create_context_from_namespace(ns, **kwargs):
@@ -47,7 +60,7 @@ def create_context_from_namespace(ns, **kwargs):
     args.update(kwargs)
     return create_context(**args)
 
-def create_context(uri, loader_source, reader_source, presenter_source, presenter, debug, **kwargs):
+def create_context(uri, loader_source, reader_source, presenter_source, presenter, debug, validation_processes=1, max_issues=None, **kwargs):
     context = ConsumptionContext()
     context.loading.loader_source = import_fullname(loader_source)()
     context.reading.reader_source = import_fullname(reader_source)()
@@ -55,4 +68,6 @@ def create_context(uri, loader_source, reader_source, presenter_source, presente
     context.presentation.presenter_source = import_fullname(presenter_source)()
     context.presentation.presenter_class = import_fullname(presenter)
     context.presentation.print_exceptions = debug
+    context.validation.processes = validation_processes or None
+    context.validation.max_issues = max_issues
     return context
@@ -17,7 +17,7 @@
 from .openclose import OpenClose
 from .caching import  cachedmethod, HasCachedMethods
 from .formatting import JsonAsRawEncoder, YamlAsRawDumper, classname, make_agnostic, json_dumps, yaml_dumps
-from .collections import ReadOnlyList, EMPTY_READ_ONLY_LIST, ReadOnlyDict, EMPTY_READ_ONLY_DICT, StrictList, StrictDict, merge, prune, deepcopy_with_locators, copy_locators
+from .collections import ReadOnlyList, EMPTY_READ_ONLY_LIST, ReadOnlyDict, EMPTY_READ_ONLY_DICT, LazyReadOnlyDict, StrictList, StrictDict, StrictDictAttribute, StrictListAttribute, merge, prune, PLAIN_CONTAINER_CLASSES, deepcopy_with_locators, copy_locators
 from .exceptions import print_exception, print_traceback
 from .imports import import_fullname, import_modules
 from .threading import ExecutorException, FixedThreadPoolExecutor, LockedList
@@ -38,10 +38,14 @@ __all__ = (
     'EMPTY_READ_ONLY_LIST',
     'ReadOnlyDict',
     'EMPTY_READ_ONLY_DICT',
+    'LazyReadOnlyDict',
     'StrictList',
     'StrictDict',
+    'StrictDictAttribute',
+    'StrictListAttribute',
     'merge',
     'prune',
+    'PLAIN_CONTAINER_CLASSES',
     'deepcopy_with_locators',
     'copy_locators',
     'print_exception',
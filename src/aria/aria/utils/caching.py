@@ -14,112 +14,195 @@
 # under the License.
 #
 
-from functools import partial
-from threading import Lock
+from types import MethodType
 from collections import OrderedDict
+from threading import Lock
+from weakref import WeakKeyDictionary
 
 #cachedmethod = lambda x: x
 
 class cachedmethod(object):
     """
     Decorator for caching method return values.
-    
-    The implementation is thread-safe.
-    
-    Supports :code:`cache_info` to be compatible with Python 3's :code:`functools.lru_cache`. Note that the statistics
-    are combined for all instances of the class.
-    
+
+    Return values are cached per instance, in the instance's :code:`_method_cache` dict. Methods
+    that take no arguments (including property getters) are keyed by the method alone. Otherwise
+    the arguments are hashed, too, so they must be hashable.
+
+    The method is bound once per instance: the bound method is stored in the instance's
+    :code:`__dict__` under the method's name, where later lookups find it without calling us again.
+
+    Instances without a :code:`__dict__` keep the cache in a :code:`_method_cache` slot (and the
+    statistics in a :code:`_method_cache_statistics` slot) if they have one, and otherwise must
+    support weak references (and be hashed by identity).
+
+    The implementation is thread-safe without locking: cache hits are plain dict lookups, and if
+    several threads miss at the same time, they all return the value stored by the first of them
+    (:code:`dict.setdefault` is atomic).
+
+    Statistics are collected only if :code:`cachedmethod.ENABLE_STATISTICS` is True. They are kept
+    per instance (see :meth:`HasCachedMethods._method_cache_info`) as well as combined for all
+    instances, for :code:`cache_info`, which is compatible with Python 3's
+    :code:`functools.lru_cache`. The combined statistics are not locked, and so may be slightly off
+    when threads contend.
+
     Won't use the cache if not called when bound to an object, allowing you to override the cache.
-    
-    Adapted from `this solution <http://code.activestate.com/recipes/577452-a-memoize-decorator-for-instance-methods/>`__.
     """
-    
+
+    ENABLE_STATISTICS = False
+
     def __init__(self, fn):
         self.fn = fn
         self.hits = 0
         self.misses = 0
-        self.lock = Lock()
+        self.__name__ = fn.__name__
+        self.__doc__ = fn.__doc__
 
     def cache_info(self):
-        with self.lock:
-            return (self.hits, self.misses, None, self.misses)
+        return (self.hits, self.misses, None, self.misses)
     
     def reset_cache_info(self):
-        with self.lock:
-            self.hits = 0
-            self.misses = 0
+        self.hits = 0
+        self.misses = 0
 
     def __get__(self, instance, owner):
         if instance is None:
             # Don't use cache if not bound to an object
             return self.fn
-        return partial(self, instance)
+        bound = MethodType(self, instance, owner)
+        instance_dict = getattr(instance, '__dict__', None)
+        if (instance_dict is not None) and (_find_class_attribute(type(instance), self.__name__) is self):
+            # Unless we were accessed under another name or via super(), in which case the name
+            # belongs to another attribute
+            bound = instance_dict.setdefault(self.__name__, bound)
+        return bound
     
-    def __call__(self, *args, **kwargs):
-        instance = args[0]
-        
+    def __call__(self, instance, *args, **kwargs):
         try:
             cache = instance._method_cache
         except AttributeError:
-            instance._method_cache = {}
-            # Note: Another thread may override it here, so we need to read it again
-            # to make sure all threads are using the same cache
-            cache = instance._method_cache
-            
-        key = (self.fn, args[1:], frozenset(kwargs.items()))
-        
+            cache = _get_instance_dict(instance, '_method_cache')
+
+        if kwargs:
+            key = (self, args, frozenset(kwargs.iteritems()))
+        elif args:
+            key = (self, args)
+        else:
+            key = self
+
         try:
-            with self.lock:
-                r = cache[key]
-                self.hits += 1
+            r = cache[key]
         except KeyError:
-            r = self.fn(*args, **kwargs)
-            with self.lock:
-                cache[key] = r
-                self.misses += 1
-            # Another thread may override our cache entry here, so we need to read
-            # it again to make sure all threads use the same return value
-            r = cache.get(key, r)
-            
+            if cachedmethod.ENABLE_STATISTICS:
+                self._count(instance, False)
+            r = self.fn(instance, *args, **kwargs)
+            # Another thread may have stored a value in the meantime, in which case we will use it,
+            # so that all threads use the same return value
+            return cache.setdefault(key, r)
+
+        if cachedmethod.ENABLE_STATISTICS:
+            self._count(instance, True)
         return r
 
+    def _count(self, instance, hit):
+        try:
+            statistics = instance._method_cache_statistics
+        except AttributeError:
+            statistics = _get_instance_dict(instance, '_method_cache_statistics')
+        counts = statistics.setdefault(self, [0, 0])
+        if hit:
+            counts[0] += 1
+            self.hits += 1
+        else:
+            counts[1] += 1
+            self.misses += 1
+
 class HasCachedMethods(object):
     """
     Provides convenience methods for working with :class:`cachedmethod`.
     """
+
+    __slots__ = ()
     
     @property
     def _method_cache_info(self):
         """
-        The cache infos of all cached methods.
+        The cache infos of all cached methods for this instance.
+
+        Requires :code:`cachedmethod.ENABLE_STATISTICS` to be True.
         
         :rtype: dict of str, 4-tuple
         """
         
+        statistics = _get_instance_dict(self, '_method_cache_statistics')
         r = OrderedDict()
-        for k, p in self.__class__.__dict__.iteritems():
-            if isinstance(p, property):
-                # The property getter might be cached
-                p = p.fget
-            if hasattr(p, 'cache_info'):
-                r[k] = p.cache_info()
+        for k, p in self._iter_cached_methods():
+            hits, misses = statistics.get(p, (0, 0))
+            r[k] = (hits, misses, None, misses)
         return r
 
     def _reset_method_cache(self):
         """
-        Resets the caches of all cached methods.
+        Resets the caches of all cached methods for this instance, including their statistics.
         """
         
-        if hasattr(self, '_method_cache'):
-            self._method_cache = {}
-            
-        # Note: Another thread may already be storing entries in the cache here.
-        # But it's not a big deal! It only means that our cache_info isn't
-        # guaranteed to be accurate.
-        
-        for p in self.__class__.__dict__.itervalues():
-            if isinstance(p, property):
-                # The property getter might be cached
-                p = p.fget
-            if hasattr(p, 'reset_cache_info'):
-                p.reset_cache_info()
+        _get_instance_dict(self, '_method_cache').clear()
+        _get_instance_dict(self, '_method_cache_statistics').clear()
+
+    def _iter_cached_methods(self):
+        names = set()
+        for cls in self.__class__.__mro__:
+            for k, p in cls.__dict__.iteritems():
+                if k in names:
+                    continue
+                names.add(k)
+                if isinstance(p, property):
+                    # The property getter might be cached
+                    p = p.fget
+                if isinstance(p, cachedmethod):
+                    yield k, p
+
+# Dicts of instances without a __dict__ or a slot for them
+_instance_dicts = WeakKeyDictionary()
+_instance_dicts_lock = Lock()
+
+def _get_instance_dict(instance, name):
+    """
+    The dict stored in the instance's attribute, created if necessary (atomically).
+    """
+
+    try:
+        return getattr(instance, name)
+    except AttributeError:
+        pass
+    try:
+        return instance.__dict__.setdefault(name, {})
+    except AttributeError:
+        pass
+
+    try:
+        return _instance_dicts[instance][name]
+    except (KeyError, TypeError):
+        # TypeError: no weak references, so we must be allocating a slot
+        pass
+    with _instance_dicts_lock:
+        try:
+            return getattr(instance, name)
+        except AttributeError:
+            pass
+        the_dict = {}
+        try:
+            # A slot
+            setattr(instance, name, the_dict)
+        except AttributeError:
+            dicts = _instance_dicts.get(instance)
+            if dicts is None:
+                dicts = _instance_dicts[instance] = {}
+            the_dict = dicts.setdefault(name, the_dict)
+        return the_dict
+
+def _find_class_attribute(cls, name):
+    for c in cls.__mro__:
+        if name in c.__dict__:
+            return c.__dict__[name]
+    return None
@@ -16,90 +16,261 @@
 
 from __future__ import absolute_import # so we can import standard 'collections'
 
-from collections import OrderedDict
+from collections import OrderedDict, Mapping, KeysView, ValuesView, ItemsView
 from copy import deepcopy
+from weakref import ref
+
+def _read_only_list(self, *args, **kwargs):
+    raise TypeError('read-only list')
+
+def _read_only_dict(self, *args, **kwargs):
+    raise TypeError('read-only dict')
 
 class ReadOnlyList(list):
     """
     An immutable list.
     
-    After initialization it will raise :class:`TypeError` exceptions if modification
-    is attempted.
+    It will raise :class:`TypeError` exceptions if modification is attempted.
+
+    The items are copied once on initialization, by :code:`list` itself, and the instance stores
+    nothing else.
     
     Note that objects stored in the list may not be immutable.
     """
-    def __init__(self, *args, **kwargs):
-        self.locked = False
-        super(ReadOnlyList, self).__init__(*args, **kwargs)
-        self.locked = True
 
-    def __setitem__(self, index, value):
-        if self.locked:
-            raise TypeError('read-only list')
-        return super(ReadOnlyList, self).__setitem__(index, value)
-
-    def __delitem__(self, index):
-        if self.locked:
-            raise TypeError('read-only list')
-        return super(ReadOnlyList, self).__delitem__(index)
-    
-    def __iadd__(self, values):
-        if self.locked:
-            raise TypeError('read-only list')
-        return super(ReadOnlyList, self).__iadd__(values)
+    __slots__ = ()
+
+    __setitem__ = _read_only_list
+    __delitem__ = _read_only_list
+    __setslice__ = _read_only_list
+    __delslice__ = _read_only_list
+    __iadd__ = _read_only_list
+    __imul__ = _read_only_list
+    append = _read_only_list
+    extend = _read_only_list
+    insert = _read_only_list
+    pop = _read_only_list
+    remove = _read_only_list
+    reverse = _read_only_list
+    sort = _read_only_list
     
     def __deepcopy__(self, memo):
-        r = [deepcopy(v, memo) for v in self]
-        return ReadOnlyList(r)
-
-    def append(self, value):
-        if self.locked:
-            raise TypeError('read-only list')
-        return super(ReadOnlyList, self).append(value)
+        return self.__class__([deepcopy(v, memo) for v in self])
 
-    def extend(self, values):
-        if self.locked:
-            raise TypeError('read-only list')
-        return super(ReadOnlyList, self).append(values)
-
-    def insert(self, index, value):
-        if self.locked:
-            raise TypeError('read-only list')
-        return super(ReadOnlyList, self).insert(index, value)
+    def __reduce__(self):
+        return self.__class__, (list(self),)
 
 EMPTY_READ_ONLY_LIST = ReadOnlyList()
 
-class ReadOnlyDict(OrderedDict):
+# Dict classes whose own storage holds exactly their values, and so can be copied directly
+_PLAIN_DICT_CLASSES = set((dict, OrderedDict))
+
+class ReadOnlyDict(dict):
     """
     An immutable ordered dict.
     
-    After initialization it will raise :class:`TypeError` exceptions if modification
-    is attempted.
+    It will raise :class:`TypeError` exceptions if modification is attempted.
+
+    Because the keys can never change, their order is kept in a single tuple, rather than in the
+    per-entry links of an :class:`OrderedDict`. Like an :class:`OrderedDict`, equality with other
+    ordered dicts is order-sensitive.
 
     Note that objects stored in the dict may not be immutable.
     """
-    
+
+    __slots__ = ('_keys',)
+
     def __init__(self, *args, **kwargs):
-        self.locked = False
-        super(ReadOnlyDict, self).__init__(*args, **kwargs)
-        self.locked = True
+        if len(args) > 1:
+            raise TypeError('expected at most 1 arguments, got %d' % len(args))
+        items = args[0] if args else ()
+        if (not kwargs) and ((items.__class__ in _PLAIN_DICT_CLASSES) or (items.__class__ is ReadOnlyDict)):
+            dict.update(self, items)
+            self._keys = tuple(items)
+            return
+        if hasattr(items, 'keys'):
+            mapping = items
+            items = ((k, mapping[k]) for k in mapping.keys())
+        keys = []
+        set_item = dict.__setitem__
+        for pairs in (items, kwargs.iteritems()):
+            for k, v in pairs:
+                if k not in self:
+                    keys.append(k)
+                set_item(self, k, v)
+        self._keys = tuple(keys)
+
+    __setitem__ = _read_only_dict
+    __delitem__ = _read_only_dict
+    clear = _read_only_dict
+    pop = _read_only_dict
+    popitem = _read_only_dict
+    setdefault = _read_only_dict
+    update = _read_only_dict
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __reversed__(self):
+        return reversed(self._keys)
+
+    def keys(self):
+        return list(self._keys)
+
+    def values(self):
+        return map(self.__getitem__, self._keys)
+
+    def items(self):
+        return zip(self._keys, self.values())
+
+    iterkeys = __iter__
+
+    def itervalues(self):
+        for k in self._keys:
+            yield self[k]
+
+    def iteritems(self):
+        for k in self._keys:
+            yield k, self[k]
+
+    def copy(self):
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, (OrderedDict, ReadOnlyDict)):
+            return (len(self) == len(other)) and (self.items() == other.items())
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        if not self:
+            return '%s()' % self.__class__.__name__
+        return '%s(%r)' % (self.__class__.__name__, self.items())
 
-    def __setitem__(self, key, value):
-        if self.locked:
-            raise TypeError('read-only dict')
-        return super(ReadOnlyDict, self).__setitem__(key, value)
-
-    def __delitem__(self, key):
-        if self.locked:
-            raise TypeError('read-only dict')
-        return super(ReadOnlyDict, self).__delitem__(key)
-    
     def __deepcopy__(self, memo):
-        r = [(deepcopy(k, memo), deepcopy(v, memo)) for k, v in self.iteritems()]
-        return ReadOnlyDict(r)
+        return self.__class__([(deepcopy(k, memo), deepcopy(v, memo)) for k, v in self.iteritems()])
+
+    def __reduce__(self):
+        return self.__class__, (self.items(),)
 
 EMPTY_READ_ONLY_DICT = ReadOnlyDict()
 
+class LazyReadOnlyDict(Mapping):
+    """
+    An immutable ordered mapping that creates its values only when they are first accessed.
+
+    Values are created by calling :code:`create_fn(key, item)`, and are then kept. Every method
+    that returns values (including iteration over values or items) creates them as necessary.
+
+    Note that this is not a :code:`dict`: a dict subclass could not be lazy, because
+    :code:`dict(d)`, :code:`{}.update(d)`, :code:`f(**d)` and the dict views read a dict's storage
+    directly, without calling any of its methods. As a :class:`Mapping`, all of these go through
+    :code:`keys()` and :code:`__getitem__`, which create the values. Use :meth:`copy` to get a
+    :class:`ReadOnlyDict`.
+
+    The implementation is thread-safe: if several threads create the same value at the same time,
+    they all return the one that was stored first.
+    """
+
+    def __init__(self, items, create_fn):
+        """
+        :param items: Iterable of (key, item) pairs, with an item per value to create
+        :param create_fn: Called as :code:`create_fn(key, item)` to create a value
+        """
+
+        self._create_fn = create_fn
+        self._items = {}
+        self._values = {}
+        keys = []
+        for k, v in items:
+            if k not in self._items:
+                keys.append(k)
+            self._items[k] = v
+        self._keys = tuple(keys)
+
+    __setitem__ = _read_only_dict
+    __delitem__ = _read_only_dict
+    clear = _read_only_dict
+    pop = _read_only_dict
+    popitem = _read_only_dict
+    setdefault = _read_only_dict
+    update = _read_only_dict
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            item = self._items[key]
+            # Note: dict.setdefault is atomic, so the first value stored wins
+            return self._values.setdefault(key, self._create_fn(key, item))
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __reversed__(self):
+        return reversed(self._keys)
+
+    def has_key(self, key):
+        return key in self._items
+
+    def keys(self):
+        return list(self._keys)
+
+    def values(self):
+        return map(self.__getitem__, self._keys)
+
+    def items(self):
+        return zip(self._keys, self.values())
+
+    iterkeys = __iter__
+
+    def itervalues(self):
+        for k in self._keys:
+            yield self[k]
+
+    def iteritems(self):
+        for k in self._keys:
+            yield k, self[k]
+
+    def viewkeys(self):
+        return KeysView(self)
+
+    def viewvalues(self):
+        return ValuesView(self)
+
+    def viewitems(self):
+        return ItemsView(self)
+
+    def copy(self):
+        return ReadOnlyDict(self.iteritems())
+
+    def __eq__(self, other):
+        return ReadOnlyDict(self.iteritems()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        if not self:
+            return '%s()' % self.__class__.__name__
+        return '%s(%r)' % (self.__class__.__name__, self.items())
+
+    def __deepcopy__(self, memo):
+        return ReadOnlyDict([(deepcopy(k, memo), deepcopy(v, memo)) for k, v in self.iteritems()])
+
+    def __reduce__(self):
+        return ReadOnlyDict, (self.items(),)
+
 class StrictList(list):
     """
     A list that raises :class:`TypeError` exceptions when objects of the wrong type are inserted.
@@ -192,6 +363,228 @@ class StrictDict(OrderedDict):
             value = self.wrapper_fn(value)
         return super(StrictDict, self).__setitem__(key, value)
 
+class _PendingOptions(tuple):
+    """
+    (name, value) pairs of container options set before the container was allocated. Stored in the
+    container's slot until then.
+    """
+
+    __slots__ = ()
+
+class _Unallocated(object):
+    """
+    Mixin for the empty stand-ins returned by :class:`StrictDictAttribute` and
+    :class:`StrictListAttribute` for containers that have not been allocated yet.
+    """
+
+    __slots__ = ()
+
+    def _allocate(self):
+        return self._attribute.allocate(self._instance)
+
+    def __getattr__(self, name):
+        if name in ('_instance', '_attribute'):
+            raise AttributeError(name)
+        # Container options (value_class, wrapper_fn, etc.) are those the container would have
+        return self._attribute.get_option(self._instance, name)
+
+    def __setattr__(self, name, value):
+        if name in self._attribute.option_names:
+            # Setting an option does not allocate the container
+            self._attribute.set_option(self._instance, name, value)
+        else:
+            setattr(self._allocate(), name, value)
+
+    # Copies are new empty containers
+
+    def copy(self):
+        return self._attribute.create(self._instance)
+
+    def __copy__(self):
+        return self._attribute.create(self._instance)
+
+    def __deepcopy__(self, memo):
+        return self._attribute.create(self._instance)
+
+    def __reduce_ex__(self, protocol):
+        return self._attribute.create(self._instance).__reduce_ex__(protocol)
+
+    def __reduce__(self):
+        return self._attribute.create(self._instance).__reduce__()
+
+class _UnallocatedStrictDict(_Unallocated, StrictDict):
+    # Note: StrictDict.__init__ is not called, because the stand-in is always empty, so the
+    # OrderedDict methods that would use its internals are overridden
+    __slots__ = ('_instance', '_attribute')
+
+    def __setitem__(self, key, value):
+        self._allocate()[key] = value
+
+    def setdefault(self, key, default=None):
+        return self._allocate().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self._allocate().update(*args, **kwargs)
+
+    def clear(self):
+        pass
+
+    def __iter__(self):
+        return iter(())
+
+    def __reversed__(self):
+        return iter(())
+
+    def keys(self):
+        return []
+
+    def values(self):
+        return []
+
+    def items(self):
+        return []
+
+    def iterkeys(self):
+        return iter(())
+
+    def itervalues(self):
+        return iter(())
+
+    def iteritems(self):
+        return iter(())
+
+    def __repr__(self):
+        return '%s()' % self._attribute.container_class.__name__
+
+class _UnallocatedStrictList(_Unallocated, StrictList):
+    # Note: StrictList.__init__ is not called, because the stand-in is always empty
+    __slots__ = ('_instance', '_attribute')
+
+    def __setitem__(self, index, value):
+        self._allocate()[index] = value
+
+    def __setslice__(self, i, j, values):
+        self._allocate()[i:j] = values
+
+    def __iadd__(self, values):
+        container = self._allocate()
+        container += values
+        return container
+
+    def append(self, value):
+        self._allocate().append(value)
+
+    def extend(self, values):
+        self._allocate().extend(values)
+
+    def insert(self, index, value):
+        self._allocate().insert(index, value)
+
+class StrictDictAttribute(object):
+    """
+    A descriptor for a :class:`StrictDict` attribute that is allocated only when it is first
+    modified, for classes with :code:`__slots__`.
+
+    The dict is stored in the slot named :code:`slot_name`, and is created with the keyword
+    arguments given here (:code:`key_class`, :code:`value_class`, etc.). Until it is allocated,
+    reading the attribute returns an empty stand-in (an instance of a :class:`StrictDict`
+    subclass) that allocates the dict when it is modified, so that the many objects whose dicts
+    remain empty never pay for them. The stand-in is not stored in the slot, but the same one is
+    returned for as long as it is referenced anywhere (the descriptor keeps a weak reference to
+    it), unless threads read the attribute for the first time concurrently.
+
+    Setting options (such as :code:`wrapper_fn`) on the stand-in does not allocate the dict: they
+    are kept in the slot and applied when it is allocated. Assigning a container to the attribute
+    stores it as is.
+    """
+
+    container_class = StrictDict
+    unallocated_class = _UnallocatedStrictDict
+    option_names = ('key_class', 'value_class', 'wrapper_fn', 'unwrapper_fn')
+
+    def __init__(self, slot_name, **options):
+        self.slot_name = slot_name
+        self.options = options
+        self._unallocated = {} # id(instance) -> weak reference to stand-in
+        self._unallocated_limit = 64
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        container = getattr(instance, self.slot_name, None)
+        if (container is None) or (container.__class__ is _PendingOptions):
+            # The stand-in refers to the instance, so the ID cannot be reused while it is alive
+            key = id(instance)
+            container_ref = self._unallocated.get(key)
+            container = container_ref() if container_ref is not None else None
+            if container is None:
+                # Faster than calling the class (the stand-ins do not have __init__)
+                cls = self.unallocated_class
+                container = cls.__new__(cls)
+                cls._instance.__set__(container, instance)
+                cls._attribute.__set__(container, self)
+                self._unallocated[key] = ref(container)
+                if len(self._unallocated) > self._unallocated_limit:
+                    self._discard_unallocated()
+        return container
+
+    def __set__(self, instance, value):
+        if isinstance(value, _Unallocated):
+            # Don't keep a stand-in for another object's container
+            value = None
+        setattr(instance, self.slot_name, value)
+
+    def _discard_unallocated(self):
+        # Discard the references to stand-ins that are gone (in amortized constant time, because
+        # we do this only once the references have doubled)
+        for key, container_ref in self._unallocated.items():
+            if container_ref() is None:
+                self._unallocated.pop(key, None)
+        self._unallocated_limit = max(64, len(self._unallocated) * 2)
+
+    def create(self, instance):
+        """
+        Returns a new container, with the options it would be allocated with.
+        """
+
+        options = self.options
+        pending = getattr(instance, self.slot_name, None)
+        if (pending is not None) and (pending.__class__ is _PendingOptions):
+            options = dict(options)
+            options.update(pending)
+        return self.container_class(**options)
+
+    def allocate(self, instance):
+        container = getattr(instance, self.slot_name, None)
+        if (container is None) or (container.__class__ is _PendingOptions):
+            container = self.create(instance)
+            setattr(instance, self.slot_name, container)
+        return container
+
+    def get_option(self, instance, name):
+        if name not in self.option_names:
+            raise AttributeError(name)
+        pending = getattr(instance, self.slot_name, None)
+        if pending is not None:
+            for k, v in pending:
+                if k == name:
+                    return v
+        return self.options.get(name)
+
+    def set_option(self, instance, name, value):
+        pending = getattr(instance, self.slot_name, None) or ()
+        pending = tuple((k, v) for k, v in pending if k != name)
+        setattr(instance, self.slot_name, _PendingOptions(pending + ((name, value),)))
+
+class StrictListAttribute(StrictDictAttribute):
+    """
+    Like :class:`StrictDictAttribute`, but for a :class:`StrictList` attribute.
+    """
+
+    container_class = StrictList
+    unallocated_class = _UnallocatedStrictList
+    option_names = ('value_class', 'wrapper_fn', 'unwrapper_fn')
+
 def merge(a, b, path=[], strict=False):
     """
     Merges dicts, recursively.
@@ -237,15 +630,42 @@ def prune(value, is_removable_fn=is_removable):
 
     return value
 
+# Containers of these exact classes hold nothing but their items and possibly a locator, and so
+# can be copied directly by deepcopy_with_locators
+PLAIN_CONTAINER_CLASSES = set((dict, OrderedDict, list))
+
 def deepcopy_with_locators(value):
     """
     Like :code:`deepcopy`, but also copies over locators.
+
+    Only the structure is copied: locators and locatable scalars are immutable, and so are shared
+    with the original (see :mod:`aria.reading.locator`). Containers of
+    :code:`PLAIN_CONTAINER_CLASSES` are copied directly, other values with :code:`deepcopy`.
     """
     
-    r = deepcopy(value)
+    r = _deepcopy_structure(value, {})
     copy_locators(r, value)
     return r
 
+def _deepcopy_structure(value, memo):
+    cls = value.__class__
+    if cls not in PLAIN_CONTAINER_CLASSES:
+        return deepcopy(value, memo)
+
+    r = memo.get(id(value))
+    if r is not None:
+        return r
+
+    r = cls()
+    memo[id(value)] = r
+    if isinstance(value, dict):
+        for k, v in value.iteritems():
+            r[k] = _deepcopy_structure(v, memo)
+    else:
+        for v in value:
+            r.append(_deepcopy_structure(v, memo))
+    return r
+
 def copy_locators(target, source):
     """
     Copies over :code:`_locator` for all elements, recursively.
@@ -14,7 +14,10 @@
 # under the License.
 #
 
+from __future__ import absolute_import # so we can import standard 'collections'
+
 import json
+from collections import OrderedDict, Mapping
 from ruamel import yaml # @UnresolvedImport
 
 class JsonAsRawEncoder(json.JSONEncoder):
@@ -24,6 +27,8 @@ class JsonAsRawEncoder(json.JSONEncoder):
     """
     
     def default(self, o):
+        if isinstance(o, Mapping):
+            return OrderedDict(o.iteritems())
         try:
             return iter(o)
         except TypeError:
@@ -73,8 +78,8 @@ def make_agnostic(value):
 
     if isinstance(value, list) and (type(value) != list):
         value = list(value)
-    elif isinstance(value, dict) and (type(value) != dict):
-        value = dict(value)
+    elif isinstance(value, (dict, Mapping)) and (type(value) != dict):
+        value = dict(value.iteritems())
         
     if isinstance(value, list):
         for i in range(len(value)):
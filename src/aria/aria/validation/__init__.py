@@ -16,7 +16,13 @@
 
 from .context import ValidationContext
 from .issue import Issue
+from .parallel import ValidationPartition, validate_in_processes
+from .incremental import ValidationUnit, IncrementalValidation
 
 __all__ = (
     'ValidationContext',
-    'Issue')
+    'Issue',
+    'ValidationPartition',
+    'validate_in_processes',
+    'ValidationUnit',
+    'IncrementalValidation')
@@ -16,42 +16,136 @@
 
 from .issue import Issue
 from ..utils import LockedList, ReadOnlyList, print_exception, puts, colored, indent
+from copy import copy
+import bisect
 
 class ValidationContext(object):
     """
     Properties:
     
     * :code:`allow_unknown_fields`: When False (the default) will report an issue if an unknown field is used
-    * :code:`max_level`: Maximum validation level to report (default is all)
+    * :code:`max_level`: Maximum validation level to report (default is all); validation passes
+      that can only report issues above it are skipped
+    * :code:`max_issues`: Maximum number of issues up to :code:`max_level` to report (default is
+      None, meaning no limit); further issues up to :code:`max_level` are discarded, and
+      validation stops once the limit is reached
+    * :code:`processes`: Number of processes for validating the presentation (default is 1, meaning
+      validation happens in this process; set to None to use a process per CPU)
+    * :code:`partition`: :class:`ValidationPartition` selecting the part of the presentation to
+      validate (default is None, meaning all of it)
+    * :code:`incremental`: :class:`IncrementalValidation` of the last call to
+      :code:`ConsumptionContext.revalidate` (None if there was none)
     """
 
     def __init__(self):
         self.allow_unknown_fields = False
         self.max_level = Issue.ALL
+        self.max_issues = None
+        self.processes = 1
+        self.partition = None
+        self.incremental = None
 
         self._issues = LockedList()
+        self._keys = set()
+        self._sorted_issues = []
+        self._sort_keys = []
+        self._views = {}
 
     def report(self, message=None, exception=None, location=None, line=None, column=None, locator=None, snippet=None, level=Issue.PLATFORM, issue=None):
         if issue is None:
             issue = Issue(message, exception, location, line, column, locator, snippet, level)
 
-        # Avoid duplicate issues
-        with self._issues:        
-            for i in self._issues:
-                if str(i) == str(issue):
+        key = issue.key
+        # Note: locations are sorted by their string representation, because location objects
+        # are otherwise compared by their memory address
+        level, message, location, line, column, _ = key
+        sort_key = (level, location, line, column, message)
+
+        with self._issues:
+            # Avoid duplicate issues
+            if key in self._keys:
+                return
+
+            # Discard issues beyond the maximum
+            max_issues = self.max_issues
+            if (max_issues is not None) and (level <= self.max_level):
+                if bisect.bisect_left(self._sort_keys, (self.max_level + 1,)) >= max_issues:
                     return
-            
+
+            self._keys.add(key)
             self._issues.append(issue)
-    
+
+            # Keep the issues sorted (issues with equal sort keys stay in the order of reporting)
+            index = bisect.bisect_right(self._sort_keys, sort_key)
+            self._sort_keys.insert(index, sort_key)
+            self._sorted_issues.insert(index, issue)
+            self._views.clear()
+
+    def clear(self):
+        """
+        Discards all reported issues.
+        """
+
+        with self._issues:
+            del self._issues[:]
+            self._keys.clear()
+            del self._sorted_issues[:]
+            del self._sort_keys[:]
+            self._views.clear()
+
+    def clone(self):
+        """
+        Returns a validation context with the same settings, but without issues.
+        """
+
+        validation = copy(self)
+        validation._issues = LockedList()
+        validation._keys = set()
+        validation._sorted_issues = []
+        validation._sort_keys = []
+        validation._views = {}
+        return validation
+
     @property
     def has_issues(self):
         return len(self._issues) > 0
 
+    @property
+    def reached_max_issues(self):
+        """
+        True if :code:`max_issues` issues up to :code:`max_level` have been reported.
+        """
+
+        max_issues = self.max_issues
+        if max_issues is None:
+            return False
+        with self._issues:
+            return bisect.bisect_left(self._sort_keys, (self.max_level + 1,)) >= max_issues
+
+    def should_validate(self, level=Issue.PLATFORM):
+        """
+        True if a validation pass that reports issues at the level or above is still worth running:
+        the level must not be above :code:`max_level`, and :code:`max_issues` must not have been
+        reached.
+        """
+
+        return (level <= self.max_level) and (not self.reached_max_issues)
+
     @property
     def issues(self):
-        issues = [i for i in self._issues if i.level <= self.max_level] 
-        issues.sort(key=lambda i: (i.level, i.location, i.line, i.column, i.message))
-        return ReadOnlyList(issues)
+        """
+        The issues up to :code:`max_level`, sorted by level and then by location.
+        """
+
+        max_level = self.max_level
+        with self._issues:
+            view = self._views.get(max_level)
+            if view is None:
+                # The issues are sorted by level first
+                end = bisect.bisect_left(self._sort_keys, (max_level + 1,))
+                view = ReadOnlyList(self._sorted_issues[:end])
+                self._views[max_level] = view
+            return view
 
     def dump_issues(self):
         issues = self.issues
@@ -0,0 +1,194 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from collections import defaultdict
+from copy import copy
+
+class ValidationUnit(object):
+    """
+    A unit of the presentation (see :class:`ValidationPartition`), as found by
+    :class:`IncrementalValidation`.
+
+    Properties:
+
+    * :code:`key`: Identifies the unit between validations
+    * :code:`name`: The name of the unit's presentation (may be None)
+    * :code:`location_key`: Key of the location of the document from which the unit is derived
+    * :code:`raw`: The unit's agnostic raw data
+    * :code:`issues`: The issues reported while validating the unit (None if not validated)
+    """
+
+    def __init__(self, key, name, location_key, raw):
+        self.key = key
+        self.name = name
+        self.location_key = location_key
+        self.raw = raw
+        self.issues = None
+
+    @property
+    def refs(self):
+        """
+        All the strings in the unit's agnostic raw data, which are where it may refer to other
+        units by name.
+        """
+
+        refs = set()
+        values = [self.raw]
+        while values:
+            value = values.pop()
+            if isinstance(value, basestring):
+                refs.add(value)
+            elif isinstance(value, dict):
+                values.extend(value.itervalues())
+            elif isinstance(value, list):
+                values.extend(value)
+        return refs
+
+class IncrementalValidation(object):
+    """
+    Validates only the units of the presentation (see :class:`ValidationPartition`) that are
+    affected by changes since a previous incremental validation, and reports the issues previously
+    found in the others.
+
+    A unit is affected if it is new, if its agnostic raw data changed, if it is derived from a
+    changed document (in which case the locations of its issues might have changed), or if it
+    refers by name to an affected unit (which is how units refer to each other, e.g. a node
+    template to its type, or a type to its parent type). Units without names are always affected.
+
+    Call :code:`prepare` and then validate with this instance as the validation context's
+    :code:`partition`.
+
+    Properties:
+
+    * :code:`units`: Dict of :class:`ValidationUnit` by their keys
+    * :code:`validated`: Number of units validated
+    * :code:`reused`: Number of units for which previously found issues were reported
+    """
+
+    def __init__(self, previous=None, changed_location_keys=None):
+        """
+        :param previous: The previous :class:`IncrementalValidation` (None to validate everything)
+        :param changed_location_keys: Keys of the locations of the documents that have changed
+        """
+
+        self.units = {}
+        self.validated = 0
+        self.reused = 0
+
+        self._previous_units = previous.units if previous is not None else {}
+        self._changed_location_keys = frozenset(changed_location_keys or ())
+        self._affected = None
+        self._counts = {}
+        self._depth = 0
+
+    def prepare(self, context):
+        """
+        Finds the units of the presentation, and which of them are affected.
+
+        The presentation is walked as if it were validated, but with the issues discarded and
+        without entering the units.
+        """
+
+        walk_context = copy(context)
+        walk_context.validation = context.validation.clone()
+        walk_context.validation.partition = self
+        self._counts = {}
+        context.presentation.presenter._validate(walk_context)
+        self._counts = {}
+
+        self._affected = set()
+        names = set()
+        for key, unit in self.units.iteritems():
+            previous_unit = self._previous_units.get(key)
+            if (unit.name is None) or (previous_unit is None) or (previous_unit.issues is None) \
+                or (unit.location_key in self._changed_location_keys) or (unit.raw != previous_unit.raw):
+                self._affected.add(key)
+                names.add(unit.name)
+        for key, previous_unit in self._previous_units.iteritems():
+            if (key not in self.units) or (previous_unit.location_key in self._changed_location_keys):
+                names.add(previous_unit.name)
+        names.discard(None)
+
+        if names and (len(self._affected) < len(self.units)):
+            # Follow references by name, transitively
+            referrers = defaultdict(list)
+            for unit in self.units.itervalues():
+                if unit.key not in self._affected:
+                    for ref in unit.refs:
+                        referrers[ref].append(unit)
+            names = list(names)
+            while names:
+                for unit in referrers.pop(names.pop(), ()):
+                    if unit.key not in self._affected:
+                        self._affected.add(unit.key)
+                        if unit.name is not None:
+                            names.append(unit.name)
+
+    def validate(self, presentation, context):
+        if self._depth:
+            presentation._validate(context)
+            return
+
+        key = self._get_key(presentation)
+
+        if self._affected is None:
+            # Preparing
+            locator = presentation._locator
+            self.units[key] = ValidationUnit(key, presentation._name, _get_location_key(locator), presentation._raw)
+            return
+
+        unit = self.units.get(key)
+        if unit is None:
+            # Not found while preparing
+            presentation._validate(context)
+            return
+
+        if key not in self._affected:
+            unit.issues = self._previous_units[key].issues
+            for issue in unit.issues:
+                context.validation.report(issue=issue)
+            self.reused += 1
+            return
+
+        # Collect the unit's issues on their own (reporting would discard those that were already
+        # reported elsewhere)
+        validation = context.validation
+        context.validation = validation.clone()
+        self._depth += 1
+        try:
+            presentation._validate(context)
+        finally:
+            self._depth -= 1
+            unit_validation = context.validation
+            context.validation = validation
+        unit.issues = list(unit_validation._issues)
+        for issue in unit.issues:
+            validation.report(issue=issue)
+        self.validated += 1
+
+    def _get_key(self, presentation):
+        # Presentations of the same class and name can appear in different parts of the presentation
+        # (e.g. inputs and outputs), so we count them in the order in which they are reached
+        key = (presentation.__class__, presentation._name)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return key + (count,)
+
+def _get_location_key(locator):
+    if locator is None:
+        return None
+    location = locator.location
+    return location.key if location is not None else None
@@ -88,6 +88,21 @@ class Issue(object):
             ('snippet', self.snippet),
             ('exception', classname(self.exception) if self.exception else None)))
             
+    @property
+    def key(self):
+        """
+        Issues have equal keys if and only if they have equal string representations, but keys are
+        much cheaper to create and compare.
+        """
+
+        location = line = column = None
+        if self.location is not None:
+            location = '%s' % self.location
+            line = self.line
+            if line is not None:
+                column = self.column
+        return (self.level, self.message, location, line, column, self.snippet)
+
     @property
     def locator_as_str(self):
         if self.location is not None:
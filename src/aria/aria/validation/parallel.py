@@ -0,0 +1,131 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from copy import copy
+import sys, cPickle, multiprocessing
+
+class ValidationPartition(object):
+    """
+    Selects the part of the presentation tree that one of several processes validates.
+
+    Elements of object lists and dicts that are reached from the root without passing through
+    another such element are "units" (e.g. node templates, types, groups, policies), numbered in
+    the order in which they are reached. The process with index :code:`index` validates only the
+    units numbered :code:`index` modulo :code:`count`, but it validates everything within them.
+
+    Everything outside of units is validated by all processes, so that they all reach the units in
+    the same order. The issues they all report are identical, and are merged into one.
+    """
+
+    def __init__(self, index, count):
+        self.index = index
+        self.count = count
+
+        self._next_unit = 0
+        self._depth = 0
+
+    def validate(self, presentation, context):
+        """
+        Validates the presentation if it belongs to our partition.
+        """
+
+        if self._depth:
+            presentation._validate(context)
+            return
+
+        unit = self._next_unit
+        self._next_unit += 1
+        if unit % self.count != self.index:
+            return
+
+        self._depth += 1
+        try:
+            presentation._validate(context)
+        finally:
+            self._depth -= 1
+
+def validate_in_processes(context, processes=None):
+    """
+    Validates the presentation in a pool of processes, and reports all their issues in the
+    context's validation context, in a deterministic order.
+
+    Each process stops validating on its own once it reaches the maximum number of issues, and
+    merging stops once the context reaches it.
+
+    The processes are forked after the presentation has been read, so they share it with us
+    without having to transfer it. Where processes cannot be forked, validation happens in this
+    process instead. Each pool hands the context to its own processes, so this function may be
+    called concurrently from several threads.
+
+    Only the issues are sent back. Anything else that validation computes in the processes, such
+    as the results of :code:`cachedmethod` methods or changes to raw data, is lost, and will be
+    computed again in this process when next needed.
+
+    :param processes: Number of processes (defaults to the number of CPUs)
+    """
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if (processes < 2) or (sys.platform == 'win32'):
+        context.presentation.presenter._validate(context)
+        return
+
+    pool = multiprocessing.Pool(processes, _init_process, (context,))
+    try:
+        results = pool.map(_validate_partition, [(i, processes) for i in range(processes)])
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    for issues in results:
+        for issue in issues:
+            if context.validation.reached_max_issues:
+                return
+            context.validation.report(issue=issue)
+
+# The context being validated, set in each pool process (but never in ours)
+_context = None
+
+def _init_process(context):
+    # The context is inherited when the process is forked, not pickled
+    global _context
+    _context = context
+
+def _validate_partition(args):
+    index, count = args
+    context = copy(_context)
+    context.validation = validation = _context.validation.clone()
+    validation.partition = ValidationPartition(index, count)
+    context.presentation.presenter._validate(context)
+    return [_make_picklable(issue) for issue in validation._issues]
+
+def _make_picklable(issue):
+    # Tracebacks cannot be sent between processes
+    e = issue.exception
+    while e is not None:
+        if getattr(e, 'cause_tb', None) is not None:
+            e.cause_tb = None
+        e = getattr(e, 'cause', None)
+
+    try:
+        cPickle.dumps(issue, cPickle.HIGHEST_PROTOCOL)
+    except Exception:
+        # The message is kept, but the exception is lost
+        issue.exception = None
+    return issue
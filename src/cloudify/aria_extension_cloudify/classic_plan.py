@@ -374,11 +374,7 @@ def find_host_node(context, node):
     return None
 
 def find_groups(context, node):
-    groups = []
-    for group in context.deployment.plan.groups.itervalues():
-        if node.id in group.member_node_ids:
-            groups.append(group)
-    return groups
+    return context.deployment.plan.find_node_groups(node.id)
 
 def iter_scaling_groups(context):
     for policy_template in context.deployment.template.policy_templates.itervalues():
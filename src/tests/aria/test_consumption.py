@@ -0,0 +1,206 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+import os.path, shutil, tempfile, threading
+
+from testtools import TestCase
+
+from aria.consumption import ConsumptionContext, ConsumerChain, Read, Validate
+from aria.loading import UriLocation
+from aria.presentation import Presenter, Presentation, has_fields, primitive_field, object_field, object_dict_field
+from aria.reading import ReadCache
+from aria.validation import ValidationPartition
+
+class ImportingPresenter(Presenter):
+    def __init__(self, *args, **kwargs):
+        super(ImportingPresenter, self).__init__(*args, **kwargs)
+        self.merged = []
+
+    def _merge_import(self, presentation):
+        self.merged.append(presentation._raw['name'])
+
+    def _get_import_locations(self):
+        return self._raw.get('imports')
+
+DOCUMENTS = {
+    'root.yaml': 'name: root\nimports: [a.yaml, b.yaml]\n',
+    'a.yaml': 'name: a\nimports: [c.yaml, ./b.yaml]\n',
+    'b.yaml': 'name: b\nimports: [c.yaml]\n',
+    'c.yaml': 'name: c\nimports: [root.yaml]\n'}
+
+class ReadTestCase(TestCase):
+    def setUp(self):
+        super(ReadTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        for name, content in DOCUMENTS.iteritems():
+            with open(os.path.join(self.path, name), 'w') as f:
+                f.write(content)
+
+    def read(self):
+        context = ConsumptionContext()
+        context.reading.cache = ReadCache()
+        context.presentation.location = UriLocation(os.path.join(self.path, 'root.yaml'))
+        context.presentation.presenter_class = ImportingPresenter
+        Read(context).consume()
+        self.assertEqual([], context.validation.issues)
+        return context.presentation.presenter.merged
+
+    def test_merge_order(self):
+        # Every document once, after the documents it imports, with the circular import ignored
+        self.assertEqual(['c', 'b', 'a'], self.read())
+
+    def test_merge_order_is_deterministic(self):
+        for _ in range(10):
+            self.assertEqual(['c', 'b', 'a'], self.read())
+
+@has_fields
+class Item(Presentation):
+    @primitive_field(int)
+    def size():
+        pass
+
+@has_fields
+class Root(Presentation):
+    @object_field(Item)
+    def item():
+        pass
+
+    @object_dict_field(Item)
+    def items():
+        pass
+
+class ValidateTestCase(TestCase):
+    def validate(self, processes=1, partition=None, max_issues=None):
+        raw = {'item': {'size': 'spine'}, 'items': dict(('item%d' % i, {'size': 'bad%d' % i}) for i in range(10))}
+        context = ConsumptionContext()
+        context.presentation.presenter = Root(raw=raw)
+        context.validation.processes = processes
+        context.validation.partition = partition
+        context.validation.max_issues = max_issues
+        Validate(context).consume()
+        return [str(i) for i in context.validation.issues]
+
+    def test_partitions(self):
+        issues = self.validate()
+        self.assertEqual(11, len(issues))
+        partitions = [self.validate(partition=ValidationPartition(i, 3)) for i in range(3)]
+        # Everything outside of the units is validated by every partition
+        spine = [i for i in issues if 'spine' in i]
+        for partition in partitions:
+            self.assertEqual(spine, [i for i in partition if 'spine' in i])
+        # Every unit is validated by exactly one partition
+        units = sum(([i for i in partition if 'spine' not in i] for partition in partitions), [])
+        self.assertEqual(sorted(set(issues) - set(spine)), sorted(units))
+
+    def test_processes(self):
+        self.assertEqual(self.validate(), self.validate(processes=3))
+
+    def test_concurrent_processes(self):
+        issues = self.validate()
+        results = []
+        def validate(max_issues):
+            results.append((max_issues, self.validate(processes=3, max_issues=max_issues)))
+        threads = [threading.Thread(target=validate, args=(max_issues,)) for max_issues in (None, 2, None, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(4, len(results))
+        for max_issues, some_issues in results:
+            self.assertEqual(max_issues or len(issues), len(some_issues))
+            self.assertTrue(set(some_issues) <= set(issues))
+
+    def test_max_issues(self):
+        issues = self.validate()
+        for processes in (1, 3):
+            some_issues = self.validate(processes=processes, max_issues=3)
+            self.assertEqual(3, len(some_issues))
+            self.assertTrue(set(some_issues) < set(issues))
+
+@has_fields
+class Entry(Presentation):
+    @primitive_field(str)
+    def parent():
+        pass
+
+    def _validate(self, context):
+        super(Entry, self)._validate(context)
+        if (self.parent is not None) and (self.parent not in context.presentation.presenter.entries):
+            context.validation.report('unknown parent of "%s": %s' % (self._name, self.parent))
+
+@has_fields
+class EntriesPresenter(Presenter):
+    @primitive_field()
+    def imports():
+        pass
+
+    @object_dict_field(Entry)
+    def entries():
+        pass
+
+    def _get_import_locations(self):
+        return self.imports
+
+class RevalidateTestCase(TestCase):
+    def setUp(self):
+        super(RevalidateTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.write('a.yaml', 'imports: [b.yaml]\nentries:\n  x: {parent: y}\n')
+        self.write('b.yaml', 'entries:\n  y: {}\n  z: {}\n')
+        self.context = self.create_context()
+
+    def write(self, name, content):
+        with open(os.path.join(self.path, name), 'w') as f:
+            f.write(content)
+
+    def create_context(self):
+        context = ConsumptionContext()
+        context.reading.cache = ReadCache()
+        context.presentation.location = UriLocation(os.path.join(self.path, 'a.yaml'))
+        context.presentation.presenter_class = EntriesPresenter
+        return context
+
+    def revalidate(self, *names):
+        self.context.revalidate([os.path.join(self.path, name) for name in names])
+        issues = [str(i) for i in self.context.validation.issues]
+        # Must be exactly what validating everything would find
+        context = self.create_context()
+        ConsumerChain(context, (Read, Validate)).consume()
+        self.assertEqual([str(i) for i in context.validation.issues], issues)
+        incremental = self.context.validation.incremental
+        return issues, incremental.validated, incremental.reused
+
+    def test_revalidate(self):
+        self.assertEqual(([], 3, 0), self.revalidate())
+        self.assertEqual(([], 0, 3), self.revalidate())
+
+        # "x" is in an unchanged document, but refers to "y"
+        self.write('b.yaml', 'entries:\n  z: {}\n')
+        self.assertEqual((['0: unknown parent of "x": y'], 2, 0), self.revalidate('b.yaml'))
+        self.assertEqual((['0: unknown parent of "x": y'], 0, 2), self.revalidate())
+
+        self.write('a.yaml', 'imports: [b.yaml]\nentries:\n  x: {parent: z}\n')
+        self.assertEqual(([], 1, 1), self.revalidate('a.yaml'))
+
+    def test_read_issues(self):
+        self.revalidate()
+        self.write('b.yaml', 'entries: [\n')
+        self.assertFalse(self.context.revalidate([os.path.join(self.path, 'b.yaml')]))
+        self.assertIsNone(self.context.validation.incremental)
+        self.write('b.yaml', 'entries:\n  y: {}\n  z: {}\n')
+        self.assertEqual(([], 3, 0), self.revalidate('b.yaml'))
@@ -0,0 +1,245 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria.consumption import ConsumptionContext
+from aria.utils import StrictList
+from aria.tools.benchmark import get_deep_size
+from aria.deployment import TypeHierarchy, Type, DeploymentPlan, Node, Relationship, Group, DeploymentTemplate, NodeTemplate, CapabilityTemplate, Requirement, Function, Parameter, FrozenParameter, Interface
+
+class TypeHierarchyTestCase(TestCase):
+    def setUp(self):
+        super(TypeHierarchyTestCase, self).setUp()
+        # root
+        #   a
+        #     b
+        #       c
+        #     d
+        #   e
+        self.hierarchy = TypeHierarchy()
+        a = Type('a')
+        b = Type('b')
+        self.hierarchy.children.append(a)
+        # Subtrees can be built before they join the hierarchy
+        b.children.append(Type('c'))
+        a.children.append(b)
+        a.children.append(Type('d'))
+        self.hierarchy.children.append(Type('e'))
+
+    def test_get_descendant(self):
+        hierarchy = self.hierarchy
+        self.assertEqual('c', hierarchy.get_descendant('c').name)
+        self.assertIsNone(hierarchy.get_descendant('x'))
+        a = hierarchy.get_descendant('a')
+        self.assertEqual('d', a.get_descendant('d').name)
+        self.assertIsNone(a.get_descendant('e'))
+        self.assertEqual(['a', 'b', 'c', 'd', 'e'], [t.name for t in hierarchy.iter_descendants()])
+
+    def test_get_parent(self):
+        hierarchy = self.hierarchy
+        self.assertIs(hierarchy, hierarchy.get_parent('a'))
+        self.assertEqual('b', hierarchy.get_parent('c').name)
+        self.assertIsNone(hierarchy.get_descendant('b').get_parent('b'))
+        self.assertIsNone(hierarchy.get_parent('x'))
+
+    def test_is_descendant(self):
+        hierarchy = self.hierarchy
+        self.assertTrue(hierarchy.is_descendant('a', 'c'))
+        self.assertTrue(hierarchy.is_descendant('c', 'c'))
+        self.assertFalse(hierarchy.is_descendant('b', 'd'))
+        self.assertFalse(hierarchy.is_descendant('c', 'a'))
+        self.assertFalse(hierarchy.is_descendant('a', 'e'))
+        self.assertFalse(hierarchy.is_descendant('x', 'a'))
+
+        # Numbering is updated after types are added
+        hierarchy.get_descendant('d').children.append(Type('f'))
+        self.assertTrue(hierarchy.is_descendant('a', 'f'))
+        self.assertFalse(hierarchy.is_descendant('b', 'f'))
+
+    def test_adopt(self):
+        hierarchy = self.hierarchy
+        self.assertRaises(ValueError, hierarchy.children.append, hierarchy.get_descendant('c'))
+        self.assertRaises(ValueError, hierarchy.get_descendant('c').children.append, hierarchy)
+
+class DeploymentPlanTestCase(TestCase):
+    def setUp(self):
+        super(DeploymentPlanTestCase, self).setUp()
+        self.context = ConsumptionContext()
+        self.plan = DeploymentPlan()
+
+    def add_node(self, type_name, template_name):
+        node = Node(self.context, type_name, template_name)
+        self.plan.nodes[node.id] = node
+        return node
+
+    def relate(self, source, target):
+        relationship = Relationship(type_name='relationship')
+        relationship.target_node_id = target.id
+        source.relationships.append(relationship)
+        return relationship
+
+    def test_nodes(self):
+        web1 = self.add_node('server', 'web')
+        db = self.add_node('database', 'db')
+        web2 = self.add_node('server', 'web')
+        self.assertEqual([web1, web2], self.plan.find_nodes('web'))
+        self.assertEqual([web1.id, web2.id], self.plan.get_node_ids('web'))
+        self.assertEqual([db], self.plan.find_nodes_of_type('database'))
+        self.assertEqual([], self.plan.find_nodes('x'))
+
+    def test_relationships(self):
+        web = self.add_node('server', 'web')
+        db = self.add_node('database', 'db')
+        relationship = self.relate(web, db)
+        self.assertEqual([relationship], self.plan.find_incoming_relationships(db.id))
+        self.assertTrue(self.plan.is_node_a_target(self.context, db))
+        self.assertFalse(self.plan.is_node_a_target(self.context, web))
+
+    def test_groups(self):
+        web = self.add_node('server', 'web')
+        db = self.add_node('database', 'db')
+        group = Group(self.context, 'group', 'all')
+        group.member_node_ids.append(web.id)
+        self.plan.groups[group.id] = group
+        # Members added to a group that is already in the plan are indexed, too
+        group.member_node_ids.append(db.id)
+        self.assertEqual([group], self.plan.find_groups('all'))
+        self.assertEqual([group.id], self.plan.get_group_ids('all'))
+        self.assertEqual([group], self.plan.find_node_groups(web.id))
+        self.assertEqual([group], self.plan.find_node_groups(db.id))
+
+class RequirementTestCase(TestCase):
+    def setUp(self):
+        super(RequirementTestCase, self).setUp()
+        self.context = ConsumptionContext()
+        deployment = self.context.deployment
+        compute = Type('compute')
+        compute.children.append(Type('server'))
+        deployment.node_types.children.append(compute)
+        deployment.node_types.children.append(Type('software'))
+        container = Type('container')
+        container.children.append(Type('docker'))
+        deployment.capability_types.children.append(container)
+        deployment.capability_types.children.append(Type('endpoint'))
+
+        deployment.template = DeploymentTemplate()
+        self.add_node_template('app', 'software', endpoint='endpoint')
+        self.add_node_template('vm', 'compute', endpoint='endpoint')
+        self.add_node_template('server', 'server', host='docker', endpoint='endpoint')
+
+    def add_node_template(self, name, type_name, **capabilities):
+        node_template = NodeTemplate(name, type_name)
+        for capability_name, capability_type_name in sorted(capabilities.iteritems()):
+            node_template.capabilities[capability_name] = CapabilityTemplate(capability_name, capability_type_name)
+        self.context.deployment.template.node_templates[name] = node_template
+
+    def find_target(self, **kwargs):
+        source = self.context.deployment.template.node_templates['app']
+        target, capability = Requirement(**kwargs).find_target(self.context, source)
+        return (target.name if target is not None else None), (capability.name if capability is not None else None)
+
+    def test_find_target(self):
+        # First node template of the type or its descendants that has a capability of the type
+        self.assertEqual(('server', 'host'), self.find_target(target_node_type_name='compute', target_capability_type_name='container'))
+        self.assertEqual(('vm', 'endpoint'), self.find_target(target_node_type_name='compute', target_capability_type_name='endpoint'))
+        self.assertEqual((None, None), self.find_target(target_node_type_name='software', target_capability_type_name='container'))
+        # Without a capability type any capability matches
+        self.assertEqual(('server', 'endpoint'), self.find_target(target_node_type_name='server'))
+        self.assertEqual(('server', 'host'), self.find_target(target_node_template_name='server', target_capability_type_name='docker'))
+
+class NodeTemplateTestCase(TestCase):
+    def setUp(self):
+        super(NodeTemplateTestCase, self).setUp()
+        self.context = ConsumptionContext()
+        self.node_template = NodeTemplate('web', 'compute')
+        self.node_template.properties['port'] = Parameter('integer', 80, None)
+        self.node_template.properties['address'] = Parameter('string', Function(), None)
+        capability = CapabilityTemplate('host', 'container')
+        capability.properties['count'] = Parameter('integer', 1, None)
+        self.node_template.capabilities['host'] = capability
+
+    def test_instantiate_nodes(self):
+        self.assertEqual([], self.node_template.instantiate_nodes(self.context, None, 0))
+        nodes = self.node_template.instantiate_nodes(self.context, None, 3)
+        self.assertEqual(3, len(nodes))
+        self.assertEqual(3, len(set(node.id for node in nodes)))
+        prototype = nodes[0]
+        for node in nodes[1:]:
+            self.assertEqual('web', node.template_name)
+            self.assertEqual('compute', node.type_name)
+            # Values without functions are shared, the others are not
+            self.assertIs(prototype.properties['port'], node.properties['port'])
+            self.assertIsNot(prototype.properties['address'], node.properties['address'])
+            # Capabilities are never shared
+            capability = node.capabilities['host']
+            self.assertIsNot(prototype.capabilities['host'], capability)
+            self.assertIs(prototype.capabilities['host'].properties['count'], capability.properties['count'])
+            self.assertEqual(0, len(node.relationships))
+
+    def test_clones_are_independent(self):
+        interface = Interface('standard', 'lifecycle')
+        interface.inputs['hosts'] = Parameter('list', ['a', 'b'], None)
+        self.node_template.interfaces['standard'] = interface
+        prototype, clone = self.node_template.instantiate_nodes(self.context, None, 2)
+        # Shared parameters are read-only
+        self.assertIsInstance(clone.properties['port'], FrozenParameter)
+        self.assertRaises(TypeError, setattr, clone.properties['port'], 'value', 8080)
+        hosts = clone.interfaces['standard'].inputs['hosts'].value
+        self.assertRaises(TypeError, hosts.append, 'c')
+        self.assertEqual(80, prototype.properties['port'].value)
+        self.assertEqual(['a', 'b'], prototype.interfaces['standard'].inputs['hosts'].value)
+        # Replacing a parameter changes it only for one node
+        clone.properties['port'] = Parameter('integer', 8081, None)
+        self.assertEqual(8081, clone.properties['port'].value)
+        self.assertEqual(80, prototype.properties['port'].value)
+        # Elements that contain parameters are not shared
+        self.assertIsNot(prototype.interfaces['standard'], clone.interfaces['standard'])
+        del clone.interfaces['standard'].inputs['hosts']
+        self.assertIn('hosts', prototype.interfaces['standard'].inputs)
+        # Parameters with functions are not shared
+        clone.properties['address'].value = 'localhost'
+        self.assertIsInstance(prototype.properties['address'].value, Function)
+
+    def test_compact(self):
+        nodes = self.node_template.instantiate_nodes(self.context, None, 2)
+        plan = DeploymentPlan()
+        for node in nodes:
+            plan.nodes[node.id] = node
+        for node in nodes:
+            self.assertFalse(hasattr(node, '__dict__'))
+            # Empty containers are not allocated, not even when the plan hooks into them
+            self.assertIsNone(getattr(node, '_interfaces', None))
+            self.assertNotIsInstance(getattr(node, '_relationships', None), StrictList)
+            self.assertEqual({}, node.interfaces)
+            self.assertEqual([], node.relationships)
+        self.assertIsNotNone(getattr(nodes[1], '_properties', None))
+
+        # The hook applies once the relationships are allocated
+        relationship = Relationship(type_name='relationship')
+        relationship.target_node_id = nodes[1].id
+        nodes[0].relationships.append(relationship)
+        self.assertIsInstance(getattr(nodes[0], '_relationships', None), StrictList)
+        self.assertEqual([relationship], plan.find_incoming_relationships(nodes[1].id))
+
+    def test_deep_size(self):
+        prototype, clone = self.node_template.instantiate_nodes(self.context, None, 2)
+        seen = set()
+        prototype_size = get_deep_size((prototype,), seen)
+        # Only what is not shared with the prototype is counted
+        clone_size = get_deep_size((clone,), seen)
+        self.assertTrue(0 < clone_size < prototype_size)
+        self.assertEqual(0, get_deep_size((clone,), seen))
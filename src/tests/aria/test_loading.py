@@ -0,0 +1,245 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from threading import Thread
+import BaseHTTPServer, os, shutil, tempfile, zipfile
+
+from testtools import TestCase
+
+from aria.loading import UriLocation, LiteralLocation, ArchiveLocation, UriSession, UriTextLoader, FileTextLoader, DirectoryIndex, ArchiveCache, DefaultLoaderSource, LoadingContext, LoaderError, DocumentNotFoundError
+from aria.utils import FixedThreadPoolExecutor, OpenClose
+
+DOCUMENTS = {
+    '/etag.yaml': ('etag: true\n', {'ETag': '"v1"'}),
+    '/last-modified.yaml': ('last_modified: true\n', {'Last-Modified': 'Mon, 03 Oct 2016 10:00:00 GMT'}),
+    '/max-age.yaml': ('max_age: true\n', {'Cache-Control': 'max-age=3600'}),
+    '/no-store.yaml': ('no_store: true\n', {'Cache-Control': 'no-store', 'ETag': '"v1"'})}
+
+class StandInHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.getheader('If-None-Match'), self.headers.getheader('If-Modified-Since')))
+        document = DOCUMENTS.get(self.path)
+        if document is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        content, headers = document
+        if (('ETag' in headers) and (self.headers.getheader('If-None-Match') == headers['ETag'])) or (('Last-Modified' in headers) and (self.headers.getheader('If-Modified-Since') == headers['Last-Modified'])):
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        for k, v in headers.iteritems():
+            self.send_header(k, v)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+class UriSessionTestCase(TestCase):
+    def setUp(self):
+        super(UriSessionTestCase, self).setUp()
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), StandInHandler)
+        self.server.requests = []
+        thread = Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.context = LoadingContext()
+        self.context.uri_session = UriSession(timeout=5, retries=0)
+
+    def uri(self, path):
+        return 'http://127.0.0.1:%d%s' % (self.server.server_port, path)
+
+    def load(self, path):
+        loader = UriTextLoader(UriLocation(self.uri(path)), context=self.context)
+        with OpenClose(loader):
+            return loader.load()
+
+    def test_etag_revalidation(self):
+        self.assertEqual('etag: true\n', self.load('/etag.yaml'))
+        self.assertEqual('etag: true\n', self.load('/etag.yaml'))
+        self.assertEqual([('/etag.yaml', None, None), ('/etag.yaml', '"v1"', None)], self.server.requests)
+
+    def test_last_modified_revalidation(self):
+        self.assertEqual('last_modified: true\n', self.load('/last-modified.yaml'))
+        self.assertEqual('last_modified: true\n', self.load('/last-modified.yaml'))
+        self.assertEqual('Mon, 03 Oct 2016 10:00:00 GMT', self.server.requests[1][2])
+
+    def test_max_age(self):
+        self.assertEqual('max_age: true\n', self.load('/max-age.yaml'))
+        self.assertEqual('max_age: true\n', self.load('/max-age.yaml'))
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_no_store(self):
+        self.load('/no-store.yaml')
+        self.load('/no-store.yaml')
+        self.assertEqual([('/no-store.yaml', None, None)] * 2, self.server.requests)
+
+    def test_credentials(self):
+        session = self.context.uri_session
+        uri = self.uri('/max-age.yaml')
+        session.get(uri)
+        session.get(uri, auth=('user', 'password'))
+        session.get(uri, auth=('user', 'password'))
+        session.get(uri, headers={'Authorization': 'Bearer token'})
+        session.get(uri, headers={'authorization': 'Bearer token'})
+        session.session.auth = ('other', 'password')
+        session.get(uri)
+        session.session.auth = None
+        session.get(uri)
+        # One request per set of credentials
+        self.assertEqual(4, len(self.server.requests))
+
+    def test_not_found(self):
+        self.assertRaises(DocumentNotFoundError, self.load, '/missing.yaml')
+
+    def test_concurrent(self):
+        paths = sorted(DOCUMENTS) * 5
+        with FixedThreadPoolExecutor(size=4) as executor:
+            for path in paths:
+                executor.submit(self.load, path)
+            executor.drain()
+            executor.raise_first()
+            self.assertEqual([DOCUMENTS[p][0] for p in paths], executor.returns)
+
+class LocationKeyTestCase(TestCase):
+    def test_file_keys(self):
+        self.assertEqual(UriLocation('/a/b/../c.yaml').key, UriLocation('/a/./c.yaml').key)
+        self.assertEqual(UriLocation('/a/c.yaml').key, UriLocation('file:///a/c.yaml').key)
+        self.assertNotEqual(UriLocation('/a/c.yaml').key, UriLocation('/a/d.yaml').key)
+
+    def test_uri_keys(self):
+        self.assertEqual(UriLocation('HTTP://Example.com:80/a/../b.yaml#x').key, UriLocation('http://example.com/b.yaml').key)
+        self.assertNotEqual(UriLocation('http://example.com:8080/b.yaml').key, UriLocation('http://example.com/b.yaml').key)
+        self.assertNotEqual(UriLocation('http://example.com/b.yaml?v=1').key, UriLocation('http://example.com/b.yaml?v=2').key)
+
+    def test_literal_keys(self):
+        self.assertEqual(LiteralLocation(u'a: 1').key, LiteralLocation('a: 1').key)
+        self.assertNotEqual(LiteralLocation('a: 1').key, LiteralLocation('a: 2').key)
+        self.assertTrue(LiteralLocation('a: 1').is_equivalent(LiteralLocation('a: 1')))
+        self.assertFalse(LiteralLocation('a: 1').is_equivalent(UriLocation('/a: 1')))
+
+class DirectoryIndexTestCase(TestCase):
+    def setUp(self):
+        super(DirectoryIndexTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        os.mkdir(os.path.join(self.path, 'profile'))
+        self.write('profile/types.yaml', u'name: types\n')
+
+    def write(self, path, content):
+        with open(os.path.join(self.path, path), 'wb') as f:
+            f.write(content.encode('utf8'))
+
+    def test_resolve(self):
+        index = DirectoryIndex()
+        self.assertEqual(os.path.join(self.path, 'profile', 'types.yaml'), index.resolve('profile/types.yaml', [os.path.join(self.path, 'missing'), self.path]))
+        self.assertIsNone(index.resolve('profile/missing.yaml', [self.path]))
+        self.assertIsNone(index.resolve('missing/types.yaml', [self.path]))
+
+    def test_invalidation(self):
+        index = DirectoryIndex()
+        self.assertFalse(index.exists(os.path.join(self.path, 'new.yaml')))
+        self.write('new.yaml', u'name: new\n')
+        # Make sure the modification time changes even on file systems with coarse timestamps
+        os.utime(self.path, (0, 0))
+        self.assertTrue(index.exists(os.path.join(self.path, 'new.yaml')))
+
+    def test_load(self):
+        self.write('unicode.yaml', u'name: \u4e2d\u570b\n')
+        context = LoadingContext()
+        context.directory_index = DirectoryIndex()
+        loader = FileTextLoader(context, UriLocation('unicode.yaml'), UriLocation(os.path.join(self.path, 'origin.yaml')))
+        with OpenClose(loader):
+            self.assertEqual(u'name: \u4e2d\u570b\n', loader.load())
+        self.assertEqual(os.path.join(self.path, 'unicode.yaml'), loader.location.uri)
+
+    def test_not_found(self):
+        loader = FileTextLoader(LoadingContext(), UriLocation(os.path.join(self.path, 'missing.yaml')), None)
+        self.assertRaises(DocumentNotFoundError, loader.open)
+
+class ArchiveTestCase(TestCase):
+    def setUp(self):
+        super(ArchiveTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.context = LoadingContext()
+        self.context.archive_cache = ArchiveCache()
+        self.addCleanup(self.context.archive_cache.clear)
+
+    def create(self, name, members):
+        path = os.path.join(self.path, name)
+        with zipfile.ZipFile(path, 'w') as f:
+            for member, (content, compress_type) in members.iteritems():
+                f.writestr(zipfile.ZipInfo(member), content.encode('utf8'), compress_type)
+        return path
+
+    def load(self, location, origin_location=None):
+        loader = DefaultLoaderSource().get_loader(self.context, location, origin_location)
+        with OpenClose(loader):
+            return loader.location, loader.load()
+
+    def test_entry_definitions(self):
+        path = self.create('test.csar', {
+            'TOSCA-Metadata/TOSCA.meta': (u'TOSCA-Meta-File-Version: 1.0\nEntry-Definitions: Definitions/main.yaml\n', zipfile.ZIP_DEFLATED),
+            'Definitions/main.yaml': (u'main: \u4e2d\u570b\n', zipfile.ZIP_DEFLATED),
+            'Definitions/types/types.yaml': (u'types: true\n', zipfile.ZIP_STORED)})
+
+        location, data = self.load(UriLocation(path))
+        self.assertEqual(u'main: \u4e2d\u570b\n', data)
+        self.assertEqual('Definitions/main.yaml', location.member)
+
+        # Relative to the origin location within the archive
+        location, data = self.load(UriLocation('types/types.yaml'), location)
+        self.assertEqual(u'types: true\n', data)
+        self.assertEqual(ArchiveLocation(path, 'Definitions/types/types.yaml').key, location.key)
+
+    def test_no_metadata(self):
+        path = self.create('test.zip', {
+            'main.yaml': (u'main: true\n', zipfile.ZIP_STORED),
+            'types/types.yaml': (u'types: true\n', zipfile.ZIP_STORED)})
+        self.assertEqual(u'main: true\n', self.load(UriLocation(path))[1])
+
+    def test_not_a_member(self):
+        path = self.create('test.zip', {'main.yaml': (u'main: true\n', zipfile.ZIP_STORED)})
+        origin_location = self.load(UriLocation(path))[0]
+        self.assertIsInstance(DefaultLoaderSource().get_loader(self.context, UriLocation('missing.yaml'), origin_location), FileTextLoader)
+        self.assertRaises(DocumentNotFoundError, self.load, ArchiveLocation(path, 'missing.yaml'))
+
+    def test_reopen_when_modified(self):
+        path = self.create('test.zip', {'main.yaml': (u'main: 1\n', zipfile.ZIP_STORED)})
+        self.assertEqual(u'main: 1\n', self.load(UriLocation(path))[1])
+        archive = self.context.archive_cache.get(path)
+        path = self.create('test.zip', {'main.yaml': (u'main: 22\n', zipfile.ZIP_STORED)})
+        self.assertEqual(u'main: 22\n', self.load(UriLocation(path))[1])
+        # The replaced archive is closed
+        self.assertIsNot(archive, self.context.archive_cache.get(path))
+        self.assertRaises(LoaderError, archive.read, 'main.yaml')
+
+    def test_stored_without_copying(self):
+        path = self.create('test.zip', {
+            'stored.yaml': (u'stored: \u4e2d\u570b\n', zipfile.ZIP_STORED),
+            'deflated.yaml': (u'deflated: true\n', zipfile.ZIP_DEFLATED)})
+        archive = self.context.archive_cache.get(path)
+        self.assertIsInstance(archive.read('stored.yaml'), buffer)
+        self.assertEqual(u'stored: \u4e2d\u570b\n'.encode('utf8'), str(archive.read('stored.yaml')))
+        self.assertEqual('deflated: true\n', archive.read('deflated.yaml'))
+        self.assertEqual(u'stored: \u4e2d\u570b\n', self.load(ArchiveLocation(path, 'stored.yaml'))[1])
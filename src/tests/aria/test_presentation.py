@@ -0,0 +1,149 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria import InvalidValueError
+from aria.consumption import ConsumptionContext
+from aria.validation import Issue
+from aria.presentation import Presentation, has_fields, short_form_field, primitive_field, primitive_list_field, primitive_dict_unknown_fields, object_field, object_dict_field, field_getter, validate_passes
+
+@has_fields
+class Item(Presentation):
+    @primitive_field(int)
+    def size():
+        pass
+
+@short_form_field('name')
+@has_fields
+class Thing(Presentation):
+    @primitive_field(str, required=True)
+    def name():
+        """
+        The name.
+        """
+
+    @primitive_field(str, default='red', allowed=('red', 'green'))
+    def color():
+        pass
+
+    @primitive_list_field(int)
+    def numbers():
+        pass
+
+    @object_field(Item)
+    def item():
+        pass
+
+    @object_dict_field(Item)
+    def items():
+        pass
+
+    @primitive_dict_unknown_fields(int)
+    def extras():
+        pass
+
+@has_fields
+class DefaultedThing(Thing):
+    default_raw_calls = 0
+
+    def _get_default_raw(self):
+        DefaultedThing.default_raw_calls += 1
+        return {'name': 'default', 'numbers': [1], 'item': {'size': 1}}
+
+    @field_getter(lambda field, presentation: field._get(presentation) * 2)
+    @primitive_field(int)
+    def double():
+        pass
+
+class FieldsTestCase(TestCase):
+    def test_variants(self):
+        thing = Thing(raw={'name': 'thing', 'numbers': ['1', 2], 'item': {'size': '3'}, 'items': {'a': {'size': 4}}, 'extra': '5'})
+        self.assertEqual(u'thing', thing.name)
+        self.assertIsInstance(thing.name, unicode)
+        self.assertEqual(u'red', thing.color)
+        self.assertEqual([1, 2], thing.numbers)
+        self.assertEqual(3, thing.item.size)
+        self.assertIs(thing, thing.item._container)
+        self.assertEqual(['a'], thing.items.keys())
+        self.assertEqual(4, thing.items['a'].size)
+        self.assertEqual({'extra': 5}, thing.extras)
+        self.assertEqual('The name.', Thing.name.fget.fn.__doc__.strip())
+
+    def test_short_form(self):
+        self.assertEqual(u'thing', Thing(raw='thing').name)
+        self.assertIsNone(Item(raw=1).size)
+
+    def test_invalid(self):
+        self.assertRaises(InvalidValueError, getattr, Thing(raw={}), 'name')
+        self.assertRaises(InvalidValueError, getattr, Thing(raw={'name': 'thing', 'color': 'blue'}), 'color')
+        self.assertRaises(InvalidValueError, getattr, Thing(raw={'name': 'thing', 'numbers': 1}), 'numbers')
+        self.assertRaises(InvalidValueError, getattr, Thing(raw={'name': 'thing', 'numbers': ['x']}), 'numbers')
+
+    def test_inherited(self):
+        thing = DefaultedThing(raw={'numbers': [2], 'double': 3})
+        self.assertEqual(u'default', thing.name)
+        self.assertEqual([2], thing.numbers)
+        self.assertEqual(6, thing.double)
+
+        # The inherited field has a getter of its own, compiled with the default raw data hook
+        self.assertIsNot(Thing.__dict__['name'], DefaultedThing.__dict__['name'])
+        self.assertRaises(InvalidValueError, getattr, Thing(raw={'numbers': [2]}), 'name')
+
+    def test_set(self):
+        thing = Thing(raw={'name': 'thing'})
+        thing.color = 'green'
+        self.assertEqual({'name': 'thing', 'color': 'green'}, thing._raw)
+        self.assertRaises(InvalidValueError, setattr, Thing(raw={'name': 'thing'}), 'color', 'blue')
+
+    def test_default_raw_materialized_once(self):
+        DefaultedThing.default_raw_calls = 0
+        thing = DefaultedThing(raw={'numbers': [2]})
+        self.assertEqual(u'default', thing.name)
+        self.assertEqual([2], thing.numbers)
+        self.assertEqual(1, thing.item.size)
+        self.assertEqual(1, DefaultedThing.default_raw_calls)
+
+        # The default raw data is not modified
+        thing.item._raw['size'] = 2
+        self.assertEqual(1, DefaultedThing(raw={}).item.size)
+
+        # Setting a field must update the merged raw data
+        thing.color = 'green'
+        self.assertEqual(u'green', thing.color)
+        self.assertEqual(u'default', thing.name)
+
+class ValidatePassesTestCase(TestCase):
+    def test_levels(self):
+        context = ConsumptionContext()
+        calls = []
+        def pass_fn(context):
+            calls.append(len(calls))
+            context.validation.report('issue %d' % len(calls), level=Issue.BETWEEN_TYPES)
+
+        validate_passes(context, Issue.BETWEEN_TYPES, pass_fn, pass_fn)
+        self.assertEqual([0, 1], calls)
+
+        # Passes above max_level are skipped
+        context.validation.max_level = Issue.BETWEEN_FIELDS
+        validate_passes(context, Issue.BETWEEN_TYPES, pass_fn)
+        self.assertEqual([0, 1], calls)
+
+        # Passes stop as soon as the maximum number of issues is reached
+        context.validation.max_level = Issue.ALL
+        context.validation.max_issues = 3
+        validate_passes(context, Issue.FIELD, pass_fn, pass_fn)
+        self.assertEqual([0, 1, 2], calls)
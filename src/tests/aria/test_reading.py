@@ -0,0 +1,316 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+import cPickle, os, shutil, tempfile
+
+from testtools import TestCase
+
+from aria import VERSION
+from aria.utils import deepcopy_with_locators, merge
+from aria.loading import LiteralLocation, LiteralLoader, UriLocation, FileTextLoader, LoadingContext
+from aria.reading import ReadingContext, ReadCache, YamlReader, FastYamlReader, FastReaderSource, ReaderSyntaxError, JinjaTemplateCache, JinjaReader, BUNDLE_EXTENSION, ProfileBundle, ProfileBundles, ProfileBundleRecorder
+
+DOCUMENT = u'''
+name: test
+unicode: \u4e2d\u570b
+numbers: [1, 2.5, true, null]
+defaults: &defaults
+  a: 1
+  b:
+    - x
+    - y
+again: *defaults
+'''
+
+def read(reader_class, data):
+    location = LiteralLocation(data)
+    return reader_class(None, location, LiteralLoader(location)).read()
+
+def get_locations(locator):
+    r = (locator.line, locator.column)
+    if isinstance(locator.children, dict):
+        return r, dict((k, get_locations(v)) for k, v in locator.children.iteritems())
+    elif isinstance(locator.children, list):
+        return r, [get_locations(v) for v in locator.children]
+    return r
+
+class ReadCacheTestCase(TestCase):
+    def setUp(self):
+        super(ReadCacheTestCase, self).setUp()
+        self.location = LiteralLocation(DOCUMENT)
+
+    def get_key(self, cache, data=DOCUMENT, reader_class=YamlReader, variant=None):
+        return cache.get_key(self.location, data, reader_class, variant)
+
+    def test_hits_and_misses(self):
+        cache = ReadCache()
+        key = self.get_key(cache)
+        self.assertIsNone(cache.get(key))
+        raw = read(YamlReader, DOCUMENT)
+        cache.put(key, raw)
+        cached = cache.get(key)
+        self.assertEqual(raw, cached)
+        self.assertEqual(get_locations(raw._locator), get_locations(cached._locator))
+        # Every get returns a fresh copy
+        self.assertIsNot(cached, cache.get(key))
+        self.assertEqual((2, 1, 128, 1), cache.cache_info())
+        cache.clear()
+        self.assertEqual((0, 0, 128, 0), cache.cache_info())
+
+    def test_lru_eviction(self):
+        cache = ReadCache(size=2)
+        for name in ('a', 'b'):
+            cache.put(name, {'name': name})
+        # Using "a" makes "b" the least recently used
+        cache.get('a')
+        cache.put('c', {'name': 'c'})
+        self.assertEqual((1, 0, 2, 2), cache.cache_info())
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual({'name': 'a'}, cache.get('a'))
+        self.assertEqual({'name': 'c'}, cache.get('c'))
+
+    def test_disk_tier(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        cache = ReadCache(path=path)
+        key = self.get_key(cache)
+        cache.put(key, {'name': 'test'})
+        # No temporary files are left behind
+        self.assertEqual(['aria-read-%s.pickle' % key], os.listdir(path))
+
+        cache = ReadCache(path=path)
+        self.assertEqual({'name': 'test'}, cache.get(key))
+        self.assertEqual((1, 0, 128, 1), cache.cache_info())
+        self.assertIsNone(ReadCache().get(key))
+
+    def test_untrusted_disk_tier(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        key = self.get_key(cache=ReadCache())
+        ReadCache(path=path).put(key, {'name': 'test'})
+        file_path = os.path.join(path, 'aria-read-%s.pickle' % key)
+
+        # Files that others can write are not unpickled
+        os.chmod(file_path, 0666)
+        self.assertIsNone(ReadCache(path=path).get(key))
+        os.chmod(file_path, 0600)
+        self.assertEqual({'name': 'test'}, ReadCache(path=path).get(key))
+
+        # Nor are files in directories that others can write
+        os.chmod(path, 0777)
+        self.assertIsNone(ReadCache(path=path).get(key))
+        ReadCache(path=path).put('other', {'name': 'other'})
+        self.assertEqual(['aria-read-%s.pickle' % key], os.listdir(path))
+
+    def test_keys(self):
+        cache = ReadCache()
+        key = self.get_key(cache)
+        self.assertEqual(key, self.get_key(cache))
+        self.assertNotEqual(key, self.get_key(cache, reader_class=FastYamlReader))
+        self.assertNotEqual(key, self.get_key(cache, variant='one'))
+        self.assertNotEqual(key, self.get_key(cache, data=DOCUMENT + u'\nother: 1\n'))
+        self.assertNotEqual(self.get_key(cache, variant='one'), self.get_key(cache, variant='other'))
+
+    def test_unpicklable(self):
+        cache = ReadCache()
+        cache.put('key', {'fn': lambda: None})
+        self.assertEqual((0, 0, 128, 0), cache.cache_info())
+        self.assertIsNone(cache.get('key'))
+
+class FastYamlReaderTestCase(TestCase):
+    def test_same_raw(self):
+        self.assertEqual(read(YamlReader, DOCUMENT), read(FastYamlReader, DOCUMENT))
+
+    def test_same_key_order(self):
+        self.assertEqual(list(read(YamlReader, DOCUMENT)), list(read(FastYamlReader, DOCUMENT)))
+
+    def test_same_locations(self):
+        self.assertEqual(get_locations(read(YamlReader, DOCUMENT)._locator), get_locations(read(FastYamlReader, DOCUMENT)._locator))
+
+    def test_same_scalars(self):
+        # YAML 1.2: no yes/no/on/off booleans, no octals without "0o", no sexagesimals
+        data = u'a: yes\nb: no\nc: on\nd: off\ne: true\nf: False\ng: 012\nh: 0o12\ni: 0x1f\nj: 1:20\nk: 1.5\nl: ~\n'
+        raw = read(FastYamlReader, data)
+        self.assertEqual(read(YamlReader, data), raw)
+        self.assertEqual(['yes', 'no', 'on', 'off', True, False, 12, 10, 31, '1:20', 1.5, None], raw.values())
+
+    def test_yaml_1_1(self):
+        data = u'# old\n%YAML 1.1\n---\na: yes\nb: 012\nc: off\nd: 1:20\n'
+        raw = read(FastYamlReader, data)
+        self.assertEqual(read(YamlReader, data), raw)
+        self.assertEqual([True, 10, False, 80], raw.values())
+
+    def test_merge_keys(self):
+        data = u'a: &a {x: 1, y: 2}\nb:\n  <<: *a\n  y: 3\nc:\n  <<: [*a, {w: 0}]\n  z: 4\n'
+        for reader_class in (YamlReader, FastYamlReader):
+            raw = read(reader_class, data)
+            self.assertEqual({'x': 1, 'y': 3}, dict(raw['b']))
+            self.assertEqual({'x': 1, 'y': 2, 'w': 0, 'z': 4}, dict(raw['c']))
+            self.assertEqual(['w', 'x', 'y', 'z'], sorted(raw._locator.children['c'].children))
+        self.assertEqual(get_locations(read(YamlReader, data)._locator), get_locations(read(FastYamlReader, data)._locator))
+
+    def test_empty(self):
+        self.assertEqual({}, read(FastYamlReader, u''))
+
+    def test_syntax_error(self):
+        data = u'a: [1, 2\nb: 3\n'
+        e1 = self.assertRaises(ReaderSyntaxError, read, YamlReader, data)
+        e2 = self.assertRaises(ReaderSyntaxError, read, FastYamlReader, data)
+        self.assertEqual((e1.issue.line, e1.issue.column), (e2.issue.line, e2.issue.column))
+
+    def test_source(self):
+        location = LiteralLocation(DOCUMENT)
+        self.assertIsInstance(FastReaderSource().get_reader(None, location, LiteralLoader(location)), FastYamlReader)
+
+class LocatorTestCase(TestCase):
+    def test_merge_copy(self):
+        original = read(YamlReader, u'a:\n  x: 1\nb: 2\n')
+        original._locator.link(original)
+        locations = get_locations(original._locator)
+        raw = deepcopy_with_locators(original)
+        self.assertIs(original._locator, raw._locator)
+        imported = read(YamlReader, u'c: 3\na:\n  y: 4\n')
+        imported._locator.link(imported)
+        merge(raw, imported)
+        raw._locator.merge(imported._locator, raw)
+        # The merged locators are linked to the copy
+        self.assertEqual(['a', 'b', 'c'], sorted(raw._locator.children))
+        self.assertEqual(['x', 'y'], sorted(raw['a']._locator.children))
+        self.assertIs(raw._locator.children['a'], raw['a']._locator)
+        # The original is unchanged
+        self.assertEqual(locations, get_locations(original._locator))
+        self.assertIsNot(original._locator, raw._locator)
+        self.assertEqual(['x'], sorted(original['a']._locator.children))
+
+class JinjaTemplateCacheTestCase(TestCase):
+    def setUp(self):
+        super(JinjaTemplateCacheTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_lru(self):
+        cache = JinjaTemplateCache(size=2)
+        template = cache.get_template(u'{{ a }}')
+        self.assertIs(template, cache.get_template(u'{{ a }}'))
+        cache.get_template(u'{{ b }}')
+        cache.get_template(u'{{ c }}')
+        self.assertIsNot(template, cache.get_template(u'{{ a }}'))
+        self.assertEqual((1, 4, 2, 2), cache.cache_info())
+        self.assertEqual(u'1', template.render(a=1))
+
+    def test_bytecode(self):
+        cache = JinjaTemplateCache(path=self.path)
+        self.assertEqual(u'x=1', cache.get_template(u'x={{ x }}').render(x=1))
+        self.assertEqual(1, len(os.listdir(self.path)))
+
+        # A new cache (as in a new process) should use the bytecode instead of compiling
+        cache = JinjaTemplateCache(path=self.path)
+        def compile(*args, **kwargs):
+            raise AssertionError('compiled')
+        cache.environment.compile = compile
+        self.assertEqual(u'x=2', cache.get_template(u'x={{ x }}').render(x=2))
+
+        # Bytecode that others can write is not loaded
+        os.chmod(os.path.join(self.path, os.listdir(self.path)[0]), 0666)
+        cache = JinjaTemplateCache(path=self.path)
+        cache.environment.compile = compile
+        self.assertRaises(AssertionError, cache.get_template, u'x={{ x }}')
+
+    def test_read(self):
+        path = os.path.join(self.path, 'blueprint.yaml.jinja')
+        with open(path, 'w') as f:
+            f.write('version: "{{ ARIA_VERSION }}"\n')
+        context = ReadingContext()
+        context.cache = None
+        context.jinja_template_cache = JinjaTemplateCache()
+        location = UriLocation(path)
+        raw = JinjaReader(context, location, FileTextLoader(LoadingContext(), location, None)).read()
+        self.assertEqual({'version': VERSION}, raw)
+
+class ProfileBundleTestCase(TestCase):
+    def setUp(self):
+        super(ProfileBundleTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def read(self, path, cache=None, profile_bundles=None):
+        context = ReadingContext()
+        context.cache = cache
+        context.profile_bundles = profile_bundles
+        location = UriLocation(path)
+        return YamlReader(context, location, FileTextLoader(LoadingContext(), location, None)).read()
+
+    def compile(self, directory):
+        os.makedirs(directory)
+        path = os.path.join(directory, 'profile.yaml')
+        with open(path, 'w') as f:
+            f.write(DOCUMENT.encode('utf8'))
+        bundle = ProfileBundle(os.path.join(directory, 'profile' + BUNDLE_EXTENSION))
+        self.read(path, cache=ProfileBundleRecorder(bundle))
+        bundle.save()
+        return path
+
+    def test_relocated(self):
+        path = self.compile(os.path.join(self.path, 'a'))
+        os.rename(os.path.join(self.path, 'a'), os.path.join(self.path, 'b'))
+        path = os.path.join(self.path, 'b', 'profile.yaml')
+
+        profile_bundles = ProfileBundles((self.path,))
+        raw = self.read(path, profile_bundles=profile_bundles)
+        self.assertEqual((1, 0, None, 1), profile_bundles.cache_info())
+        self.assertEqual(read(YamlReader, DOCUMENT), raw)
+        self.assertEqual(path, raw._locator.location.uri)
+        self.assertEqual(path, raw._locator.children['name'].location.uri)
+
+        # Every read gets its own copy
+        self.assertIsNot(raw, self.read(path, profile_bundles=profile_bundles))
+
+    def test_modified(self):
+        path = self.compile(os.path.join(self.path, 'a'))
+        with open(path, 'a') as f:
+            f.write('name2: test2\n')
+        profile_bundles = ProfileBundles((self.path,))
+        self.assertEqual('test2', self.read(path, profile_bundles=profile_bundles)['name2'])
+        self.assertEqual((0, 1, None, 1), profile_bundles.cache_info())
+
+    def test_other_version(self):
+        path = self.compile(os.path.join(self.path, 'a'))
+        bundle_path = os.path.join(self.path, 'a', 'profile' + BUNDLE_EXTENSION)
+        self.assertIsNotNone(ProfileBundle.open(bundle_path))
+        with open(bundle_path, 'rb') as f:
+            bundle = cPickle.load(f)
+        bundle['version'] = VERSION + '.other'
+        with open(bundle_path, 'wb') as f:
+            cPickle.dump(bundle, f)
+        self.assertIsNone(ProfileBundle.open(bundle_path))
+        self.assertIsNone(ProfileBundles((self.path,)).get(UriLocation(path), DOCUMENT))
+
+    def test_untrusted(self):
+        path = self.compile(os.path.join(self.path, 'a'))
+        profile_bundles = ProfileBundles((os.path.join(self.path, 'b'),))
+        self.assertEqual(read(YamlReader, DOCUMENT), self.read(path, profile_bundles=profile_bundles))
+        self.assertEqual((0, 1, None, 0), profile_bundles.cache_info())
+
+        # A bundle in an untrusted directory is never unpickled
+        marker = os.path.join(self.path, 'marker')
+        with open(os.path.join(self.path, 'a', 'evil' + BUNDLE_EXTENSION), 'wb') as f:
+            f.write("c__builtin__\nopen\n(S'%s'\nS'w'\ntR." % marker)
+        self.read(path, profile_bundles=ProfileBundles())
+        self.assertFalse(os.path.exists(marker))
+
+        profile_bundles.add_directory(self.path)
+        self.read(path, profile_bundles=profile_bundles)
+        self.assertEqual((1, 1, None, 1), profile_bundles.cache_info())
@@ -0,0 +1,316 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+from collections import OrderedDict
+from copy import copy, deepcopy
+import cPickle
+
+from aria.reading import FastYamlReader, YamlReader
+from aria.loading import LiteralLocation, LiteralLoader
+from aria.utils import cachedmethod, HasCachedMethods, ReadOnlyList, ReadOnlyDict, LazyReadOnlyDict, StrictDict, StrictList, StrictDictAttribute, StrictListAttribute, deepcopy_with_locators, make_agnostic
+
+class BaseCounter(HasCachedMethods):
+    __slots__ = ()
+
+    def __init__(self):
+        self.calls = 0
+
+    @cachedmethod
+    def count(self):
+        self.calls += 1
+        return self.calls
+
+    @cachedmethod
+    def add(self, a, b=0):
+        self.calls += 1
+        return a + b
+
+    @property
+    @cachedmethod
+    def counted(self):
+        return self.count()
+
+class Counter(BaseCounter):
+    pass
+
+class SlottedCounter(BaseCounter):
+    __slots__ = ('calls', '_method_cache', '_method_cache_statistics')
+
+class WeakCounter(BaseCounter):
+    __slots__ = ('calls', '__weakref__')
+
+class CachedMethodTestCase(TestCase):
+    def setUp(self):
+        super(CachedMethodTestCase, self).setUp()
+        self.addCleanup(setattr, cachedmethod, 'ENABLE_STATISTICS', cachedmethod.ENABLE_STATISTICS)
+
+    def test_no_arguments(self):
+        counter = Counter()
+        self.assertEqual(1, counter.count())
+        self.assertEqual(1, counter.count())
+        self.assertEqual(1, counter.counted)
+
+        # Per instance
+        self.assertEqual(1, Counter().count())
+
+        # Not bound, so not cached
+        self.assertEqual(2, Counter.count(counter))
+
+    def test_bound_once(self):
+        counter = Counter()
+        self.assertIs(counter.count, counter.count)
+        self.assertIsNot(counter.count, Counter().count)
+        self.assertEqual(1, counter.count())
+
+    def test_no_dict(self):
+        for counter_class in (SlottedCounter, WeakCounter):
+            counter = counter_class()
+            self.assertFalse(hasattr(counter, '__dict__'))
+            self.assertEqual(1, counter.count())
+            self.assertEqual(1, counter.count())
+            self.assertEqual(3, counter.add(1, 2))
+            self.assertEqual(3, counter.add(1, 2))
+            self.assertEqual(2, counter.calls)
+            counter._reset_method_cache()
+            self.assertEqual(3, counter.count())
+
+    def test_arguments(self):
+        counter = Counter()
+        self.assertEqual(3, counter.add(1, 2))
+        self.assertEqual(3, counter.add(1, b=2))
+        self.assertEqual(3, counter.add(1, b=2))
+        self.assertEqual(1, counter.add(1))
+        self.assertEqual(3, counter.calls)
+        self.assertRaises(TypeError, counter.add, [1])
+
+    def test_reset(self):
+        counter = Counter()
+        counter.count()
+        counter._reset_method_cache()
+        self.assertEqual(2, counter.count())
+
+    def test_statistics(self):
+        cachedmethod.ENABLE_STATISTICS = True
+        counter = Counter()
+        counter.count()
+        counter.count()
+        counter.counted
+        self.assertEqual((2, 1, None, 1), counter._method_cache_info['count'])
+        self.assertEqual((0, 1, None, 1), counter._method_cache_info['counted'])
+        self.assertEqual((0, 0, None, 0), Counter()._method_cache_info['count'])
+
+DOCUMENT = u'''
+map:
+  list: [1, 2.5, {name: value}]
+  alias: &alias
+    a: b
+again: *alias
+'''
+
+class DeepcopyWithLocatorsTestCase(TestCase):
+    def test_structure_copied(self):
+        for reader_class in (YamlReader, FastYamlReader):
+            location = LiteralLocation(DOCUMENT)
+            raw = reader_class(None, location, LiteralLoader(location)).read()
+            raw._locator.link(raw)
+            copy = deepcopy_with_locators(raw)
+            self.assertEqual(raw, copy)
+            self.assertIsNot(raw['map'], copy['map'])
+            self.assertIsNot(raw['map']['list'], copy['map']['list'])
+            self.assertIsNot(raw['map']['list'][2], copy['map']['list'][2])
+
+            # Locatable scalars and locators are shared
+            self.assertIs(raw['map']['list'][0], copy['map']['list'][0])
+            self.assertIs(raw['map']['list'][2]['name'], copy['map']['list'][2]['name'])
+            self.assertIs(raw._locator, copy._locator)
+            self.assertIs(raw['map']['list']._locator, copy['map']['list']._locator)
+            self.assertIs(raw['map']['list'][2]['name']._locator, copy['map']['list'][2]['name']._locator)
+
+            copy['map']['list'].append(3)
+            self.assertEqual(3, len(raw['map']['list']))
+
+    def test_other_containers(self):
+        raw = {'read_only': ReadOnlyDict({'a': [1]})}
+        copy = deepcopy_with_locators(raw)
+        self.assertIsInstance(copy['read_only'], ReadOnlyDict)
+        self.assertEqual(raw, copy)
+        self.assertIsNot(raw['read_only']['a'], copy['read_only']['a'])
+
+class ReadOnlyTestCase(TestCase):
+    def test_list(self):
+        value = ReadOnlyList(iter([1, 2, 3]))
+        self.assertEqual([1, 2, 3], value)
+        for fn, args in ((value.append, (4,)), (value.extend, ([4],)), (value.insert, (0, 4)), (value.pop, ()),
+                         (value.remove, (1,)), (value.sort, ()), (value.reverse, ()), (value.__setitem__, (0, 4)),
+                         (value.__delitem__, (0,)), (value.__setslice__, (0, 1, [4])), (value.__iadd__, ([4],))):
+            self.assertRaises(TypeError, fn, *args)
+        self.assertEqual([1, 2, 3], value)
+        self.assertRaises(AttributeError, setattr, value, 'locked', False)
+        copy = cPickle.loads(cPickle.dumps(value, cPickle.HIGHEST_PROTOCOL))
+        self.assertIsInstance(copy, ReadOnlyList)
+        self.assertEqual(value, copy)
+
+    def test_dict_order(self):
+        keys = ['k%d' % i for i in range(20, 0, -1)]
+        for items in (OrderedDict((k, k) for k in keys), [(k, k) for k in keys], ReadOnlyDict((k, k) for k in keys)):
+            value = ReadOnlyDict(items)
+            self.assertEqual(keys, value.keys())
+            self.assertEqual(keys, list(value))
+            self.assertEqual(keys, value.values())
+            self.assertEqual(zip(keys, keys), list(value.iteritems()))
+            self.assertEqual(list(reversed(keys)), list(reversed(value)))
+        self.assertEqual(['a', 'b'], ReadOnlyDict([('a', 1), ('b', 2), ('a', 3)]).keys())
+        self.assertEqual(3, ReadOnlyDict([('a', 1), ('b', 2), ('a', 3)])['a'])
+
+    def test_dict_read_only(self):
+        value = ReadOnlyDict(a=1)
+        for fn, args in ((value.__setitem__, ('b', 2)), (value.__delitem__, ('a',)), (value.clear, ()), (value.pop, ('a',)),
+                         (value.popitem, ()), (value.setdefault, ('b', 2)), (value.update, ({'b': 2},))):
+            self.assertRaises(TypeError, fn, *args)
+        self.assertEqual({'a': 1}, value)
+        self.assertIs(value, value.copy())
+
+    def test_dict_equality(self):
+        value = ReadOnlyDict([('a', 1), ('b', 2)])
+        self.assertEqual({'b': 2, 'a': 1}, value)
+        self.assertEqual(OrderedDict([('a', 1), ('b', 2)]), value)
+        self.assertTrue(value != OrderedDict([('b', 2), ('a', 1)]))
+        self.assertNotEqual(ReadOnlyDict([('b', 2), ('a', 1)]), value)
+        self.assertEqual("ReadOnlyDict([('a', 1), ('b', 2)])", repr(value))
+        copy = cPickle.loads(cPickle.dumps(value, cPickle.HIGHEST_PROTOCOL))
+        self.assertIsInstance(copy, ReadOnlyDict)
+        self.assertEqual(value.items(), copy.items())
+
+class Slotted(object):
+    __slots__ = ('_values', '_names')
+
+    values = StrictDictAttribute('_values', key_class=basestring, value_class=int)
+    names = StrictListAttribute('_names', value_class=basestring)
+
+class StrictAttributeTestCase(TestCase):
+    def test_unallocated(self):
+        o = Slotted()
+        self.assertEqual({}, o.values)
+        self.assertEqual([], o.names)
+        self.assertIsNone(o.values.get('a'))
+        self.assertIs(int, o.values.value_class)
+        self.assertIsNone(getattr(o, '_values', None))
+        self.assertIsNone(getattr(o, '_names', None))
+        self.assertRaises(AttributeError, getattr, o.values, 'foo')
+
+    def test_identity_and_type(self):
+        o = Slotted()
+        self.assertIs(o.values, o.values)
+        self.assertIs(o.names, o.names)
+        self.assertIsNot(o.values, Slotted().values)
+        self.assertIsInstance(o.values, StrictDict)
+        self.assertIsInstance(o.names, StrictList)
+        self.assertEqual([], o.values.items())
+        self.assertEqual([], list(o.values))
+        self.assertEqual('StrictDict()', repr(o.values))
+        # Copies are real containers, with the same options
+        for copied in (o.values.copy(), copy(o.values), deepcopy(o.values)):
+            self.assertIs(StrictDict, copied.__class__)
+            self.assertIs(int, copied.value_class)
+        self.assertIs(StrictList, deepcopy(o.names).__class__)
+        self.assertIsNone(getattr(o, '_values', None))
+        # Once allocated, the container is returned instead
+        values = o.values
+        values['a'] = 1
+        self.assertIs(StrictDict, o.values.__class__)
+        self.assertIs(o.values, o.values)
+        self.assertEqual({'a': 1}, o.values)
+
+    def test_allocate_on_write(self):
+        o = Slotted()
+        o.values['a'] = 1
+        o.names.append('a')
+        self.assertIsInstance(o.values, StrictDict)
+        self.assertIsInstance(o.names, StrictList)
+        self.assertEqual({'a': 1}, o.values)
+        self.assertEqual(['a'], o.names)
+        self.assertRaises(TypeError, o.values.__setitem__, 'b', 'x')
+        self.assertRaises(TypeError, Slotted().names.append, 1)
+
+    def test_options(self):
+        o = Slotted()
+        wrapped = []
+        o.names.wrapper_fn = lambda v: wrapped.append(v) or v
+        self.assertIsNotNone(o.names.wrapper_fn)
+        self.assertIs(basestring, o.names.value_class)
+        self.assertNotIsInstance(o._names, StrictList)
+        o.names.append('a')
+        self.assertIsInstance(o._names, StrictList)
+        self.assertEqual(['a'], wrapped)
+
+    def test_assign(self):
+        o = Slotted()
+        other = Slotted()
+        o.values = other.values
+        o.values['a'] = 1
+        self.assertEqual({}, other.values)
+        other.values = o.values
+        self.assertIs(o.values, other.values)
+
+class LazyReadOnlyDictTestCase(TestCase):
+    def setUp(self):
+        super(LazyReadOnlyDictTestCase, self).setUp()
+        self.created = []
+        self.value = LazyReadOnlyDict((('a', 1), ('b', 2), ('c', 3)), self.create)
+
+    def create(self, key, item):
+        self.created.append(key)
+        return [key, item]
+
+    def test_lazy(self):
+        self.assertEqual(3, len(self.value))
+        self.assertIn('b', self.value)
+        self.assertEqual([], self.created)
+        self.assertEqual(['b', 2], self.value.get('b'))
+        self.assertIs(self.value['b'], self.value.get('b'))
+        self.assertIsNone(self.value.get('d'))
+        self.assertEqual(['b'], self.created)
+
+    def test_iteration(self):
+        self.assertEqual(['a', 'b', 'c'], self.value.keys())
+        self.assertEqual([['a', 1], ['b', 2], ['c', 3]], self.value.values())
+        self.assertEqual(['a', 'b', 'c'], [k for k, _ in self.value.iteritems()])
+        self.assertEqual(['a', 'b', 'c'], self.created)
+        self.assertEqual(['a', 'b', 'c'], self.value.keys())
+
+    def test_read_only(self):
+        self.assertRaises(TypeError, self.value.__setitem__, 'd', 4)
+        self.assertRaises(TypeError, self.value.pop, 'a')
+
+    def test_conversions(self):
+        expected = {'a': ['a', 1], 'b': ['b', 2], 'c': ['c', 3]}
+        self.assertEqual(expected, self.value)
+        self.assertEqual(expected, make_agnostic(self.value))
+        self.assertEqual(expected, cPickle.loads(cPickle.dumps(self.value)))
+        self.assertIsInstance(self.value.copy(), ReadOnlyDict)
+
+    def test_builtin_access(self):
+        # None of these may bypass the creation of values
+        def update(value):
+            d = {}
+            d.update(value)
+            return d
+        expected = {'a': ['a', 1], 'b': ['b', 2], 'c': ['c', 3]}
+        for fn in (dict, update, lambda value: (lambda **kwargs: kwargs)(**value), lambda value: dict(value.viewitems())):
+            self.assertEqual(expected, fn(LazyReadOnlyDict((('a', 1), ('b', 2), ('c', 3)), self.create)))
+        self.assertEqual([['a', 1], ['b', 2], ['c', 3]], list(self.value.viewvalues()))
+        self.assertEqual(['a', 'b', 'c'], list(self.value.viewkeys()))
@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+from testtools import TestCase
+
+from aria.loading import UriLocation
+from aria.validation import ValidationContext, Issue
+
+class ValidationContextTestCase(TestCase):
+    def test_duplicates(self):
+        validation = ValidationContext()
+        location = UriLocation('/a.yaml')
+        validation.report('x', location=location, line=1, column=2)
+        validation.report('x', location=UriLocation('/a.yaml'), line=1, column=2)
+        validation.report('x', location=location, line=1, column=3)
+        validation.report('x', location=location, line=1, column=2, level=Issue.FIELD)
+        # Without a location the line and column are not shown, so these are duplicates
+        validation.report('y', line=1)
+        validation.report('y', line=2)
+        issues = [str(i) for i in validation.issues]
+        self.assertEqual(len(set(issues)), len(issues))
+        self.assertEqual(4, len(issues))
+
+    def test_order(self):
+        validation = ValidationContext()
+        validation.report('c', level=Issue.FIELD)
+        validation.report('b', location=UriLocation('/b.yaml'), line=3, level=Issue.SYNTAX)
+        validation.report('a', location=UriLocation('/b.yaml'), line=2, level=Issue.SYNTAX)
+        validation.report('d', location=UriLocation('/a.yaml'), level=Issue.SYNTAX)
+        validation.report('e', level=Issue.BETWEEN_TYPES)
+        self.assertEqual(['d', 'a', 'b', 'c', 'e'], [i.message for i in validation.issues])
+
+        validation.max_level = Issue.FIELD
+        self.assertEqual(['d', 'a', 'b', 'c'], [i.message for i in validation.issues])
+        self.assertIs(validation.issues, validation.issues)
+        validation.report('f', level=Issue.PLATFORM)
+        self.assertEqual(['f', 'd', 'a', 'b', 'c'], [i.message for i in validation.issues])
+        validation.max_level = Issue.PLATFORM
+        self.assertEqual(['f'], [i.message for i in validation.issues])
+
+    def test_clear_and_clone(self):
+        validation = ValidationContext()
+        validation.max_level = Issue.FIELD
+        validation.report('a')
+        clone = validation.clone()
+        self.assertEqual(Issue.FIELD, clone.max_level)
+        self.assertFalse(clone.has_issues)
+        clone.report('a')
+        self.assertEqual(1, len(validation.issues))
+        validation.clear()
+        self.assertFalse(validation.has_issues)
+        self.assertEqual([], validation.issues)
+        validation.report('a')
+        self.assertEqual(1, len(validation.issues))
+
+    def test_max_issues(self):
+        validation = ValidationContext()
+        self.assertTrue(validation.should_validate(Issue.EXTERNAL))
+        validation.max_issues = 2
+        validation.max_level = Issue.FIELD
+        validation.report('a', level=Issue.BETWEEN_TYPES)
+        validation.report('b', level=Issue.FIELD)
+        self.assertFalse(validation.reached_max_issues)
+        self.assertTrue(validation.should_validate(Issue.FIELD))
+        self.assertFalse(validation.should_validate(Issue.BETWEEN_FIELDS))
+        validation.report('c', level=Issue.SYNTAX)
+        self.assertTrue(validation.reached_max_issues)
+        self.assertFalse(validation.should_validate(Issue.PLATFORM))
+        # Issues beyond the maximum are discarded
+        validation.report('d', level=Issue.PLATFORM)
+        self.assertEqual(['b', 'c'], sorted(issue.message for issue in validation.issues))
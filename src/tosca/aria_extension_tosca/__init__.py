@@ -17,6 +17,7 @@
 from aria import DSL_SPECIFICATION_PACKAGES
 from aria.presentation import PRESENTER_CLASSES
 from aria.loading import FILE_LOADER_SEARCH_PATHS
+from aria.reading import PROFILE_BUNDLES
 from .v1_0 import ToscaSimplePresenter1_0
 import os.path
 
@@ -31,6 +32,9 @@ def install_aria_extension():
     the_dir = os.path.dirname(__file__)
     FILE_LOADER_SEARCH_PATHS.append(os.path.join(the_dir, 'profiles'))
 
+    # Precompiled profiles (see "make bundles")
+    PROFILE_BUNDLES.add_directory(os.path.join(the_dir, 'profiles'))
+
 MODULES = (
     'v1_0',)
 
@@ -21,7 +21,8 @@ from .field_validators import node_template_or_type_validator, relationship_temp
 from .utils.properties import get_assigned_and_defined_property_values
 from aria import dsl_specification
 from aria.utils import ReadOnlyDict, cachedmethod
-from aria.presentation import AsIsPresentation, has_fields, allow_unknown_fields, short_form_field, primitive_field, object_field, object_dict_field, object_dict_unknown_fields, field_validator, type_validator
+from aria.validation import Issue
+from aria.presentation import AsIsPresentation, has_fields, allow_unknown_fields, short_form_field, primitive_field, object_field, object_dict_field, object_dict_unknown_fields, field_validator, type_validator, validate_passes
 
 @dsl_specification('3.5.9', 'tosca-simple-profile-1.0')
 class PropertyAssignment(AsIsPresentation):
@@ -159,7 +160,7 @@ class RequirementAssignment(ToscaPresentation):
     
     # The example in 3.7.2.2.2 shows unknown fields in addition to these, but is this a mistake?
 
-    @field_validator(capability_definition_or_type_validator)
+    @field_validator(capability_definition_or_type_validator, level=Issue.BETWEEN_FIELDS)
     @primitive_field(str)
     def capability(self):
         """
@@ -194,7 +195,7 @@ class RequirementAssignment(ToscaPresentation):
         :rtype: :class:`RequirementRelationshipAssignment`
         """
 
-    @field_validator(node_filter_validator)
+    @field_validator(node_filter_validator, level=Issue.BETWEEN_FIELDS)
     @object_field(NodeFilter)
     def node_filter(self):
         """
@@ -350,4 +351,4 @@ class ArtifactAssignment(ToscaPresentation):
     @cachedmethod
     def _validate(self, context):
         super(ArtifactAssignment, self)._validate(context)
-        self._get_property_values(context)
+        validate_passes(context, Issue.FIELD, self._get_property_values)
@@ -23,6 +23,7 @@ from .utils.data_types import get_data_type, get_property_constraints
 from .utils.interfaces import get_and_override_input_definitions_from_type, get_and_override_operation_definitions_from_type
 from aria import dsl_specification
 from aria.utils import ReadOnlyDict, cachedmethod
+from aria.validation import Issue
 from aria.presentation import has_fields, short_form_field, allow_unknown_fields, primitive_field, primitive_list_field, object_field, object_list_field, object_dict_field, object_dict_unknown_fields, field_validator, field_getter, type_validator, list_type_validator
 
 @has_fields
@@ -59,7 +60,7 @@ class PropertyDefinition(ToscaPresentation):
         :rtype: bool
         """
 
-    @field_validator(data_value_validator)
+    @field_validator(data_value_validator, level=Issue.FIELD)
     @primitive_field()
     def default(self):
         """
@@ -128,7 +129,7 @@ class AttributeDefinition(ToscaPresentation):
         :rtype: :class:`Description`
         """
 
-    @field_validator(data_value_validator)
+    @field_validator(data_value_validator, level=Issue.FIELD)
     @primitive_field(str)
     def default(self):
         """
@@ -180,7 +181,7 @@ class ParameterDefinition(PropertyDefinition):
         :rtype: str
         """
 
-    @field_validator(data_value_validator)
+    @field_validator(data_value_validator, level=Issue.FIELD)
     @primitive_field()
     def value(self):
         """
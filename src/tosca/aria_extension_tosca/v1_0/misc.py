@@ -20,7 +20,8 @@ from .utils.data_types import get_data_type, get_data_type_value, get_property_c
 from .utils.substitution_mappings import validate_subtitution_mappings_requirement, validate_subtitution_mappings_capability
 from aria import dsl_specification
 from aria.utils import cachedmethod, puts
-from aria.presentation import AsIsPresentation, has_fields, allow_unknown_fields, short_form_field, primitive_field, primitive_list_field, primitive_dict_unknown_fields, object_field, object_list_field, object_dict_field, field_validator, type_validator
+from aria.validation import Issue
+from aria.presentation import AsIsPresentation, has_fields, allow_unknown_fields, short_form_field, primitive_field, primitive_list_field, primitive_dict_unknown_fields, object_field, object_list_field, object_dict_field, field_validator, type_validator, validate_passes
 
 @dsl_specification('3.5.1', 'tosca-simple-profile-1.0')
 class Description(AsIsPresentation):
@@ -150,42 +151,42 @@ class ConstraintClause(ToscaPresentation):
     See the `TOSCA Simple Profile v1.0 specification <http://docs.oasis-open.org/tosca/TOSCA-Simple-Profile-YAML/v1.0/csprd02/TOSCA-Simple-Profile-YAML-v1.0-csprd02.html#DEFN_ELEMENT_CONSTRAINTS_CLAUSE>`__
     """
     
-    @field_validator(constraint_clause_field_validator)
+    @field_validator(constraint_clause_field_validator, level=Issue.FIELD)
     @primitive_field()
     def equal(self):
         """
         Constrains a property or parameter to a value equal to ('=') the value declared.
         """
     
-    @field_validator(constraint_clause_field_validator)
+    @field_validator(constraint_clause_field_validator, level=Issue.FIELD)
     @primitive_field()
     def greater_than(self):
         """
         Constrains a property or parameter to a value greater than ('>') the value declared.
         """
     
-    @field_validator(constraint_clause_field_validator)
+    @field_validator(constraint_clause_field_validator, level=Issue.FIELD)
     @primitive_field()
     def greater_or_equal(self):
         """
         Constrains a property or parameter to a value greater than or equal to ('>=') the value declared.
         """
     
-    @field_validator(constraint_clause_field_validator)
+    @field_validator(constraint_clause_field_validator, level=Issue.FIELD)
     @primitive_field()
     def less_than(self):
         """
         Constrains a property or parameter to a value less than ('<') the value declared.
         """
     
-    @field_validator(constraint_clause_field_validator)
+    @field_validator(constraint_clause_field_validator, level=Issue.FIELD)
     @primitive_field()
     def less_or_equal(self):
         """
         Constrains a property or parameter to a value less than or equal to ('<=') the value declared.
         """
     
-    @field_validator(constraint_clause_in_range_validator)
+    @field_validator(constraint_clause_in_range_validator, level=Issue.FIELD)
     @primitive_list_field()
     def in_range(self):
         """
@@ -194,7 +195,7 @@ class ConstraintClause(ToscaPresentation):
         Note: subclasses or templates of types that declare a property with the in_range constraint MAY only further restrict the range specified by the parent type.
         """
     
-    @field_validator(constraint_clause_valid_values_validator)
+    @field_validator(constraint_clause_valid_values_validator, level=Issue.FIELD)
     @primitive_list_field()
     def valid_values(self):
         """
@@ -219,7 +220,7 @@ class ConstraintClause(ToscaPresentation):
         Constrains the property or parameter to a value to a maximum length.
         """
 
-    @field_validator(constraint_clause_pattern_validator)
+    @field_validator(constraint_clause_pattern_validator, level=Issue.FIELD)
     @primitive_field(str)
     def pattern(self):
         """
@@ -354,7 +355,7 @@ class SubstitutionMappings(ToscaPresentation):
 
     def _validate(self, context):
         super(SubstitutionMappings, self)._validate(context)
-        self._get_type(context)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_type)
 
     def _dump(self, context):
         self._dump_content(context, (
@@ -30,7 +30,8 @@ from .utils.policies import get_policy_targets
 from .utils.copy import get_default_raw_from_copy
 from aria import dsl_specification
 from aria.utils import ReadOnlyDict, ReadOnlyList, cachedmethod
-from aria.presentation import has_fields, primitive_field, primitive_list_field, object_field, object_list_field, object_dict_field, object_sequenced_list_field, field_validator, type_validator, list_type_validator
+from aria.validation import Issue
+from aria.presentation import has_fields, primitive_field, primitive_list_field, object_field, object_list_field, object_dict_field, object_sequenced_list_field, field_validator, type_validator, list_type_validator, validate_passes
 
 @has_fields
 @dsl_specification('3.7.3', 'tosca-simple-profile-1.0')
@@ -161,11 +162,8 @@ class NodeTemplate(ToscaPresentation):
 
     def _validate(self, context):
         super(NodeTemplate, self)._validate(context)
-        self._get_property_values(context)
-        self._get_requirements(context)
-        self._get_capabilities(context)
-        self._get_interfaces(context)
-        self._get_artifacts(context)
+        validate_passes(context, Issue.FIELD, self._get_property_values, self._get_requirements, self._get_capabilities, self._get_interfaces)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_artifacts)
 
     def _dump(self, context):
         self._dump_content(context, (
@@ -260,8 +258,7 @@ class RelationshipTemplate(ToscaPresentation):
     
     def _validate(self, context):
         super(RelationshipTemplate, self)._validate(context)
-        self._get_property_values(context)
-        self._get_interfaces(context)
+        validate_passes(context, Issue.FIELD, self._get_property_values, self._get_interfaces)
 
     def _dump(self, context):
         self._dump_content(context, (
@@ -337,8 +334,7 @@ class GroupDefinition(ToscaPresentation):
     
     def _validate(self, context):
         super(GroupDefinition, self)._validate(context)
-        self._get_property_values(context)
-        self._get_interfaces(context)
+        validate_passes(context, Issue.FIELD, self._get_property_values, self._get_interfaces)
 
 @has_fields
 @dsl_specification('3.7.6', 'tosca-simple-profile-1.0')
@@ -398,7 +394,7 @@ class PolicyDefinition(ToscaPresentation):
 
     def _validate(self, context):
         super(PolicyDefinition, self)._validate(context)
-        self._get_property_values(context)
+        validate_passes(context, Issue.FIELD, self._get_property_values)
 
 @has_fields
 @dsl_specification('3.8', 'tosca-simple-profile-1.0')
@@ -483,8 +479,7 @@ class TopologyTemplate(ToscaPresentation):
 
     def _validate(self, context):
         super(TopologyTemplate, self)._validate(context)
-        self._get_input_values(context)
-        self._get_output_values(context)
+        validate_passes(context, Issue.FIELD, self._get_input_values, self._get_output_values)
 
     def _dump(self, context):
         self._dump_content(context, (
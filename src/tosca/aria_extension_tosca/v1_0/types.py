@@ -30,7 +30,8 @@ from .utils.policies import get_inherited_targets
 from .utils.data_types import get_data_type, get_inherited_constraints, coerce_data_type_value
 from aria import dsl_specification
 from aria.utils import ReadOnlyDict, ReadOnlyList, cachedmethod
-from aria.presentation import has_fields, allow_unknown_fields, primitive_field, primitive_list_field, object_field, object_dict_field, object_list_field, object_sequenced_list_field, object_dict_unknown_fields, field_getter, field_validator, list_type_validator, derived_from_validator
+from aria.validation import Issue
+from aria.presentation import has_fields, allow_unknown_fields, primitive_field, primitive_list_field, object_field, object_dict_field, object_list_field, object_sequenced_list_field, object_dict_unknown_fields, field_getter, field_validator, list_type_validator, derived_from_validator, validate_passes
 
 @has_fields
 @dsl_specification('3.6.3', 'tosca-simple-profile-1.0')
@@ -101,7 +102,7 @@ class ArtifactType(ToscaPresentation):
 
     def _validate(self, context):
         super(ArtifactType, self)._validate(context)
-        self._get_properties(context)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_properties)
 
     def _dump(self, context):
         self._dump_content(context, (
@@ -188,7 +189,7 @@ class DataType(ToscaPresentation):
 
     def _validate(self, context):
         super(DataType, self)._validate(context)
-        self._get_properties(context)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_properties)
     
     def _coerce_value(self, context, presentation, entry_schema, constraints, value, aspect):
         return coerce_data_type_value(context, presentation, self, entry_schema, constraints, value, aspect)
@@ -284,7 +285,7 @@ class CapabilityType(ToscaPresentation):
 
     def _validate(self, context):
         super(CapabilityType, self)._validate(context)
-        self._get_properties(context)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_properties)
 
     def _dump(self, context):
         self._dump_content(context, (
@@ -358,7 +359,7 @@ class InterfaceType(ToscaPresentation):
 
     def _validate(self, context):
         super(InterfaceType, self)._validate(context)
-        self._get_inputs(context)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_inputs)
         for operation in self.operations.itervalues():
             operation._validate(context)
 
@@ -455,9 +456,7 @@ class RelationshipType(ToscaPresentation):
 
     def _validate(self, context):
         super(RelationshipType, self)._validate(context)
-        self._get_properties(context)
-        self._get_attributes(context)
-        self._get_interfaces(context)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_properties, self._get_attributes, self._get_interfaces)
 
     def _dump(self, context):
         self._dump_content(context, (
@@ -592,12 +591,7 @@ class NodeType(ToscaPresentation):
 
     def _validate(self, context):
         super(NodeType, self)._validate(context)
-        self._get_properties(context)
-        self._get_attributes(context)
-        self._get_requirements(context)
-        self._get_capabilities(context)
-        self._get_interfaces(context)
-        self._get_artifacts(context)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_properties, self._get_attributes, self._get_requirements, self._get_capabilities, self._get_interfaces, self._get_artifacts)
 
     def _dump(self, context):
         self._dump_content(context, (
@@ -696,8 +690,7 @@ class GroupType(ToscaPresentation):
 
     def _validate(self, context):
         super(GroupType, self)._validate(context)
-        self._get_properties(context)
-        self._get_interfaces(context)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_properties, self._get_interfaces)
 
     def _dump(self, context):
         self._dump_content(context, (
@@ -776,7 +769,7 @@ class PolicyType(ToscaPresentation):
 
     def _validate(self, context):
         super(PolicyType, self)._validate(context)
-        self._get_properties(context)
+        validate_passes(context, Issue.BETWEEN_TYPES, self._get_properties)
 
     def _dump(self, context):
         self._dump_content(context, (